@@ -0,0 +1,298 @@
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+import faces
+import imagecache
+import preprocess
+import shapes
+import warp
+
+# ============================================================
+# BATCH CLI: jalankan pipeline chapter tanpa window (headless)
+# ============================================================
+# Script chapter memakai imshow + waitKey(0), jadi tidak bisa jalan di server
+# tanpa display. Script ini menjalankan pipeline yang sama ke banyak gambar
+# sekaligus, hasilnya ditulis ke disk (gambar + JSON), tanpa membuka window.
+#
+# Contoh:
+#   python batch.py resources/ --out output/
+#   python batch.py "resources/*.jpg" --pipelines edges,faces --workers 4
+#   python batch.py resources/ --decode-cache .imcache   # run ke-2 dst. tanpa decode JPEG/PNG
+#
+# Pipeline yang tersedia:
+#   edges  -> chapter 2: gray, blur, Canny, dilate, erode
+#   warp   -> chapter 5: perspective warp 4 titik
+#   shapes -> chapter 8: kontur + klasifikasi bentuk
+#   faces  -> chapter 9: Haar cascade face detection
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+PIPELINES = ("edges", "warp", "shapes", "faces")
+
+# Nama file ringkasan run di folder output (nama dasar ini tidak dipakai untuk gambar)
+SUMMARY_NAME = "summary"
+
+# State per worker process (cascade cukup diload sekali per proses)
+_worker = {}
+
+
+def collectInputs(patterns):
+    """
+    patterns : list path folder / file / glob
+    return   : list path gambar (urut, tanpa duplikat)
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for name in sorted(os.listdir(pattern)):
+                if name.lower().endswith(IMAGE_EXTS):
+                    paths.append(os.path.join(pattern, name))
+        elif os.path.isfile(pattern):
+            paths.append(pattern)
+        else:
+            paths.extend(p for p in sorted(glob.glob(pattern)) if p.lower().endswith(IMAGE_EXTS))
+
+    # Dedup pada path absolut: "a/x.jpg", "./a/x.jpg" dan "a/../a/x.jpg" adalah file yang sama
+    seen = set()
+    unique = []
+    for p in paths:
+        key = os.path.abspath(p)
+        if key not in seen:
+            seen.add(key)
+            unique.append(p)
+    return unique
+
+
+def outputBases(paths, outDir):
+    """
+    Nama dasar file output per gambar, relatif terhadap folder induk bersama semua input,
+    supaya "a/img.jpg" dan "b/img.jpg" tidak saling menimpa (-> out/a/img, out/b/img).
+    paths  : list path gambar (hasil collectInputs)
+    outDir : folder output
+    return : list path dasar output (tanpa ekstensi), urutan sama dengan paths
+    """
+    if not paths:
+        return []
+    absPaths = [os.path.abspath(p) for p in paths]
+    root = os.path.commonpath([os.path.dirname(p) for p in absPaths])
+
+    bases = []
+    # dibandingkan lowercase supaya aman juga di filesystem case-insensitive;
+    # "summary" di root output sudah dipakai summary.json
+    used = {SUMMARY_NAME}
+    for p in absPaths:
+        stem, ext = os.path.splitext(os.path.relpath(p, root))
+        # Nama sama beda ekstensi di folder yang sama (img.jpg vs img.png): beri sufiks
+        # ekstensi, lalu nomor kalau masih bentrok (img.jpg, img.png, img_png.jpg)
+        candidate = stem
+        if candidate.lower() in used:
+            candidate = "%s_%s" % (stem, ext.lstrip(".").lower())
+        n = 2
+        while candidate.lower() in used:
+            candidate = "%s_%s_%d" % (stem, ext.lstrip(".").lower(), n)
+            n += 1
+        used.add(candidate.lower())
+        bases.append(os.path.join(outDir, candidate))
+    return bases
+
+
+def _initWorker(config):
+    _worker["config"] = config
+    _worker["cascade"] = faces.loadCascade(config["cascade"]) if "faces" in config["pipelines"] else None
+    # Pipeline preprocessing dibuat sekali per proses, buffernya dipakai ulang antar gambar
+    _worker["edges"] = preprocess.chapter2Pipeline()
+    _worker["edgeMap"] = preprocess.chapter8Pipeline()
+    # Gambar hasil decode (read-only) di-cache per proses, opsional juga ke .npy di disk
+    _worker["images"] = imagecache.ImageCache(config["cacheBytes"], config["decodeCache"])
+
+
+def _runEdges(img, config, outBase):
+    cv2.imwrite(outBase + "_edges.png", _worker["edges"].run(img))
+    return None
+
+
+def _runWarp(img, config, outBase):
+    width, height = config["warpSize"]
+    imgOutput = warp.warpQuad(img, config["warpPoints"], width, height)
+    cv2.imwrite(outBase + "_warp.png", imgOutput)
+    return None
+
+
+def _runShapes(img, config, outBase):
+    found = shapes.detectShapes(_worker["edgeMap"].run(img))
+    cv2.imwrite(outBase + "_shapes.png", shapes.drawShapes(img.copy(), found))
+    return found
+
+
+def _runFaces(img, config, outBase):
+    found = faces.detectFaces(img, _worker["cascade"], config["scaleFactor"], config["minNeighbors"])
+    cv2.imwrite(outBase + "_faces.png", faces.drawFaces(img.copy(), found))
+    return [list(face) for face in found]
+
+
+_RUNNERS = {
+    "edges": _runEdges,
+    "warp": _runWarp,
+    "shapes": _runShapes,
+    "faces": _runFaces,
+}
+
+
+def processImage(path, outBase):
+    """
+    Jalankan semua pipeline terpilih untuk 1 gambar.
+    outBase : path dasar file output (lihat outputBases)
+    return : (path, detections dict, timings dict {stage: detik}, error atau None)
+    """
+    config = _worker["config"]
+    timings = {}
+
+    t0 = time.perf_counter()
+    img = _worker["images"].imread(path)
+    timings["read"] = time.perf_counter() - t0
+    if img is None:
+        return path, {}, timings, "Gambar tidak bisa dibaca"
+
+    detections = {}
+    try:
+        os.makedirs(os.path.dirname(outBase), exist_ok=True)
+        for name in config["pipelines"]:
+            t0 = time.perf_counter()
+            result = _RUNNERS[name](img, config, outBase)
+            timings[name] = time.perf_counter() - t0
+            if result is not None:
+                detections[name] = result
+
+        with open(outBase + ".json", "w") as f:
+            json.dump({"source": path, "detections": detections}, f, indent=2)
+    except Exception as exc:
+        # 1 gambar gagal (pipeline / imwrite) tidak boleh menghentikan seluruh batch
+        return path, detections, timings, repr(exc)
+    return path, detections, timings, None
+
+
+def runBatch(paths, config, workers=1):
+    """
+    paths   : list path gambar
+    config  : dict konfigurasi (lihat parseArgs)
+    workers : jumlah process (1 = jalan di process ini saja)
+    return  : (results list, stats dict per stage)
+    """
+    os.makedirs(config["out"], exist_ok=True)
+    bases = outputBases(paths, config["out"])
+
+    wallStart = time.perf_counter()
+    if workers <= 1:
+        _initWorker(config)
+        results = [processImage(p, b) for p, b in zip(paths, bases)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker,
+                                 initargs=(config,)) as pool:
+            results = list(pool.map(processImage, paths, bases, chunksize=max(1, len(paths) // (workers * 4))))
+    wall = time.perf_counter() - wallStart
+
+    stats = {}
+    for _, _, timings, _ in results:
+        for stage, seconds in timings.items():
+            entry = stats.setdefault(stage, {"count": 0, "seconds": 0.0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+    for entry in stats.values():
+        entry["imagesPerSec"] = entry["count"] / entry["seconds"] if entry["seconds"] > 0 else 0.0
+        entry["msPerImage"] = 1000.0 * entry["seconds"] / entry["count"]
+    stats["_total"] = {"images": len(paths), "wallSeconds": wall,
+                       "imagesPerSec": len(paths) / wall if wall > 0 else 0.0}
+    return results, stats
+
+
+def printStats(stats):
+    print("%-8s %8s %12s %12s" % ("stage", "images", "ms/image", "images/s"))
+    for stage, entry in stats.items():
+        if stage == "_total":
+            continue
+        print("%-8s %8d %12.2f %12.1f" % (stage, entry["count"], entry["msPerImage"], entry["imagesPerSec"]))
+    total = stats["_total"]
+    print("total: %d gambar dalam %.2f s (%.1f gambar/s)" % (total["images"], total["wallSeconds"], total["imagesPerSec"]))
+
+
+def _parsePoints(text):
+    values = [float(v) for v in text.split(",")]
+    if len(values) != 8:
+        raise argparse.ArgumentTypeError("butuh 8 angka: x1,y1,...,x4,y4 (TL, TR, BL, BR)")
+    return [values[i:i + 2] for i in range(0, 8, 2)]
+
+
+def _parseSize(text):
+    width, height = (int(v) for v in text.lower().split("x"))
+    return width, height
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Jalankan pipeline chapter OpenCV secara headless ke banyak gambar.")
+    parser.add_argument("inputs", nargs="+", help="folder, file, atau glob gambar")
+    parser.add_argument("--out", default="output", help="folder hasil (default: output)")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES),
+                        help="daftar pipeline dipisah koma: " + ",".join(PIPELINES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="jumlah process")
+    parser.add_argument("--cascade", default=faces.DEFAULT_CASCADE, help="file XML Haar cascade")
+    parser.add_argument("--scale-factor", type=float, default=1.1)
+    parser.add_argument("--min-neighbors", type=int, default=4)
+    parser.add_argument("--decode-cache", help="folder cache pixel hasil decode (.npy, di-mmap di run berikutnya)")
+    parser.add_argument("--cache-mb", type=int, default=256, help="batas cache gambar di memori per proses (MB)")
+    parser.add_argument("--warp-points", type=_parsePoints, default=warp.CARD_POINTS.tolist(),
+                        help="x1,y1,...,x4,y4 urutan TL, TR, BL, BR (default: kartu chapter 5)")
+    parser.add_argument("--warp-size", type=_parseSize, default=(warp.CARD_WIDTH, warp.CARD_HEIGHT),
+                        help="ukuran hasil warp WxH (default: 250x350)")
+    args = parser.parse_args(argv)
+
+    pipelines = [p.strip() for p in args.pipelines.split(",") if p.strip()]
+    unknown = [p for p in pipelines if p not in PIPELINES]
+    if unknown:
+        parser.error("pipeline tidak dikenal: " + ", ".join(unknown))
+
+    config = {
+        "out": args.out,
+        "pipelines": pipelines,
+        "cascade": args.cascade,
+        "scaleFactor": args.scale_factor,
+        "minNeighbors": args.min_neighbors,
+        "warpPoints": args.warp_points,
+        "warpSize": args.warp_size,
+        "decodeCache": args.decode_cache,
+        "cacheBytes": args.cache_mb * 1024 * 1024,
+    }
+    return args, config
+
+
+def main(argv=None):
+    args, config = parseArgs(argv)
+    paths = collectInputs(args.inputs)
+    if not paths:
+        print("Tidak ada gambar yang cocok dengan input:", " ".join(args.inputs))
+        return 1
+
+    results, stats = runBatch(paths, config, workers=min(args.workers, len(paths)))
+
+    failed = [(path, error) for path, _, _, error in results if error]
+    for path, error in failed:
+        print("GAGAL:", path, "-", error)
+
+    with open(os.path.join(config["out"], SUMMARY_NAME + ".json"), "w") as f:
+        json.dump({
+            "config": {k: v for k, v in config.items() if k != "out"},
+            "stats": stats,
+            "detections": {path: det for path, det, _, error in results if not error},
+            "failed": [path for path, _ in failed],
+        }, f, indent=2)
+
+    printStats(stats)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import colors
+import faces
+import preprocess
+import pyramid
+import shapes
+import stack
+import warp
+
+# ============================================================
+# BENCHMARK SUITE: SEMUA PIPELINE CHAPTER
+# ============================================================
+# Menjalankan algoritma tiap chapter (tanpa window) di:
+# - gambar bawaan resources/
+# - gambar sintetis 480p / 1080p / 4K
+# lalu melaporkan ops/detik, latency p50/p90/p99, dan peak memory.
+# Hasil ditulis ke JSON supaya bisa dibandingkan antar run (deteksi regresi).
+#
+# Contoh:
+#   python benchmark.py --out bench.json
+#   python benchmark.py --cases preprocess,contours --sizes 1080p --compare bench.json
+#
+# Catatan peak memory:
+# - peakPyMB  = puncak alokasi yang terlihat tracemalloc (termasuk array numpy)
+#               selama 1 panggilan, diukur di run terpisah dari pengukuran waktu
+# - maxRssMB  = puncak RSS seluruh proses (termasuk alokasi internal OpenCV)
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+BUNDLED_IMAGES = ("minji.jpg", "cards.jpg", "shapes.png", "lambo.png", "test_image.jpg")
+SYNTHETIC_SIZES = {
+    "480p": (640, 480),
+    "1080p": (1920, 1080),
+    "4k": (3840, 2160),
+}
+
+# Range HSV bawaan chapter 7 + beberapa warna tambahan untuk segmentasi
+LAMBO_BOUNDS = (0, 19, 110, 240, 153, 255)
+COLOR_RANGES = {
+    "red": (170, 10, 100, 255, 80, 255),
+    "yellow": (20, 35, 100, 255, 100, 255),
+    "green": (36, 85, 60, 255, 50, 255),
+    "blue": (90, 130, 80, 255, 50, 255),
+}
+
+
+# ============================================================
+# INPUT
+# ============================================================
+def syntheticImage(width, height, seed=0):
+    # Scene sintetis: bentuk acak (chapter 8) + noise ringan supaya blur/Canny punya kerjaan
+    count = max(50, width * height // 2000)
+    img = shapes.syntheticShapes(width, height, count=count, seed=seed)
+    noise = np.random.default_rng(seed).integers(0, 16, img.shape, np.uint8)
+    return cv2.add(img, noise)
+
+
+def loadInputs(sizes, bundled=True):
+    inputs = []
+    if bundled:
+        for name in BUNDLED_IMAGES:
+            img = cv2.imread(os.path.join(RESOURCES_DIR, name))
+            if img is not None:
+                inputs.append((name, img))
+    for size in sizes:
+        width, height = SYNTHETIC_SIZES[size]
+        inputs.append(("synthetic-" + size, syntheticImage(width, height)))
+    return inputs
+
+
+# ============================================================
+# CASE: tiap fungsi menerima gambar, menyiapkan state (di luar pengukuran),
+# lalu mengembalikan fungsi tanpa argumen yang akan diukur
+# ============================================================
+def _casePreprocess(img):
+    return lambda: preprocess.preprocessEdges(img)
+
+
+def _casePipeline(img):
+    pipe = preprocess.chapter2Pipeline()
+    return lambda: pipe.run(img)
+
+
+def _caseResizeCrop(img):
+    # chapter 3: resize ke 300x300 & 800x800, crop tengah 250x250
+    def run():
+        h, w = img.shape[:2]
+        cv2.resize(img, (300, 300))
+        cv2.resize(img, (800, 800))
+        cx, cy = w // 2, h // 2
+        return img[max(0, cy - 125):min(h, cy + 125), max(0, cx - 125):min(w, cx + 125)].copy()
+    return run
+
+
+def _caseResizeCache(img):
+    # resize_crop lewat pyramid.ResizeCache (frame baru setiap iterasi)
+    cache = pyramid.ResizeCache()
+
+    def run():
+        cache.setFrame(img)
+        cache.resize((800, 800))
+        cache.resize((300, 300))
+        return cache.centerCrop((250, 250))
+    return run
+
+
+def _scaledCardQuad(img, offset=(0.0, 0.0)):
+    # titik kartu chapter 5 diskalakan ke ukuran gambar ini
+    sx, sy = img.shape[1] / 477.0, img.shape[0] / 500.0
+    return warp.CARD_POINTS * np.float32([sx, sy]) + np.float32(offset)
+
+
+def _caseWarp(img):
+    quad = _scaledCardQuad(img)
+    return lambda: warp.warpQuad(img, quad)
+
+
+def _caseBatchWarp(img):
+    quads = [_scaledCardQuad(img, (i % 4 * 3.0, i // 4 * 3.0)) for i in range(16)]
+    warper = warp.BatchWarper(workers=4)
+
+    def run():
+        return warper.warp(img, quads)
+    # thread pool warper ditutup runSuite setelah case selesai (lihat _closeCase)
+    run.close = warper.close
+    return run
+
+
+def _caseStack(img):
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    mosaic = stack.Mosaic(0.5)
+    return lambda: mosaic.compose([[img, imgGray, img], [img, img, imgGray]])
+
+
+def _caseHsvMask(img):
+    # chapter 7: BGR -> HSV -> inRange -> bitwise_and
+    def run():
+        imgHSV = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+        mask = colors.hsvMask(imgHSV, LAMBO_BOUNDS)
+        return cv2.bitwise_and(img, img, mask=mask)
+    return run
+
+
+def _caseSegment(img):
+    imgHSV = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    segmenter = colors.ColorSegmenter(COLOR_RANGES)
+    return lambda: segmenter.label(imgHSV)
+
+
+def _caseContours(img):
+    imgEdge = preprocess.edgeMap(img)
+    return lambda: shapes.analyzeContours(imgEdge)
+
+
+def _caseFaces(img):
+    faceCascade = faces.loadCascade()
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return lambda: faces.detectFaces(imgGray, faceCascade)
+
+
+CASES = {
+    "preprocess": _casePreprocess,
+    "pipeline": _casePipeline,
+    "resize_crop": _caseResizeCrop,
+    "resize_cache": _caseResizeCache,
+    "warp": _caseWarp,
+    "batch_warp": _caseBatchWarp,
+    "stack": _caseStack,
+    "hsv_mask": _caseHsvMask,
+    "segment": _caseSegment,
+    "contours": _caseContours,
+    "faces": _caseFaces,
+}
+
+
+# ============================================================
+# PENGUKURAN
+# ============================================================
+def percentile(samples, q):
+    return float(np.percentile(samples, q)) if samples else 0.0
+
+
+def measure(fn, minTime=0.5, maxIterations=200, minIterations=3):
+    """
+    Jalankan fn berulang sampai minTime detik (minimal minIterations, maksimal maxIterations).
+    return : dict ops/detik + latency (ms) + peak memory tracemalloc (MB)
+    """
+    fn()  # pemanasan (alokasi buffer pertama, cache, dll)
+
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < maxIterations:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(1000.0 * (time.perf_counter() - t0))
+        if len(samples) >= minIterations and time.perf_counter() - start >= minTime:
+            break
+
+    # peak memory diukur terpisah karena tracemalloc memperlambat
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(samples) / 1000.0
+    return {
+        "iterations": len(samples),
+        "opsPerSec": len(samples) / total if total > 0 else 0.0,
+        "meanMs": float(np.mean(samples)),
+        "p50Ms": percentile(samples, 50),
+        "p90Ms": percentile(samples, 90),
+        "p99Ms": percentile(samples, 99),
+        "peakPyMB": peak / (1024.0 * 1024.0),
+    }
+
+
+def maxRssMB():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def _closeCase(fn):
+    # Case yang memegang resource (thread pool, dll) memasang fn.close; harus dilepas
+    # sebelum case berikutnya supaya thread idle tidak ikut mempengaruhi timing
+    close = getattr(fn, "close", None)
+    if close is not None:
+        close()
+
+
+def runSuite(caseNames, inputs, minTime=0.5, maxIterations=200, log=print):
+    results = []
+    for caseName in caseNames:
+        for inputName, img in inputs:
+            fn = CASES[caseName](img)
+            entry = {"case": caseName, "input": inputName, "shape": list(img.shape)}
+            try:
+                entry.update(measure(fn, minTime, maxIterations))
+            finally:
+                _closeCase(fn)
+            results.append(entry)
+            if log:
+                log("%-12s %-18s %10.1f ops/s  p50 %8.2f ms  p99 %8.2f ms  peak %7.1f MB" % (
+                    caseName, inputName, entry["opsPerSec"], entry["p50Ms"], entry["p99Ms"], entry["peakPyMB"]))
+    return results
+
+
+def metadata():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "opencvThreads": cv2.getNumThreads(),
+    }
+
+
+def compareResults(baseline, current, threshold=0.1):
+    """
+    baseline, current : list hasil runSuite (atau isi "results" file JSON)
+    threshold         : penurunan ops/detik relatif yang dianggap regresi (0.1 = 10%)
+    return            : list dict perbandingan per (case, input) yang ada di keduanya
+    """
+    old = {(r["case"], r["input"]): r for r in baseline}
+    report = []
+    for r in current:
+        base = old.get((r["case"], r["input"]))
+        if base is None or base["opsPerSec"] <= 0:
+            continue
+        ratio = r["opsPerSec"] / base["opsPerSec"]
+        report.append({
+            "case": r["case"],
+            "input": r["input"],
+            "baselineOpsPerSec": base["opsPerSec"],
+            "opsPerSec": r["opsPerSec"],
+            "ratio": ratio,
+            "regression": ratio < 1.0 - threshold,
+        })
+    return report
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline chapter OpenCV.")
+    parser.add_argument("--cases", default=",".join(CASES), help="daftar case dipisah koma: " + ",".join(CASES))
+    parser.add_argument("--sizes", default=",".join(SYNTHETIC_SIZES),
+                        help="ukuran gambar sintetis: " + ",".join(SYNTHETIC_SIZES) + " (kosong = tidak ada)")
+    parser.add_argument("--no-bundled", action="store_true", help="jangan pakai gambar resources/")
+    parser.add_argument("--min-time", type=float, default=0.5, help="durasi minimal per case (detik)")
+    parser.add_argument("--max-iterations", type=int, default=200)
+    parser.add_argument("--out", help="tulis hasil ke file JSON")
+    parser.add_argument("--compare", help="file JSON run sebelumnya untuk dibandingkan")
+    parser.add_argument("--threshold", type=float, default=0.1, help="batas regresi (0.1 = 10%% lebih lambat)")
+    args = parser.parse_args(argv)
+
+    args.cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    args.sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    unknown = [c for c in args.cases if c not in CASES] + [s for s in args.sizes if s not in SYNTHETIC_SIZES]
+    if unknown:
+        parser.error("case / ukuran tidak dikenal: " + ", ".join(unknown))
+    return args
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    inputs = loadInputs(args.sizes, bundled=not args.no_bundled)
+    results = runSuite(args.cases, inputs, args.min_time, args.max_iterations)
+
+    report = {"meta": metadata(), "maxRssMB": maxRssMB(), "results": results}
+
+    exitCode = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        comparison = compareResults(baseline, results, args.threshold)
+        report["comparison"] = comparison
+        for c in comparison:
+            flag = "REGRESI" if c["regression"] else ""
+            print("%-12s %-18s %6.2fx %s" % (c["case"], c["input"], c["ratio"], flag))
+        if any(c["regression"] for c in comparison):
+            exitCode = 1
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return exitCode
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import deque
+
+import cv2
+
+# ============================================================
+# THREADED CAPTURE: decode frame di background thread
+# ============================================================
+# Masalah di chapter 1:
+# - cap.read() (decode) dan imshow/proses ada di loop yang sama
+# - jadi fps = min(fps decode, fps proses), dan kalau decoder "tersendat"
+#   seluruh loop ikut berhenti
+#
+# Solusi:
+# - thread terpisah yang terus memanggil cap.read() ke dalam RING BUFFER
+#   (beberapa slot array yang dialokasikan sekali di frame pertama)
+# - loop utama cukup ambil frame yang sudah siap
+#
+# Dua mode:
+# - "latest"   : untuk webcam/kamera live. Yang diambil selalu frame TERBARU,
+#                frame lama yang belum sempat diproses dibuang (dihitung dropped).
+#                Kalau decoder tersendat, read() tetap mengembalikan frame terakhir
+#                supaya proses tetap jalan.
+# - "lossless" : untuk file video. Tidak ada frame yang dibuang; kalau ring penuh,
+#                thread decoder menunggu sampai consumer mengambil frame.
+#
+# Catatan penting:
+# frame yang dikembalikan read() adalah slot ring buffer, hanya valid sampai
+# read() berikutnya. Kalau mau disimpan lebih lama, pakai frame.copy().
+
+MODE_LATEST = "latest"
+MODE_LOSSLESS = "lossless"
+
+
+class ThreadedCapture:
+    """
+    source      : path file video atau index webcam (0, 1, ...)
+    mode        : "latest" (kamera live) atau "lossless" (file)
+    bufferSize  : jumlah slot ring buffer. Mode "lossless" minimal 2 (1 dipegang consumer,
+                  1 diisi decoder); mode "latest" minimal 3 (+1 slot frame terbaru yang
+                  menunggu dibaca, supaya decoder tidak pernah kehabisan slot)
+    props       : dict {property_id: value} untuk cap.set() sebelum thread jalan,
+                  contoh {3: 640, 4: 480, 10: 100}
+    maxFailures : berapa kali cap.read() boleh gagal berturut-turut sebelum stream
+                  dianggap selesai (file: 1 = EOF, kamera: toleransi hiccup)
+    """
+
+    def __init__(self, source, mode=MODE_LATEST, bufferSize=4, props=None, maxFailures=None):
+        if mode not in (MODE_LATEST, MODE_LOSSLESS):
+            raise ValueError("mode harus 'latest' atau 'lossless', bukan %r" % (mode,))
+        minSlots = 3 if mode == MODE_LATEST else 2
+        if bufferSize < minSlots:
+            raise ValueError("bufferSize minimal %d untuk mode %r" % (minSlots, mode))
+
+        self.source = source
+        self.mode = mode
+        self.bufferSize = bufferSize
+        if maxFailures is None:
+            maxFailures = 1 if mode == MODE_LOSSLESS else 30
+        self.maxFailures = maxFailures
+
+        self.cap = cv2.VideoCapture(source)
+        for propId, value in (props or {}).items():
+            self.cap.set(propId, value)
+
+        # Ring buffer: slot dialokasikan saat frame pertama masuk (ukuran baru diketahui)
+        self._slots = [None] * bufferSize
+        self._free = deque(range(bufferSize))   # slot kosong yang boleh diisi decoder
+        self._ready = deque()                   # slot berisi frame yang belum dibaca
+        self._held = None                       # slot yang sedang dipegang consumer
+
+        self._cond = threading.Condition()
+        self._running = False
+        self._ended = False
+        self._thread = None
+
+        # Counter
+        self.framesDecoded = 0
+        self.framesDelivered = 0
+        self.framesDropped = 0
+        self.staleReads = 0
+        self.readErrors = 0
+
+        if self.cap.isOpened():
+            self.start()
+
+    # ---------------------------
+    # Kontrol thread
+    # ---------------------------
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._decodeLoop, name="ThreadedCapture", daemon=True)
+        self._thread.start()
+        return self
+
+    def release(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.cap.release()
+
+    def isOpened(self):
+        # True selama masih ada frame yang bisa dibaca (atau akan datang)
+        with self._cond:
+            return self.cap.isOpened() and not (self._ended and not self._ready)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    # ---------------------------
+    # Thread decoder (producer)
+    # ---------------------------
+    def _acquireSlot(self):
+        # Ambil slot kosong untuk diisi. Dipanggil dengan lock dipegang.
+        while self._running:
+            if self._free:
+                return self._free.popleft()
+            if self.mode == MODE_LATEST:
+                # Ring penuh: korbankan frame paling lama yang belum dibaca
+                self.framesDropped += 1
+                return self._ready.popleft()
+            # lossless: tunggu consumer
+            self._cond.wait()
+        return None
+
+    def _decodeLoop(self):
+        try:
+            self._decodeFrames()
+        finally:
+            # thread berhenti (EOF, release(), atau exception dari backend): consumer yang
+            # menunggu frame pertama tanpa timeout harus dibangunkan, bukan menunggu selamanya
+            with self._cond:
+                self._ended = True
+                self._cond.notify_all()
+
+    def _decodeFrames(self):
+        failures = 0
+        while True:
+            with self._cond:
+                idx = self._acquireSlot()
+            if idx is None:
+                break
+
+            # Decode di luar lock supaya consumer tidak ikut tertahan
+            success, frame = self.cap.read(self._slots[idx])
+
+            with self._cond:
+                if not success:
+                    self._free.append(idx)
+                    self.readErrors += 1
+                    failures += 1
+                    if failures >= self.maxFailures:
+                        self._ended = True
+                        self._cond.notify_all()
+                        break
+                else:
+                    failures = 0
+                    # Kalau ukuran frame berubah, OpenCV alokasi array baru -> simpan sebagai slot
+                    self._slots[idx] = frame
+                    self._ready.append(idx)
+                    self.framesDecoded += 1
+                    self._cond.notify_all()
+
+            if failures:
+                # kasih jeda kecil sebelum retry supaya tidak busy loop saat kamera hiccup
+                time.sleep(0.005)
+
+    # ---------------------------
+    # Consumer
+    # ---------------------------
+    def read(self, timeout=None):
+        """
+        Sama seperti cap.read(): return (success, frame).
+
+        timeout : detik maksimal menunggu frame baru (None = tunggu terus).
+                  Hanya berlaku di mode "latest" setelah ada frame yang dipegang:
+                  kalau waktu habis, frame terakhir dikembalikan lagi (dihitung
+                  staleReads) supaya proses tetap jalan. Frame pertama (webcam bisa
+                  butuh > 1 detik untuk mulai) dan mode "lossless" selalu ditunggu
+                  sampai ada frame atau stream selesai.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._ready:
+                if self._ended or not self._running:
+                    return False, None
+                # timeout = "pakai frame terakhir", jadi hanya berarti kalau frame itu ada
+                canReuse = self.mode == MODE_LATEST and self._held is not None
+                remaining = None if deadline is None or not canReuse else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.staleReads += 1
+                    return True, self._slots[self._held]
+                self._cond.wait(remaining)
+
+            if self.mode == MODE_LATEST:
+                # Ambil yang terbaru, sisanya dibuang ke free list
+                idx = self._ready.pop()
+                while self._ready:
+                    self._free.append(self._ready.popleft())
+                    self.framesDropped += 1
+            else:
+                idx = self._ready.popleft()
+
+            # Slot lama dari read() sebelumnya boleh dipakai lagi oleh decoder
+            if self._held is not None:
+                self._free.append(self._held)
+            self._held = idx
+            self.framesDelivered += 1
+            self._cond.notify_all()
+            return True, self._slots[idx]
+
+    # ---------------------------
+    # Counter / statistik
+    # ---------------------------
+    @property
+    def droppedFrames(self):
+        return self.framesDropped
+
+    @property
+    def queueDepth(self):
+        with self._cond:
+            return len(self._ready)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "mode": self.mode,
+                "framesDecoded": self.framesDecoded,
+                "framesDelivered": self.framesDelivered,
+                "framesDropped": self.framesDropped,
+                "staleReads": self.staleReads,
+                "readErrors": self.readErrors,
+                "queueDepth": len(self._ready),
+                "bufferSize": self.bufferSize,
+            }
@@ -1,4 +1,7 @@
 import cv2
+
+from capture import ThreadedCapture
+
 print("Packages Imported")  # Sekadar indikator kalau OpenCV berhasil di-import
 
 # =========================
@@ -25,7 +28,16 @@ cv2.waitKey(0)
 # cv2.VideoCapture() membuka sumber video:
 # - bisa path file video (mp4, avi, dll)
 # - atau angka 0/1/... untuk webcam
-cap = cv2.VideoCapture("Resources/test_video.mp4")
+#
+# Di sini kita bungkus dengan ThreadedCapture (lihat capture.py):
+# decode jalan di background thread, jadi imshow/proses tidak menunggu decoder.
+# mode="lossless" -> untuk file, semua frame tetap dibaca berurutan (tidak ada yang dibuang)
+#
+# Kalau video yang sama diputar berulang kali (tuning / benchmark), decode sekali:
+#   python framestore.py record Resources/test_video.mp4 Resources/test_video.frames
+# lalu ganti baris di bawah dengan (read() sama persis, tanpa decode, bisa seek):
+#   cap = FrameReader("Resources/test_video.frames", realtime=True)   # from framestore import FrameReader
+cap = ThreadedCapture("Resources/test_video.mp4", mode="lossless")
 
 while True:
     # cap.read() mengembalikan:
@@ -40,6 +52,8 @@ while True:
         break
 
     cv2.imshow("Video", img)
+    # Tanpa layar (server / robot): ganti imshow dengan sink.openSink("video_debug.avi")
+    # atau openSink("mjpeg:8080") lalu sink.publish(img) -> rekam / stream di background
 
     # cv2.waitKey(1) menunggu 1 ms dan juga "membaca" input keyboard.
     # & 0xFF ini trik umum agar kompatibel di beberapa OS.
@@ -57,18 +71,19 @@ cv2.destroyAllWindows()
 # =========================
 
 # 0 biasanya webcam utama (default)
-cam = cv2.VideoCapture(0)
-
-# cam.set(property_id, value)
+#
+# props = cam.set(property_id, value) yang dijalankan sebelum thread decode mulai
 # 3 = width (lebar)
 # 4 = height (tinggi)
 # 10 = brightness (kecerahan) -> efeknya bisa beda tiap webcam/driver
-cam.set(3, 640)
-cam.set(4, 480)
-cam.set(10, 100)
+#
+# mode="latest" -> selalu ambil frame terbaru, frame lama dibuang (cocok untuk kamera live)
+cam = ThreadedCapture(0, mode="latest", props={3: 640, 4: 480, 10: 100})
 
 while True:
-    success, img = cam.read()
+    # timeout: kalau webcam tersendat, frame terakhir dipakai lagi supaya loop tetap jalan
+    # (frame pertama tetap ditunggu tanpa timeout, webcam sering lambat mulai)
+    success, img = cam.read(timeout=0.5)
 
     # Jika webcam gagal ambil frame, stop loop
     if not success:
@@ -79,5 +94,8 @@ while True:
     if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
+# dropped frame / queue depth berguna untuk tahu apakah proses kalah cepat dari kamera
+print("Webcam stats:", cam.stats())
+
 cam.release()
 cv2.destroyAllWindows()
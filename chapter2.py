@@ -41,6 +41,10 @@ imgDilation = cv2.dilate(imgCanny, kernel, iterations=1)
 # - mengembalikan ketebalan setelah dilate (dilate lalu erode = closing) untuk menutup celah kecil
 imgEroded = cv2.erode(imgDilation, kernel, iterations=1)
 
+# Catatan: dilate -> erode di atas hasilnya SAMA PERSIS dengan 1 langkah closing:
+#   imgEroded = cv2.morphologyEx(imgCanny, cv2.MORPH_CLOSE, kernel)
+# Versi cepat untuk gambar besar (box blur + closing): preprocess.chapter2FastPipeline()
+
 
 cv2.imshow("Original", img)
 # cv2.imshow("Gray Image", imgGray)
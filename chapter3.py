@@ -27,6 +27,12 @@ imgResizeBig   = cv2.resize(img, (800, 800))
 print("Resize 300x300 shape:", imgResizeSmall.shape)
 print("Resize 800x800 shape:", imgResizeBig.shape)
 
+# Kalau 1 gambar di-resize ke banyak ukuran (beberapa consumer), pakai pyramid.ResizeCache:
+#   cache = pyramid.ResizeCache(img)
+#   imgResizeBig = cache.resize((800, 800))
+#   imgResizeSmall = cache.resize((300, 300))   # dihitung dari level cache, bukan dari img
+#   imgCroppedCenter = cache.centerCrop((250, 250))  # view tanpa copy, sudah di-clamp
+
 # =========================
 # B) CROP DASAR (SLICING)
 # =========================
@@ -92,6 +92,15 @@ cv2.putText(
     1                            # ketebalan teks
 )
 
+# Catatan video: kalau anotasinya ratusan per frame (kotak + label deteksi),
+# pakai overlay.Overlay: primitif dikumpulkan sebagai array lalu digambar sekaligus,
+# grid / legenda statis cukup dirasterisasi sekali, teks dari cache glyph.
+#   ov = Overlay()
+#   ov.static("legend").text("OPENCV", (300, 100), (0, 150, 0), cv2.FONT_HERSHEY_COMPLEX, 1)
+#   ov.rects(boxes, (0, 255, 0), 2)
+#   ov.render(frame)        # in-place, tanpa frame.copy()
+
+
 # =========================
 # 7) TAMPILKAN HASIL
 # =========================
@@ -1,6 +1,8 @@
 import cv2
 import numpy as np
 
+from warp import QuadFinder
+
 # =========================
 # CHAPTER 5: PERSPECTIVE WARP (SCAN EFFECT)
 # =========================
@@ -91,9 +93,22 @@ imgOutput = cv2.warpPerspective(img, matrix, (width, height))
 
 
 # =========================
-# 8) Tampilkan hasil
+# 8) (Opsional) Titik sudut OTOMATIS
+# =========================
+# pts1 di atas diukur manual, jadi tidak bisa dipakai untuk webcam/video.
+# QuadFinder (warp.py) mencari objek 4 sudut memakai cara chapter 8:
+# edge (Canny) -> findContours -> approxPolyDP -> yang sudutnya 4.
+# Titiknya otomatis diurutkan TL, TR, BL, BR lalu diperhalus di full resolution.
+quads, scans = QuadFinder().scan(img, size=(width, height))
+print("Quad otomatis (TL, TR, BL, BR):", [q.round(1).tolist() for q in quads])
+
+
+# =========================
+# 9) Tampilkan hasil
 # =========================
 cv2.imshow("Image", img)         # gambar asli
 cv2.imshow("Output", imgOutput)  # hasil warp (kartu jadi lurus)
+if scans:
+    cv2.imshow("Output Auto", scans[0])  # hasil warp dari quad terbesar yang ditemukan
 cv2.waitKey(0)
 cv2.destroyAllWindows()
@@ -1,5 +1,6 @@
 import cv2
-import numpy as np
+
+from stack import stackImages
 
 # ============================================================
 # CHAPTER 6: STACK IMAGES (MENYUSUN BANYAK GAMBAR DALAM 1 WINDOW)
@@ -16,76 +17,11 @@ import numpy as np
 # - Resize semua gambar ke ukuran patokan
 # - Convert grayscale -> BGR
 # - Lalu stack horizontal dan vertical
-
-
-def stackImages(scale, imgArray):
-    """
-    scale    : skala ukuran gambar (misal 0.5 = 50% dari ukuran patokan)
-    imgArray : bisa 2 bentuk:
-               - 1D: [img1, img2, img3]            -> hasil 1 baris
-               - 2D: [[img1, img2], [img3, img4]]  -> hasil grid
-    return   : 1 gambar besar hasil gabungan
-    """
-
-    rows = len(imgArray)                  # jumlah baris
-    rowsAvailable = isinstance(imgArray[0], list)  # True jika 2D list
-
-    # Kalau 2D list, jumlah kolom diambil dari baris pertama
-    cols = len(imgArray[0]) if rowsAvailable else len(imgArray)
-
-    # Ambil ukuran patokan dari gambar pertama (paling kiri atas)
-    # shape[:2] -> (height, width)
-    if rowsAvailable:
-        height, width = imgArray[0][0].shape[:2]
-    else:
-        height, width = imgArray[0].shape[:2]
-
-    # =========================
-    # KASUS A: GRID (2D LIST)
-    # =========================
-    if rowsAvailable:
-        for r in range(rows):
-            for c in range(cols):
-                # 1) Samakan ukuran dulu
-                if imgArray[r][c].shape[:2] == (height, width):
-                    # kalau sama, cukup scale
-                    imgArray[r][c] = cv2.resize(imgArray[r][c], (0, 0), None, scale, scale)
-                else:
-                    # kalau beda, resize ke patokan dulu, lalu scale
-                    imgArray[r][c] = cv2.resize(imgArray[r][c], (width, height), None, scale, scale)
-
-                # 2) Samakan channel
-                # grayscale punya shape (h,w) -> len(shape)==2
-                # convert agar jadi BGR (h,w,3), supaya bisa di-stack bareng gambar warna
-                if len(imgArray[r][c].shape) == 2:
-                    imgArray[r][c] = cv2.cvtColor(imgArray[r][c], cv2.COLOR_GRAY2BGR)
-
-        # Gabungkan tiap baris secara horizontal
-        hor_list = []
-        for r in range(rows):
-            hor_list.append(np.hstack(imgArray[r]))
-
-        # Gabungkan semua baris secara vertical -> jadi grid utuh
-        ver = np.vstack(hor_list)
-        return ver
-
-    # =========================
-    # KASUS B: 1 BARIS (1D LIST)
-    # =========================
-    else:
-        for i in range(rows):
-            # 1) Samakan ukuran
-            if imgArray[i].shape[:2] == (height, width):
-                imgArray[i] = cv2.resize(imgArray[i], (0, 0), None, scale, scale)
-            else:
-                imgArray[i] = cv2.resize(imgArray[i], (width, height), None, scale, scale)
-
-            # 2) Samakan channel
-            if len(imgArray[i].shape) == 2:
-                imgArray[i] = cv2.cvtColor(imgArray[i], cv2.COLOR_GRAY2BGR)
-
-        # Gabungkan semua gambar jadi 1 baris
-        return np.hstack(imgArray)
+#
+# Implementasinya sekarang ada di stack.py (dipakai bersama chapter 7 & 8):
+# - kanvas akhir dialokasikan sekali, tiap gambar ditulis langsung ke posisinya
+#   (tanpa np.hstack / np.vstack yang meng-copy ulang semua pixel)
+# - baris boleh beda panjang, channel boleh campur (gray / BGR / BGRA)
 
 
 # =========================
@@ -1,5 +1,8 @@
 import cv2
-import numpy as np
+
+from capture import ThreadedCapture
+from colors import HsvTuner
+from stack import Mosaic
 
 # ============================================================
 # CHAPTER 7: COLOR DETECTION (HSV + TRACKBAR)
@@ -24,63 +27,6 @@ def empty(a=None):
     pass
 
 
-# ---------------------------
-# stackImages: fungsi bantu untuk menampilkan banyak gambar dalam 1 window (grid)
-# (ini dari chapter 6) -> agar Original, HSV, Mask, Result bisa terlihat sekaligus
-# ---------------------------
-def stackImages(scale, imgArray):
-    rows = len(imgArray)
-    cols = len(imgArray[0])
-    rowsAvailable = isinstance(imgArray[0], list)
-
-    width = imgArray[0][0].shape[1]
-    height = imgArray[0][0].shape[0]
-
-    if rowsAvailable:
-        for x in range(rows):
-            for y in range(cols):
-
-                # 1) Samakan ukuran
-                if imgArray[x][y].shape[:2] == imgArray[0][0].shape[:2]:
-                    imgArray[x][y] = cv2.resize(imgArray[x][y], (0, 0), None, scale, scale)
-                else:
-                    imgArray[x][y] = cv2.resize(
-                        imgArray[x][y],
-                        (imgArray[0][0].shape[1], imgArray[0][0].shape[0]),
-                        None, scale, scale
-                    )
-
-                # 2) Samakan channel (grayscale -> BGR)
-                if len(imgArray[x][y].shape) == 2:
-                    imgArray[x][y] = cv2.cvtColor(imgArray[x][y], cv2.COLOR_GRAY2BGR)
-
-        imageBlank = np.zeros((height, width, 3), np.uint8)
-
-        hor = [imageBlank] * rows
-        for x in range(rows):
-            hor[x] = np.hstack(imgArray[x])
-
-        ver = np.vstack(hor)
-
-    else:
-        for x in range(rows):
-            if imgArray[x].shape[:2] == imgArray[0].shape[:2]:
-                imgArray[x] = cv2.resize(imgArray[x], (0, 0), None, scale, scale)
-            else:
-                imgArray[x] = cv2.resize(
-                    imgArray[x],
-                    (imgArray[0].shape[1], imgArray[0].shape[0]),
-                    None, scale, scale
-                )
-
-            if len(imgArray[x].shape) == 2:
-                imgArray[x] = cv2.cvtColor(imgArray[x], cv2.COLOR_GRAY2BGR)
-
-        ver = np.hstack(imgArray)
-
-    return ver
-
-
 # ============================================================
 # 1) SETUP TRACKBAR (SLIDER) UNTUK HSV
 # ============================================================
@@ -105,12 +51,27 @@ cv2.createTrackbar("Val Min", "TrackBars", 153, 255, empty)
 cv2.createTrackbar("Val Max", "TrackBars", 255, 255, empty)
 
 
+# Nama trackbar dengan urutan bounds (h_min, h_max, s_min, s_max, v_min, v_max)
+TRACKBARS = ("Hue Min", "Hue Max", "Sat Min", "Sat Max", "Val Min", "Val Max")
+
+# Mosaic untuk tampilan grid: kanvas dialokasikan sekali, dipakai ulang tiap loop
+mosaic = Mosaic(0.6)
+
+
 # ============================================================
-# 2) LOOP: BACA GAMBAR -> CONVERT HSV -> MASK -> RESULT
+# 2) SUMBER GAMBAR: FILE (SEKALI) ATAU KAMERA (PER FRAME)
 # ============================================================
+# None -> gambar diam dari path. Dibaca, di-resize, dan di-convert ke HSV
+#         SEKALI saja (dulu dilakukan ulang di setiap loop padahal gambarnya sama).
+# 0    -> webcam. HSV dihitung sekali per frame.
+cameraSource = None
 
-while True:
-    # Baca gambar setiap loop (biar update hasil realtime saat slider digeser)
+# HsvTuner (colors.py) menyimpan HSV, mask, dan result di buffer yang dipakai ulang
+tuner = HsvTuner()
+cam = None
+img = None
+
+if cameraSource is None:
     img = cv2.imread(path)
 
     # Validasi: pastikan file ada
@@ -120,48 +81,57 @@ while True:
     # Resize agar ukuran stabil saat ditampilkan
     img = cv2.resize(img, (600, 400))
 
-    # Convert BGR -> HSV
-    imgHSV = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    # Convert BGR -> HSV (sekali)
+    tuner.setImage(img)
+else:
+    cam = ThreadedCapture(cameraSource, mode="latest")
 
-    # Ambil nilai slider (range HSV)
-    h_min = cv2.getTrackbarPos("Hue Min", "TrackBars")
-    h_max = cv2.getTrackbarPos("Hue Max", "TrackBars")
-    s_min = cv2.getTrackbarPos("Sat Min", "TrackBars")
-    s_max = cv2.getTrackbarPos("Sat Max", "TrackBars")
-    v_min = cv2.getTrackbarPos("Val Min", "TrackBars")
-    v_max = cv2.getTrackbarPos("Val Max", "TrackBars")
 
-    # Print agar kamu tahu nilai range yang pas untuk suatu warna
-    print("HSV:", h_min, h_max, s_min, s_max, v_min, v_max)
+# ============================================================
+# 3) LOOP: AMBIL SLIDER -> MASK -> RESULT (HANYA KALAU BERUBAH)
+# ============================================================
 
-    # Buat batas bawah dan atas HSV (range warna yang mau diambil)
-    lower = np.array([h_min, s_min, v_min])
-    upper = np.array([h_max, s_max, v_max])
+while True:
+    if cam is not None:
+        success, frame = cam.read(timeout=0.5)
+        if not success:
+            break
+        # resize ke buffer yang sama setiap frame, lalu convert HSV
+        img = cv2.resize(frame, (600, 400), img)
+        tuner.setImage(img)
 
-    # ============================================================
-    # MASK: cv2.inRange()
-    # ============================================================
-    # inRange menghasilkan gambar biner:
-    # - pixel putih (255) jika HSV pixel berada di dalam range lower..upper
-    # - pixel hitam (0) jika di luar range
-    mask = cv2.inRange(imgHSV, lower, upper)
+    # Ambil nilai slider (range HSV)
+    bounds = tuple(cv2.getTrackbarPos(name, "TrackBars") for name in TRACKBARS)
 
     # ============================================================
-    # RESULT: bitwise_and
+    # MASK + RESULT
     # ============================================================
-    # Mengambil pixel asli img yang mask-nya putih saja.
-    # Yang mask-nya hitam akan jadi hitam di hasil.
-    imgResult = cv2.bitwise_and(img, img, mask=mask)
-
-    # Tampilkan semua tahap dalam 1 window menggunakan stackImages:
-    # [Original | HSV]
-    # [Mask     | Result]
-    imgStack = stackImages(0.6, ([img, imgHSV],
-                                 [mask, imgResult]))
-    cv2.imshow("CHAPTER 7 - Stacked Images", imgStack)
-
+    # mask   = cv2.inRange(imgHSV, lower, upper)
+    #          pixel putih (255) jika HSV pixel berada di dalam range lower..upper
+    # result = cv2.bitwise_and(img, img, mask=mask)
+    #          ambil pixel asli img yang mask-nya putih saja
+    #
+    # tuner.update() hanya menghitung ulang kalau slider digeser (atau frame baru).
+    # Kalau tidak ada yang berubah, changed = False dan tidak ada yang perlu digambar ulang.
+    mask, imgResult, changed = tuner.update(bounds)
+
+    if changed:
+        # Print agar kamu tahu nilai range yang pas untuk suatu warna
+        if cam is None:
+            print("HSV:", *bounds)
+
+        # Tampilkan semua tahap dalam 1 window (Mosaic dari stack.py):
+        # [Original | HSV]
+        # [Mask     | Result]
+        imgStack = mosaic.compose([[img, tuner.imgHSV],
+                                   [mask, imgResult]])
+        cv2.imshow("CHAPTER 7 - Stacked Images", imgStack)
+
+    # Gambar diam: tidak perlu polling 1 ms (itu yang bikin 1 core 100% saat idle).
     # Tekan 'q' untuk keluar
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+    if cv2.waitKey(1 if cam is not None else 30) & 0xFF == ord('q'):
         break
 
+if cam is not None:
+    cam.release()
 cv2.destroyAllWindows()
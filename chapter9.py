@@ -51,6 +51,8 @@ print("Jumlah wajah terdeteksi:", len(faces))
 for (x, y, w, h) in faces:
     cv2.rectangle(img, (x, y), (x + w, y + h), (255, 0, 0), 2)
     # warna (255,0,0) = biru (ingat OpenCV BGR)
+# Di video: overlay.annotateFaces(overlay, faces) tiap frame + overlay.render(frame),
+# kotak semua wajah dikumpulkan lalu digambar sekaligus (lihat overlay.py)
 
 # 6) Tampilkan hasil
 cv2.imshow("CHAPTER 9 - Face Detection Result", img)
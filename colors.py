@@ -0,0 +1,272 @@
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# COLOR DETECTION HSV (dari chapter 7)
+# ============================================================
+# Bounds HSV selalu ditulis dengan urutan trackbar chapter 7:
+# (h_min, h_max, s_min, s_max, v_min, v_max)
+#
+# Hue OpenCV 0..179, Sat & Val 0..255.
+
+
+def hsvMask(imgHSV, bounds, dst=None):
+    h_min, h_max, s_min, s_max, v_min, v_max = bounds
+    lower = np.array([h_min, s_min, v_min])
+    upper = np.array([h_max, s_max, v_max])
+    return cv2.inRange(imgHSV, lower, upper, dst)
+
+
+class HsvTuner:
+    """
+    Cache untuk tuning range HSV (chapter 7).
+
+    - setImage(img) : convert BGR -> HSV SEKALI per gambar/frame, hasil HSV disimpan
+    - update(bounds): mask + result dihitung ulang HANYA kalau bounds berubah
+                      atau gambar baru sudah di-set
+
+    Gambar diam (file): setImage() cukup dipanggil sekali di awal.
+    Kamera live       : setImage(frame) sekali per frame.
+
+    Buffer HSV / mask / result dialokasikan sekali dan dipakai ulang.
+    """
+
+    def __init__(self, img=None):
+        self.img = None
+        self.imgHSV = None
+        self.mask = None
+        self.result = None
+        self.bounds = None
+        self._dirty = True
+
+        # counter: berapa kali benar-benar dihitung vs dipakai dari cache
+        self.recomputes = 0
+        self.cacheHits = 0
+
+        if img is not None:
+            self.setImage(img)
+
+    def setImage(self, img):
+        if self.imgHSV is None or self.imgHSV.shape != img.shape:
+            self.imgHSV = np.empty_like(img)
+            self.mask = np.empty(img.shape[:2], np.uint8)
+            self.result = np.empty_like(img)
+        self.img = img
+        cv2.cvtColor(img, cv2.COLOR_BGR2HSV, self.imgHSV)
+        self._dirty = True
+
+    def update(self, bounds):
+        """
+        bounds : (h_min, h_max, s_min, s_max, v_min, v_max)
+        return : (mask, result, changed)
+                 changed = False artinya hasil diambil dari cache (tidak ada yang berubah)
+        """
+        bounds = tuple(int(b) for b in bounds)
+        if not self._dirty and bounds == self.bounds:
+            self.cacheHits += 1
+            return self.mask, self.result, False
+
+        hsvMask(self.imgHSV, bounds, self.mask)
+
+        # bitwise_and dengan mask tidak menyentuh pixel di luar mask,
+        # jadi buffer result dinolkan dulu (hasilnya sama dengan chapter 7)
+        self.result.fill(0)
+        cv2.bitwise_and(self.img, self.img, self.result, mask=self.mask)
+
+        self.bounds = bounds
+        self._dirty = False
+        self.recomputes += 1
+        return self.mask, self.result, True
+
+
+# ============================================================
+# SEGMENTASI BANYAK WARNA SEKALIGUS (LOOKUP TABLE)
+# ============================================================
+# Chapter 7 hanya 1 range -> 1 cv2.inRange. Kalau robot melacak N warna,
+# cara biasa = N kali inRange (+1 lagi untuk merah yang hue-nya "melingkar"
+# melewati 0/179, misal 170..10).
+#
+# ColorSegmenter menyusun semua range jadi LUT bitmask per channel:
+# - tiap kelas warna dapat 1 bit (8 kelas per grup uint8)
+# - lutH[h], lutS[s], lutV[v] = bit kelas yang menerima nilai itu
+# - bits = lutH[H] & lutS[S] & lutV[V]  -> pixel masuk kelas k kalau bit k nyala
+# - bits -> label lewat LUT "bit terendah" (kelas yang didefinisikan lebih dulu menang)
+#
+# Hue melingkar cukup ditandai h_min > h_max, contoh merah (170, 10, ...).
+# Hasil: 1 gambar label uint8 (0 = bukan warna apa pun, 1..N = kelas ke-i).
+
+BACKGROUND = 0
+
+
+class ColorSegmenter:
+    """
+    ranges : dict {nama: (h_min, h_max, s_min, s_max, v_min, v_max)} atau list of (nama, bounds).
+             Urutan = prioritas kalau range saling tumpang tindih.
+             h_min > h_max artinya hue melingkar (wrap di 179 -> 0).
+    """
+
+    MAX_CLASSES = 255
+
+    def __init__(self, ranges):
+        items = list(ranges.items()) if isinstance(ranges, dict) else list(ranges)
+        if not items:
+            raise ValueError("Minimal 1 range warna")
+        if len(items) > self.MAX_CLASSES:
+            raise ValueError("Maksimal %d kelas warna" % self.MAX_CLASSES)
+
+        self.names = [name for name, _ in items]
+        self.bounds = [tuple(int(b) for b in bounds) for _, bounds in items]
+        self._groups = [self._compileGroup(g) for g in range(0, len(items), 8)]
+        self._buffers = None
+
+    def _compileGroup(self, start):
+        lutH = np.zeros(256, np.uint8)
+        lutS = np.zeros(256, np.uint8)
+        lutV = np.zeros(256, np.uint8)
+
+        for k, bounds in enumerate(self.bounds[start:start + 8]):
+            h_min, h_max, s_min, s_max, v_min, v_max = bounds
+            bit = np.uint8(1 << k)
+            if h_min <= h_max:
+                lutH[h_min:h_max + 1] |= bit
+            else:
+                lutH[h_min:180] |= bit
+                lutH[0:h_max + 1] |= bit
+            lutS[s_min:s_max + 1] |= bit
+            lutV[v_min:v_max + 1] |= bit
+
+        # bitmask -> label global (bit terendah = kelas paling awal)
+        lutLabel = np.zeros(256, np.uint8)
+        for bits in range(1, 256):
+            lowBit = (bits & -bits).bit_length() - 1
+            if start + lowBit < len(self.bounds):
+                lutLabel[bits] = start + lowBit + 1
+        return lutH, lutS, lutV, lutLabel
+
+    def _prepare(self, shape):
+        if self._buffers is None or self._buffers["labels"].shape != shape:
+            self._buffers = {
+                "channels": [np.empty(shape, np.uint8) for _ in range(3)],
+                "bits": [np.empty(shape, np.uint8) for _ in range(3)],
+                "group": np.empty(shape, np.uint8),
+                "labels": np.empty(shape, np.uint8),
+            }
+        return self._buffers
+
+    def label(self, imgHSV, dst=None):
+        """
+        imgHSV : gambar HSV uint8 (hasil cvtColor BGR2HSV)
+        dst    : (opsional) buffer output uint8 (h, w)
+        return : gambar label uint8 (0 = background, i+1 = self.names[i])
+        """
+        buf = self._prepare(imgHSV.shape[:2])
+        h, s, v = cv2.split(imgHSV, buf["channels"])
+        bh, bs, bv = buf["bits"]
+        labels = buf["labels"] if dst is None else dst
+
+        for g, (lutH, lutS, lutV, lutLabel) in enumerate(self._groups):
+            cv2.LUT(h, lutH, bh)
+            cv2.LUT(s, lutS, bs)
+            cv2.LUT(v, lutV, bv)
+            cv2.bitwise_and(bh, bs, bh)
+            cv2.bitwise_and(bh, bv, bh)
+            if g == 0:
+                cv2.LUT(bh, lutLabel, labels)
+            else:
+                # grup berikutnya hanya mengisi pixel yang belum punya label
+                groupLabels = cv2.LUT(bh, lutLabel, buf["group"])
+                np.copyto(labels, groupLabels, where=labels == BACKGROUND)
+        return labels
+
+    def labelBGR(self, img, dst=None):
+        return self.label(cv2.cvtColor(img, cv2.COLOR_BGR2HSV), dst)
+
+    def mask(self, labels, name, dst=None):
+        # mask 0/255 untuk 1 kelas warna (seperti hasil inRange)
+        return cv2.compare(labels, self.names.index(name) + 1, cv2.CMP_EQ, dst)
+
+
+def inRangeLabels(imgHSV, ranges):
+    """
+    Versi referensi (lambat) untuk perbandingan: N kali cv2.inRange,
+    hue melingkar = 2 kali inRange lalu OR. Prioritas sama dengan ColorSegmenter.
+    """
+    items = list(ranges.items()) if isinstance(ranges, dict) else list(ranges)
+    labels = np.zeros(imgHSV.shape[:2], np.uint8)
+    for i, (_, bounds) in enumerate(items):
+        h_min, h_max, s_min, s_max, v_min, v_max = bounds
+        if h_min <= h_max:
+            mask = hsvMask(imgHSV, bounds)
+        else:
+            mask = cv2.bitwise_or(hsvMask(imgHSV, (h_min, 179, s_min, s_max, v_min, v_max)),
+                                  hsvMask(imgHSV, (0, h_max, s_min, s_max, v_min, v_max)))
+        labels[(mask > 0) & (labels == BACKGROUND)] = i + 1
+    return labels
+
+
+def benchmarkSegmentation(imgHSV, ranges, repeat=50):
+    """
+    Bandingkan ColorSegmenter vs N kali inRange di gambar yang sama.
+    return : dict waktu rata-rata (ms) + apakah hasilnya identik
+    """
+    segmenter = ColorSegmenter(ranges)
+    items = list(ranges.items()) if isinstance(ranges, dict) else list(ranges)
+
+    def masksOnly():
+        # baseline minimal: hanya N mask (tanpa menyusun label)
+        for _, bounds in items:
+            h_min, h_max, s_min, s_max, v_min, v_max = bounds
+            if h_min <= h_max:
+                hsvMask(imgHSV, bounds)
+            else:
+                hsvMask(imgHSV, (h_min, 179, s_min, s_max, v_min, v_max))
+                hsvMask(imgHSV, (0, h_max, s_min, s_max, v_min, v_max))
+
+    def timeIt(fn):
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return 1000.0 * (time.perf_counter() - t0) / repeat
+
+    return {
+        "classes": len(items),
+        "pixels": int(imgHSV.shape[0] * imgHSV.shape[1]),
+        "lutMs": timeIt(lambda: segmenter.label(imgHSV)),
+        "inRangeMasksMs": timeIt(masksOnly),
+        "inRangeLabelsMs": timeIt(lambda: inRangeLabels(imgHSV, items)),
+        "identical": bool(np.array_equal(segmenter.label(imgHSV), inRangeLabels(imgHSV, items))),
+    }
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # python colors.py [gambar]  -> benchmark LUT vs N x inRange
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                              "resources", "lambo.png")
+    img = cv2.imread(path)
+    if img is None:
+        raise FileNotFoundError("Gambar tidak ditemukan. Cek path: " + path)
+    imgHSV = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+
+    colorSets = {
+        "lambo (chapter 7)": {"lambo": (0, 19, 110, 240, 153, 255)},
+        "4 warna": {
+            "red": (170, 10, 100, 255, 80, 255),     # hue melingkar
+            "yellow": (20, 35, 100, 255, 100, 255),
+            "green": (36, 85, 60, 255, 50, 255),
+            "blue": (90, 130, 80, 255, 50, 255),
+        },
+    }
+    colorSets["12 warna"] = {"c%d" % i: ((i * 15 + 170) % 180, (i * 15 + 184) % 180, 40, 255, 40, 255)
+                             for i in range(12)}
+
+    print("%-18s %8s %10s %14s %15s %10s" % ("set", "kelas", "LUT ms", "inRange ms", "inRange+label", "identik"))
+    for name, ranges in colorSets.items():
+        r = benchmarkSegmentation(imgHSV, ranges)
+        print("%-18s %8d %10.2f %14.2f %15.2f %10s" % (name, r["classes"], r["lutMs"], r["inRangeMasksMs"],
+                                                       r["inRangeLabelsMs"], r["identical"]))
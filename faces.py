@@ -0,0 +1,543 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# ============================================================
+# FACE DETECTION (dari chapter 9)
+# ============================================================
+# Haar Cascade: load XML sekali, lalu detectMultiScale di gambar grayscale.
+
+DEFAULT_CASCADE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "resources", "haarcascade_frontalface_default.xml")
+
+
+def loadCascade(path=DEFAULT_CASCADE):
+    faceCascade = cv2.CascadeClassifier(path)
+    if faceCascade.empty():
+        raise FileNotFoundError("Classifier XML tidak ditemukan / gagal diload. Cek path " + path)
+    return faceCascade
+
+
+def detectFaces(img, faceCascade, scaleFactor=1.1, minNeighbors=4, minSize=None, maxSize=None):
+    """
+    img          : gambar BGR atau grayscale
+    faceCascade  : hasil loadCascade()
+    scaleFactor  : langkah pengecilan antar skala (1.1 = 10%)
+    minNeighbors : keketatan deteksi
+    minSize      : (w, h) wajah terkecil yang dicari (None = bawaan OpenCV)
+    maxSize      : (w, h) wajah terbesar yang dicari (None = tanpa batas)
+    return       : list of (x, y, w, h)
+    """
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+    kwargs = {}
+    if minSize is not None:
+        kwargs["minSize"] = tuple(minSize)
+    if maxSize is not None:
+        kwargs["maxSize"] = tuple(maxSize)
+
+    faces = faceCascade.detectMultiScale(imgGray, scaleFactor=scaleFactor,
+                                         minNeighbors=minNeighbors, **kwargs)
+    return [tuple(int(v) for v in face) for face in faces]
+
+
+def drawFaces(img, faces, color=(255, 0, 0)):
+    for (x, y, w, h) in faces:
+        cv2.rectangle(img, (x, y), (x + w, y + h), color, 2)
+    return img
+
+
+# ============================================================
+# STREAMING FACE DETECTION (VIDEO / WEBCAM)
+# ============================================================
+# detectMultiScale di full resolution per frame terlalu berat untuk video.
+# FaceStream mengurangi kerja detector:
+#
+# 1) Deteksi penuh (full frame) hanya tiap `detectEvery` frame,
+#    atau kalau terjadi scene change (beda thumbnail frame terlalu besar).
+# 2) Deteksi dilakukan di gambar yang diperkecil (`downscale`).
+# 3) Di antara deteksi penuh, tiap wajah dilacak dengan tracker murah
+#    (matchTemplate di sekitar posisi lama), lalu cascade dijalankan ulang
+#    HANYA di dalam ROI yang diperluas di sekitar wajah itu.
+# 4) Wajah yang tidak ketemu lagi beberapa kali berturut-turut dibuang.
+#
+# Hasil selalu dalam koordinat frame asli: list of (x, y, w, h).
+
+
+class _FaceTrack:
+    def __init__(self, box, template):
+        self.box = box              # (x, y, w, h) di koordinat gambar kecil
+        self.template = template    # potongan gray untuk matchTemplate
+        self.misses = 0
+
+
+class FaceStream:
+    """
+    faceCascade   : hasil loadCascade()
+    detectEvery   : jalankan deteksi penuh tiap N frame
+    downscale     : skala gambar untuk deteksi (0.5 = setengah ukuran)
+    minSize       : (w, h) wajah terkecil di koordinat frame asli (None = bawaan OpenCV)
+    maxSize       : (w, h) wajah terbesar di koordinat frame asli (None = tanpa batas)
+    sceneChange   : rata-rata beda pixel thumbnail (0..255) yang dianggap ganti adegan
+    roiExpand     : perluasan ROI di sekitar wajah (0.5 = 50% dari ukuran wajah tiap sisi)
+    roiRedetect   : jalankan cascade di dalam ROI (False = hanya tracker)
+    maxMisses     : berapa kali wajah boleh tidak ketemu sebelum dibuang
+    """
+
+    def __init__(self, faceCascade, detectEvery=10, downscale=0.5, minSize=None, maxSize=None,
+                 scaleFactor=1.1, minNeighbors=4, sceneChange=20.0, roiExpand=0.5,
+                 roiRedetect=True, maxMisses=3, matchThreshold=0.5):
+        self.faceCascade = faceCascade
+        self.detectEvery = max(1, int(detectEvery))
+        self.downscale = downscale
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.scaleFactor = scaleFactor
+        self.minNeighbors = minNeighbors
+        self.sceneChange = sceneChange
+        self.roiExpand = roiExpand
+        self.roiRedetect = roiRedetect
+        self.maxMisses = maxMisses
+        self.matchThreshold = matchThreshold
+
+        self.tracks = []
+        self.frameIndex = 0
+        self._gray = None           # view gray frame sekarang (bisa frame milik caller, read-only)
+        self._small = None          # view gambar deteksi (_gray atau _smallBuf)
+        self._grayBuf = None        # buffer milik FaceStream: hasil cvtColor
+        self._smallBuf = None       # buffer milik FaceStream: hasil resize
+        self._thumb = None
+        self._lastThumb = None
+
+        # Counter
+        self.fullDetections = 0
+        self.sceneChanges = 0
+        self.roiDetections = 0
+        self.seconds = 0.0
+
+    # ---------------------------
+    # Helper ukuran & koordinat
+    # ---------------------------
+    def _scaledSize(self, size):
+        if size is None:
+            return None
+        return tuple(max(1, int(round(v * self.downscale))) for v in size)
+
+    def _toFrame(self, box):
+        s = 1.0 / self.downscale
+        return tuple(int(round(v * s)) for v in box)
+
+    def _prepare(self, frame):
+        # Hasil cvtColor / resize hanya ditulis ke buffer milik sendiri: frame gray dari
+        # caller dipakai langsung (tanpa copy) tapi tidak pernah dijadikan dst
+        if frame.ndim == 3:
+            self._grayBuf = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, self._grayBuf)
+            self._gray = self._grayBuf
+        else:
+            self._gray = frame
+
+        if self.downscale != 1.0:
+            h, w = self._gray.shape
+            size = (max(1, int(round(w * self.downscale))), max(1, int(round(h * self.downscale))))
+            self._smallBuf = cv2.resize(self._gray, size, self._smallBuf, interpolation=cv2.INTER_AREA)
+            self._small = self._smallBuf
+        else:
+            self._small = self._gray
+
+        self._thumb = cv2.resize(self._small, (32, 24), self._thumb, interpolation=cv2.INTER_AREA)
+
+    def _isSceneChange(self):
+        changed = False
+        if self._lastThumb is not None:
+            changed = cv2.norm(self._thumb, self._lastThumb, cv2.NORM_L1) / self._thumb.size > self.sceneChange
+        if self._lastThumb is None:
+            self._lastThumb = self._thumb.copy()
+        else:
+            self._lastThumb[...] = self._thumb
+        return changed
+
+    def _newTrack(self, box):
+        x, y, w, h = box
+        return _FaceTrack(box, self._small[y:y + h, x:x + w].copy())
+
+    def _dedupTracks(self, tracks):
+        # Tracker dan cascade ROI bisa membawa 2 track ke wajah yang sama: gabung lewat NMS
+        # (track dengan box lebih besar diutamakan, urutan track dipertahankan)
+        return [tracks[i] for i in _suppressIndices([t.box for t in tracks])]
+
+    # ---------------------------
+    # Deteksi penuh & lacak
+    # ---------------------------
+    def _detectFull(self):
+        faces = self._detect(self._small, self._scaledSize(self.minSize), self._scaledSize(self.maxSize))
+        self.tracks = self._dedupTracks([self._newTrack(box) for box in faces])
+        self.fullDetections += 1
+
+    def _detect(self, imgGray, minSize, maxSize):
+        kwargs = {}
+        if minSize is not None:
+            kwargs["minSize"] = minSize
+        if maxSize is not None:
+            kwargs["maxSize"] = maxSize
+        faces = self.faceCascade.detectMultiScale(imgGray, scaleFactor=self.scaleFactor,
+                                                  minNeighbors=self.minNeighbors, **kwargs)
+        return [tuple(int(v) for v in face) for face in faces]
+
+    def _roi(self, box):
+        x, y, w, h = box
+        H, W = self._small.shape
+        dx, dy = int(w * self.roiExpand), int(h * self.roiExpand)
+        x1, y1 = max(0, x - dx), max(0, y - dy)
+        x2, y2 = min(W, x + w + dx), min(H, y + h + dy)
+        return x1, y1, x2, y2
+
+    def _updateTrack(self, track):
+        x1, y1, x2, y2 = self._roi(track.box)
+        window = self._small[y1:y2, x1:x2]
+        _, _, w, h = track.box
+
+        # 1) Tracker murah: cari template wajah lama di dalam ROI
+        found = False
+        if window.shape[0] >= h and window.shape[1] >= w:
+            scores = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+            _, best, _, (bx, by) = cv2.minMaxLoc(scores)
+            if best >= self.matchThreshold:
+                track.box = (x1 + bx, y1 + by, w, h)
+                found = True
+
+        # 2) Cascade hanya di dalam ROI, ukuran wajah dibatasi di sekitar ukuran lama
+        if self.roiRedetect:
+            self.roiDetections += 1
+            minSize = (max(1, int(w * 0.7)), max(1, int(h * 0.7)))
+            maxSize = (int(w * 1.4) + 1, int(h * 1.4) + 1)
+            faces = self._detect(window, minSize, maxSize)
+            if faces:
+                tx, ty = track.box[0] - x1, track.box[1] - y1
+                fx, fy, fw, fh = min(faces, key=lambda f: abs(f[0] - tx) + abs(f[1] - ty))
+                track.box = (x1 + fx, y1 + fy, fw, fh)
+                track.template = self._small[track.box[1]:track.box[1] + fh, track.box[0]:track.box[0] + fw].copy()
+                found = True
+
+        # tidak ketemu oleh tracker maupun cascade -> hitung sebagai miss
+        track.misses = 0 if found else track.misses + 1
+        return track.misses <= self.maxMisses
+
+    def process(self, frame):
+        """
+        frame  : frame BGR (atau grayscale) dari video / webcam
+        return : list of (x, y, w, h) di koordinat frame asli
+        """
+        t0 = time.perf_counter()
+        self._prepare(frame)
+
+        sceneChanged = self._isSceneChange()
+        if sceneChanged:
+            self.sceneChanges += 1
+
+        if self.frameIndex % self.detectEvery == 0 or sceneChanged:
+            self._detectFull()
+        else:
+            self.tracks = self._dedupTracks([t for t in self.tracks if self._updateTrack(t)])
+
+        self.frameIndex += 1
+        self.seconds += time.perf_counter() - t0
+        return [self._toFrame(t.box) for t in self.tracks]
+
+    def stats(self):
+        return {
+            "frames": self.frameIndex,
+            "fullDetections": self.fullDetections,
+            "sceneChanges": self.sceneChanges,
+            "roiDetections": self.roiDetections,
+            "tracks": len(self.tracks),
+            "fps": self.frameIndex / self.seconds if self.seconds > 0 else 0.0,
+        }
+
+
+def benchmarkStream(frames, faceCascade, **kwargs):
+    """
+    Bandingkan FaceStream vs detectMultiScale full resolution di setiap frame.
+    frames : list frame BGR (urut seperti video)
+    kwargs : parameter FaceStream (detectEvery, downscale, ...)
+    return : dict fps kedua cara + speedup
+    """
+    t0 = time.perf_counter()
+    for frame in frames:
+        detectFaces(frame, faceCascade)
+    fullSeconds = time.perf_counter() - t0
+
+    stream = FaceStream(faceCascade, **kwargs)
+    for frame in frames:
+        stream.process(frame)
+
+    fullFps = len(frames) / fullSeconds if fullSeconds > 0 else 0.0
+    result = stream.stats()
+    result["everyFrameFps"] = fullFps
+    result["speedup"] = result["fps"] / fullFps if fullFps > 0 else 0.0
+    return result
+
+
+def _syntheticPan(img, frames=60, step=3):
+    # Video buatan: kamera "geser" pelan di atas gambar diam
+    h, w = img.shape[:2]
+    cropW, cropH = w - step * frames, h
+    if cropW < w // 2:
+        cropW = w // 2
+    return [img[0:cropH, min(i * step, w - cropW):min(i * step, w - cropW) + cropW] for i in range(frames)]
+
+
+# ============================================================
+# TILED FACE DETECTION (GAMBAR SANGAT BESAR, MULTI-CORE)
+# ============================================================
+# detectMultiScale di panorama / foto 8K hanya memakai 1 core untuk seluruh gambar.
+# TiledFaceDetector:
+# 1) gambar grayscale ditulis SEKALI ke shared memory
+#    (worker membaca langsung dari situ, pixel tidak di-pickle antar proses)
+# 2) gambar dibagi jadi tile yang saling overlap. Overlap >= wajah terbesar
+#    yang dicari (maxFace), jadi setiap wajah pasti utuh di minimal 1 tile
+# 3) tiap tile dideteksi di process pool
+# 4) hasil semua tile digabung dengan non-maximum suppression (NMS)
+#
+# Contoh:
+#   with TiledFaceDetector(workers=4, maxFace=(300, 300)) as detector:
+#       faces = detector.detect(img)
+
+# State per worker process
+_tileWorker = {}
+
+
+def _initTileWorker(cascadePath):
+    # 1 thread OpenCV per proses: paralelisme sudah dari jumlah proses
+    cv2.setNumThreads(1)
+    _tileWorker["cascade"] = loadCascade(cascadePath)
+    _tileWorker["shm"] = None       # (name, SharedMemory) gambar yang terakhir di-attach
+
+
+def _attachShared(name):
+    # Tiap detect() memakai segmen baru: handle segmen lama ditutup dulu supaya worker
+    # yang hidup lama tidak menumpuk mapping ke segmen yang sudah di-unlink
+    cached = _tileWorker["shm"]
+    if cached is not None and cached[0] == name:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    shm = shared_memory.SharedMemory(name=name)
+    _tileWorker["shm"] = (name, shm)
+    return shm
+
+
+def _detectTile(task):
+    name, shape, (x1, y1, x2, y2), params = task
+    shm = _attachShared(name)
+    imgGray = np.ndarray(shape, np.uint8, shm.buf)
+    faces = detectFaces(imgGray[y1:y2, x1:x2], _tileWorker["cascade"], **params)
+    return [(x + x1, y + y1, w, h) for (x, y, w, h) in faces]
+
+
+def tileGrid(shape, tileSize, overlap):
+    """
+    shape    : (h, w) gambar
+    tileSize : ukuran sisi tile (pixel)
+    overlap  : overlap antar tile (pixel), minimal sebesar wajah terbesar
+    return   : list (x1, y1, x2, y2)
+    """
+    h, w = shape[:2]
+    step = max(1, tileSize - overlap)
+
+    def starts(length):
+        if length <= tileSize:
+            return [0]
+        s = list(range(0, length - tileSize, step))
+        s.append(length - tileSize)  # tile terakhir menempel ke tepi
+        return s
+
+    return [(x, y, min(w, x + tileSize), min(h, y + tileSize)) for y in starts(h) for x in starts(w)]
+
+
+def nonMaxSuppression(boxes, iouThreshold=0.3, containThreshold=0.7):
+    """
+    boxes            : list (x, y, w, h)
+    iouThreshold     : box dengan IoU di atas ini dianggap duplikat
+    containThreshold : box yang sebagian besar (rasio ini) berada di dalam box lain
+                       juga dianggap duplikat (wajah terpotong di tepi tile)
+    return           : list (x, y, w, h) tanpa duplikat (box lebih besar diutamakan)
+    """
+    return [tuple(int(v) for v in boxes[i]) for i in _suppressIndices(boxes, iouThreshold, containThreshold)]
+
+
+def _suppressIndices(boxes, iouThreshold=0.3, containThreshold=0.7):
+    # Inti nonMaxSuppression: return index box yang dipertahankan (urut naik)
+    if not boxes:
+        return []
+    b = np.array(boxes, np.float64)
+    x1, y1 = b[:, 0], b[:, 1]
+    x2, y2 = x1 + b[:, 2], y1 + b[:, 3]
+    areas = b[:, 2] * b[:, 3]
+    order = np.argsort(-areas)
+
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        iw = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        ih = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = iw * ih
+        iou = inter / (areas[i] + areas[rest] - inter)
+        contained = inter / areas[rest]
+        order = rest[(iou <= iouThreshold) & (contained <= containThreshold)]
+    return sorted(int(i) for i in keep)
+
+
+class TiledFaceDetector:
+    """
+    workers      : jumlah proses
+    maxFace      : (w, h) wajah terbesar yang dicari, menentukan overlap tile
+    tileSize     : sisi tile (None = otomatis, 4x wajah terbesar, minimal 512)
+    cascadePath  : file XML Haar cascade
+    scaleFactor, minNeighbors, minSize : sama seperti detectFaces()
+    """
+
+    def __init__(self, workers=None, maxFace=(300, 300), tileSize=None, cascadePath=DEFAULT_CASCADE,
+                 scaleFactor=1.1, minNeighbors=4, minSize=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.maxFace = tuple(maxFace)
+        self.overlap = max(self.maxFace)
+        self.tileSize = tileSize or max(512, 4 * self.overlap)
+        if self.tileSize <= self.overlap:
+            raise ValueError("tileSize harus lebih besar dari wajah terbesar (maxFace)")
+        self.params = {"scaleFactor": scaleFactor, "minNeighbors": minNeighbors,
+                       "minSize": minSize, "maxSize": self.maxFace}
+
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_initTileWorker,
+                                         initargs=(cascadePath,))
+        self._shm = None
+        self.lastTiles = 0
+
+    def _sharedGray(self, img):
+        # Buffer shared memory dipakai ulang selama ukurannya cukup
+        shape = img.shape[:2]
+        size = shape[0] * shape[1]
+        if self._shm is None or self._shm.size < size:
+            self._releaseShared()
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        imgGray = np.ndarray(shape, np.uint8, self._shm.buf)
+        if img.ndim == 3:
+            cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, imgGray)
+        else:
+            imgGray[...] = img
+        return shape
+
+    def detect(self, img):
+        """
+        img    : gambar BGR atau grayscale (berapa pun besarnya)
+        return : list (x, y, w, h) di koordinat gambar asli
+        """
+        shape = self._sharedGray(img)
+        tiles = tileGrid(shape, self.tileSize, self.overlap)
+        self.lastTiles = len(tiles)
+        tasks = [(self._shm.name, shape, tile, self.params) for tile in tiles]
+
+        faces = []
+        for found in self._pool.map(_detectTile, tasks):
+            faces.extend(found)
+        return nonMaxSuppression(faces)
+
+    def _releaseShared(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        self._pool.shutdown()
+        self._releaseShared()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def matchDetections(reference, candidate, iouThreshold=0.5):
+    """
+    Bandingkan 2 hasil deteksi (misal single-call vs tiled).
+    return : dict jumlah yang cocok (IoU >= threshold), yang hilang, dan yang ekstra
+    """
+    def iou(a, b):
+        ax, ay, aw, ah = a
+        bx, by, bw, bh = b
+        iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+        ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+        inter = iw * ih
+        return inter / float(aw * ah + bw * bh - inter)
+
+    unmatched = list(candidate)
+    matched = 0
+    for ref in reference:
+        best = max(unmatched, key=lambda c: iou(ref, c), default=None)
+        if best is not None and iou(ref, best) >= iouThreshold:
+            unmatched.remove(best)
+            matched += 1
+    return {"matched": matched, "missing": len(reference) - matched, "extra": len(unmatched)}
+
+
+def benchmarkTiled(img, workerCounts=(1, 2, 4), maxFace=(300, 300), **kwargs):
+    """
+    Bandingkan 1x detectMultiScale vs TiledFaceDetector dengan berbagai jumlah worker.
+    return : dict waktu single-call + per jumlah worker (detik, speedup, kecocokan hasil)
+    """
+    faceCascade = loadCascade(kwargs.get("cascadePath", DEFAULT_CASCADE))
+    t0 = time.perf_counter()
+    reference = detectFaces(img, faceCascade, maxSize=maxFace)
+    single = time.perf_counter() - t0
+
+    result = {"singleSeconds": single, "faces": len(reference), "tiled": {}}
+    for workers in workerCounts:
+        with TiledFaceDetector(workers=workers, maxFace=maxFace, **kwargs) as detector:
+            detector.detect(img)  # pemanasan: worker start + load cascade
+            t0 = time.perf_counter()
+            found = detector.detect(img)
+            seconds = time.perf_counter() - t0
+        entry = matchDetections(reference, found)
+        entry.update({"seconds": seconds, "speedup": single / seconds if seconds > 0 else 0.0,
+                      "tiles": detector.lastTiles})
+        result["tiled"][workers] = entry
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python faces.py [video]          -> bandingkan FaceStream vs deteksi tiap frame
+    # python faces.py tiled [gambar]   -> bandingkan tiled multi-core vs 1x detectMultiScale
+    if len(sys.argv) > 1 and sys.argv[1] == "tiled":
+        path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(DEFAULT_CASCADE), "minji.jpg")
+        img = cv2.imread(path)
+        if img is None:
+            raise FileNotFoundError("Gambar tidak ditemukan. Cek path: " + path)
+        if len(sys.argv) <= 2:
+            img = np.tile(img, (4, 4, 1))  # gambar besar buatan (grid 4x4 wajah)
+        print(benchmarkTiled(img))
+        raise SystemExit(0)
+
+    faceCascade = loadCascade()
+    if len(sys.argv) > 1:
+        cap = cv2.VideoCapture(sys.argv[1])
+        frames = []
+        while len(frames) < 300:
+            success, frame = cap.read()
+            if not success:
+                break
+            frames.append(frame)
+        cap.release()
+    else:
+        img = cv2.imread(os.path.join(os.path.dirname(DEFAULT_CASCADE), "minji.jpg"))
+        frames = _syntheticPan(img)
+
+    print(benchmarkStream(frames, faceCascade, detectEvery=10, downscale=0.5))
@@ -0,0 +1,415 @@
+import json
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# ============================================================
+# FRAME BUS: 1 PRODUCER, BANYAK CONSUMER PROCESS (SHARED MEMORY)
+# ============================================================
+# HSV mask (chapter 7), shape detection (chapter 8), dan face detection (chapter 9)
+# di kamera yang sama: tanpa bus, pilihannya 1 proses serial, atau tiap proses
+# membuka kamera & decode sendiri.
+#
+# FrameBus: producer menulis frame ke RING slot berukuran tetap di 1 blok
+# multiprocessing.shared_memory. Consumer (proses lain) membaca slot langsung
+# (zero-copy), masing-masing dengan kecepatannya sendiri. Producer TIDAK PERNAH
+# menunggu consumer.
+#
+# Layout shared memory:
+#   [0 .. META_SIZE)     MAGIC + JSON {"shape", "dtype", "slots", "frameBytes", "slotsOffset"}
+#   control int64[2]     [latestSeq, closed]      latestSeq = -1 kalau belum ada frame
+#   slotSeq int64[N]     nomor urut frame di tiap slot, -1 = sedang ditulis / kosong
+#   slotTime float64[N]  waktu publish (time.time(), sama di semua proses)
+#   slots                N x frameBytes
+#
+# Protokol tulis (frame nomor s masuk slot s % N):
+#   1) slotSeq[i] = -1   2) tulis pixel   3) slotTime[i] = t   4) slotSeq[i] = s   5) latestSeq = s
+#
+# Semantik baca:
+# - mode "latest"     : read() selalu memberi frame TERBARU yang belum pernah dibaca consumer ini.
+#                       Frame di antaranya dilewati (dihitung "skipped") -> cocok untuk detektor
+#                       lambat yang hanya peduli kondisi terkini (face detection).
+# - mode "sequential" : read() memberi frame berikutnya (seq + 1). Kalau consumer tertinggal
+#                       lebih dari N - 2 frame, slot-nya sudah/akan ditimpa -> lompat ke frame
+#                       tertua yang masih aman, frame yang terlewat dihitung "skipped".
+# - zero-copy (copy=False): frame = view ke slot. View ini AMAN dipakai selama producer belum
+#                       memutari ring (N - 1 frame berikutnya). Setelah selesai memproses, cek
+#                       reader.valid(): False artinya slot sudah mulai ditimpa saat diproses
+#                       (hasil sebaiknya dibuang, dihitung "torn"). Ini pola seqlock.
+# - copy=True          : frame di-copy ke buffer milik reader lalu divalidasi -> selalu utuh,
+#                       dengan biaya 1x memcpy.
+# - N slot menentukan toleransi: consumer yang butuh T detik per frame aman zero-copy
+#   kalau T < (N - 1) / fps producer.
+#
+# Catatan: urutan tulis di atas mengandalkan store yang terlihat berurutan antar core
+# (x86). Di ARM, pakai copy=True atau slot lebih banyak supaya margin lebih besar.
+#
+# Contoh producer:
+#   bus = FrameBus((480, 640, 3), slots=8)
+#   while True:
+#       bus.publishFrom(cap)            # cap.read() langsung ke slot (tanpa copy tambahan)
+#
+# Contoh consumer (proses lain, nama dari bus.name):
+#   reader = FrameBusReader(name, mode="latest")
+#   success, frame = reader.read(timeout=1.0)
+#   result = detect(frame)
+#   if reader.valid(): pakai result
+
+MAGIC = b"CVFRMBUS"
+META_SIZE = 1024
+MODE_LATEST = "latest"
+MODE_SEQUENTIAL = "sequential"
+
+_LATEST = 0
+_CLOSED = 1
+
+
+def _align(offset, alignment=64):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _layout(slots):
+    seqOffset = META_SIZE + 2 * 8
+    timeOffset = seqOffset + slots * 8
+    return seqOffset, timeOffset, _align(timeOffset + slots * 8)
+
+
+def _attach(name):
+    # Python >= 3.13: track=False supaya proses consumer tidak meng-unlink blok saat exit.
+    # Versi lama: jalankan consumer lewat multiprocessing (fork) dari proses producer.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class _BusView:
+    # view numpy ke control / slotSeq / slotTime / slots di atas 1 blok shared memory
+    def __init__(self, shm, meta):
+        self.shm = shm
+        self.shape = tuple(meta["shape"])
+        self.dtype = np.dtype(meta["dtype"])
+        self.slots = meta["slots"]
+        seqOffset, timeOffset, slotsOffset = _layout(self.slots)
+        buf = shm.buf
+        self.control = np.ndarray((2,), np.int64, buf, META_SIZE)
+        self.slotSeq = np.ndarray((self.slots,), np.int64, buf, seqOffset)
+        self.slotTime = np.ndarray((self.slots,), np.float64, buf, timeOffset)
+        self.frames = np.ndarray((self.slots,) + self.shape, self.dtype, buf, slotsOffset)
+
+    def release(self):
+        # view numpy harus dilepas dulu sebelum shm.close()
+        self.control = self.slotSeq = self.slotTime = self.frames = None
+        self.shm.close()
+
+
+class FrameBus:
+    """
+    Sisi producer.
+
+    shape : shape frame, misal (480, 640, 3)
+    dtype : dtype frame
+    slots : jumlah slot ring (minimal 3)
+    name  : nama blok shared memory (None = dibuat otomatis, lihat bus.name)
+    """
+
+    def __init__(self, shape, dtype=np.uint8, slots=8, name=None):
+        if slots < 3:
+            raise ValueError("slots minimal 3")
+        dtype = np.dtype(dtype)
+        frameBytes = int(np.prod(shape)) * dtype.itemsize
+        _, _, slotsOffset = _layout(slots)
+        meta = {"shape": list(shape), "dtype": dtype.str, "slots": slots,
+                "frameBytes": frameBytes, "slotsOffset": slotsOffset}
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=slotsOffset + slots * frameBytes)
+        data = MAGIC + json.dumps(meta).encode("utf-8")
+        shm.buf[:len(data)] = data
+        shm.buf[len(data):META_SIZE] = b" " * (META_SIZE - len(data))
+
+        self._view = _BusView(shm, meta)
+        self._view.control[:] = (-1, 0)
+        self._view.slotSeq[:] = -1
+        self.name = shm.name
+        self.shape = self._view.shape
+        self.dtype = dtype
+        self.slots = slots
+        self.seq = -1               # nomor frame terakhir yang di-publish
+        self._pending = None        # slot dari writeSlot() yang belum di-commit
+
+    def writeSlot(self):
+        """
+        Ambil slot berikutnya untuk ditulis langsung (misal cap.read(slot), cv2.resize(..., dst=slot)).
+        Wajib diikuti commit().
+        """
+        seq = self.seq + 1
+        i = seq % self.slots
+        self._view.slotSeq[i] = -1
+        self._pending = seq
+        return self._view.frames[i]
+
+    def commit(self, timestamp=None):
+        seq = self._pending
+        if seq is None:
+            raise RuntimeError("commit() tanpa writeSlot()")
+        i = seq % self.slots
+        self._view.slotTime[i] = time.time() if timestamp is None else timestamp
+        self._view.slotSeq[i] = seq
+        self._view.control[_LATEST] = seq
+        self.seq = seq
+        self._pending = None
+        return seq
+
+    def publish(self, frame, timestamp=None):
+        # copy 1 frame ke slot berikutnya. return : nomor urut frame
+        np.copyto(self.writeSlot(), frame)
+        return self.commit(timestamp)
+
+    def publishFrom(self, cap):
+        """
+        cap.read() langsung ke slot berikutnya (VideoCapture menulis ke buffer yang diberikan
+        kalau ukurannya cocok). return : (success, seq)
+        """
+        slot = self.writeSlot()
+        success, frame = cap.read(slot)
+        if not success:
+            self._pending = None
+            return False, None
+        if frame is not slot and frame.ctypes.data != slot.ctypes.data:
+            np.copyto(slot, frame)  # ukuran / tipe beda -> VideoCapture membuat array baru
+        return True, self.commit()
+
+    def close(self, unlink=True):
+        # tandai selesai (consumer berhenti setelah frame terakhir), lalu lepas blok
+        if self._view is None:
+            return
+        self._view.control[_CLOSED] = 1
+        shm = self._view.shm
+        self._view.release()
+        self._view = None
+        if unlink:
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FrameBusReader:
+    """
+    Sisi consumer (boleh banyak, di proses mana pun yang bisa attach ke nama blok).
+
+    mode         : "latest" atau "sequential" (lihat penjelasan di atas)
+    pollInterval : jeda polling (detik) saat menunggu frame baru
+    """
+
+    def __init__(self, name, mode=MODE_LATEST, pollInterval=0.0005):
+        if mode not in (MODE_LATEST, MODE_SEQUENTIAL):
+            raise ValueError("mode harus 'latest' atau 'sequential', bukan %r" % (mode,))
+        shm = _attach(name)
+        data = bytes(shm.buf[:META_SIZE])
+        if not data.startswith(MAGIC):
+            shm.close()
+            raise ValueError("Bukan blok FrameBus: " + name)
+        meta = json.loads(data[len(MAGIC):].decode("utf-8"))
+
+        self._view = _BusView(shm, meta)
+        self.name = name
+        self.mode = mode
+        self.pollInterval = pollInterval
+        self.shape = self._view.shape
+        self.dtype = self._view.dtype
+        self.slots = self._view.slots
+
+        self.seq = -1           # nomor frame terakhir yang diberikan read()
+        self.timestamp = None   # waktu publish frame itu
+        self._copy = None
+
+        self.received = 0
+        self.skipped = 0
+        self.torn = 0
+
+    def _nextSeq(self, latest):
+        if self.mode == MODE_LATEST or self.seq < 0:
+            return latest
+        want = self.seq + 1
+        # slot (latest + 1) % N sedang / akan ditimpa: yang aman hanya N - 2 frame terakhir
+        oldestSafe = max(0, latest - (self.slots - 2))
+        return max(want, oldestSafe)
+
+    def read(self, timeout=None, copy=False):
+        """
+        return : (success, frame). success False kalau timeout, atau producer sudah close
+                 dan tidak ada frame baru lagi.
+        """
+        view = self._view
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            latest = int(view.control[_LATEST])
+            if latest > self.seq:
+                seq = self._nextSeq(latest)
+                i = seq % self.slots
+                if view.slotSeq[i] == seq:
+                    frame = view.frames[i]
+                    timestamp = float(view.slotTime[i])
+                    if copy:
+                        if self._copy is None:
+                            self._copy = np.empty(self.shape, self.dtype)
+                        np.copyto(self._copy, frame)
+                        frame = self._copy
+                    # validasi: slot tidak disentuh producer selama dibaca / di-copy
+                    if view.slotSeq[i] == seq:
+                        if self.seq >= 0:
+                            self.skipped += seq - self.seq - 1
+                        self.seq = seq
+                        self.timestamp = timestamp
+                        self.received += 1
+                        return True, frame
+                self.torn += 1
+                continue    # producer sudah lewat, coba lagi dengan latest yang baru
+            if view.control[_CLOSED]:
+                return False, None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False, None
+            time.sleep(self.pollInterval)
+
+    def valid(self):
+        # True kalau frame terakhir dari read() (zero-copy) belum mulai ditimpa producer
+        if self.seq < 0:
+            return False
+        ok = bool(self._view.slotSeq[self.seq % self.slots] == self.seq)
+        if not ok:
+            self.torn += 1
+        return ok
+
+    def lag(self):
+        # berapa frame consumer ini tertinggal dari producer
+        return int(self._view.control[_LATEST]) - self.seq
+
+    def stats(self):
+        return {"received": self.received, "skipped": self.skipped, "torn": self.torn, "lastSeq": self.seq}
+
+    def close(self):
+        if self._view is not None:
+            self._copy = None
+            self._view.release()
+            self._view = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================
+# DEMO: 1 kamera/video -> 3 proses consumer (chapter 7, 8, 9)
+# ============================================================
+def _consumerMain(name, kind, duration, results):
+    import cv2
+
+    import colors
+    import faces
+    import preprocess
+    import shapes
+
+    cv2.setNumThreads(1)
+    if kind == "faces":
+        cascade = faces.loadCascade()
+        detect = lambda frame: len(faces.detectFaces(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), cascade))
+    elif kind == "shapes":
+        pipe = preprocess.chapter8Pipeline()
+        detect = lambda frame: len(shapes.analyzeContours(pipe.run(frame)))
+    else:
+        detect = lambda frame: int(cv2.countNonZero(
+            colors.hsvMask(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV), (0, 19, 110, 240, 153, 255))))
+
+    reader = FrameBusReader(name, mode=MODE_LATEST)
+    t0 = time.perf_counter()
+    latency = []
+    while time.perf_counter() - t0 < duration:
+        success, frame = reader.read(timeout=0.5)
+        if not success:
+            break
+        detect(frame)
+        if reader.valid():
+            latency.append(1000.0 * (time.time() - reader.timestamp))
+    stats = reader.stats()
+    stats["fps"] = stats["received"] / (time.perf_counter() - t0)
+    stats["latencyMs"] = float(np.median(latency)) if latency else 0.0
+    frame = None    # view ke shared memory harus dilepas sebelum close()
+    reader.close()
+    results.put((kind, stats))
+
+
+def runDemo(source=None, duration=5.0, consumers=("hsv", "shapes", "faces"), slots=8, fps=30.0):
+    """
+    Producer membaca video (atau gambar minji.jpg yang digeser kalau source None)
+    dan publish ke bus; tiap consumer di proses sendiri, mode "latest".
+    return : dict {consumer: stats} + "producer"
+    """
+    import multiprocessing
+    import os
+
+    import cv2
+
+    if source is None:
+        base = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "minji.jpg"))
+        frameAt = lambda i: np.roll(base, 4 * i, axis=1)
+        cap = None
+        shape = base.shape
+    else:
+        cap = cv2.VideoCapture(source)
+        success, first = cap.read()
+        if not success:
+            raise IOError("Video tidak bisa dibaca: %s" % (source,))
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        shape = first.shape
+
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    with FrameBus(shape, np.uint8, slots) as bus:
+        procs = [ctx.Process(target=_consumerMain, args=(bus.name, kind, duration, results)) for kind in consumers]
+        for p in procs:
+            p.start()
+
+        t0 = time.perf_counter()
+        published = 0
+        while time.perf_counter() - t0 < duration:
+            if cap is None:
+                bus.publish(frameAt(published))
+            else:
+                success, _ = bus.publishFrom(cap)
+                if not success:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)   # ulang video sampai durasi habis
+                    continue
+            published += 1
+            # tempo kamera: producer tidak pernah menunggu consumer
+            delay = t0 + published / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        stats = dict(results.get() for _ in procs)
+        for p in procs:
+            p.join()
+    if cap is not None:
+        cap.release()
+    stats["producer"] = {"published": published, "fps": published / (time.perf_counter() - t0)}
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python framebus.py [video] [durasi]
+    source = sys.argv[1] if len(sys.argv) > 1 else None
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    stats = runDemo(source, duration)
+    producer = stats.pop("producer")
+    print("producer: %d frame, %.1f fps" % (producer["published"], producer["fps"]))
+    print("%-8s %9s %8s %6s %7s %11s" % ("consumer", "received", "skipped", "torn", "fps", "latency ms"))
+    for kind, s in stats.items():
+        print("%-8s %9d %8d %6d %7.1f %11.1f" % (kind, s["received"], s["skipped"], s["torn"], s["fps"], s["latencyMs"]))
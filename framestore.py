@@ -0,0 +1,348 @@
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# FRAME STORE: DECODE VIDEO SEKALI, REPLAY BERKALI-KALI (MEMORY-MAPPED)
+# ============================================================
+# chapter1 men-decode test_video.mp4 lewat cv2.VideoCapture setiap kali jalan.
+# Saat tuning / benchmark pipeline di footage yang sama, biaya decode dibayar
+# ulang di setiap run, dan seek di video terkompresi mahal (harus dari keyframe).
+#
+# Solusi: decode SEKALI ke file raw (.frames), lalu replay lewat np.memmap.
+#
+# Format file (little-endian):
+#   [0 .. HEADER_SIZE)   MAGIC + JSON header (diisi spasi sampai HEADER_SIZE)
+#                        {"version", "shape", "dtype", "count", "fps", "source",
+#                         "framesOffset", "timestampsOffset"}
+#   [framesOffset ..)    count frame berurutan, masing-masing shape x dtype (C-contiguous)
+#   [timestampsOffset ..) count float64 = waktu frame (detik, relatif frame pertama)
+#
+# Kalau perekaman terputus (crash, Ctrl+C), header masih "count": null ->
+# FrameReader menghitung jumlah frame dari ukuran file dan memakai fps untuk waktunya.
+#
+# FrameReader meniru cv2.VideoCapture / ThreadedCapture:
+#   reader = FrameReader("Resources/test_video.frames", realtime=True)
+#   while True:
+#       success, img = reader.read()
+#       if not success: break
+# - frame = view langsung ke memmap (zero-copy, READ-ONLY). Mau menggambar? img.copy()
+# - seek O(1): reader.set(cv2.CAP_PROP_POS_FRAMES, n) atau reader[n]
+# - realtime=True -> frame diberikan sesuai timestamp asli (x speed),
+#   realtime=False -> secepat mungkin (untuk benchmark)
+
+MAGIC = b"CVFRAMES"
+HEADER_SIZE = 4096
+VERSION = 1
+
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _writeHeader(f, header):
+    data = MAGIC + json.dumps(header).encode("utf-8")
+    if len(data) > HEADER_SIZE:
+        raise ValueError("Header frame store terlalu besar")
+    f.seek(0)
+    f.write(data.ljust(HEADER_SIZE, b" "))
+
+
+def readHeader(path):
+    with open(path, "rb") as f:
+        data = f.read(HEADER_SIZE)
+    if not data.startswith(MAGIC):
+        raise ValueError("Bukan file frame store: " + path)
+    return json.loads(data[len(MAGIC):].decode("utf-8"))
+
+
+class FrameRecorder:
+    """
+    Tulis frame (ukuran & dtype sama semua) ke file .frames.
+
+    path : file output
+    fps  : fps sumber (dipakai kalau timestamp tidak diberikan / file terputus)
+    """
+
+    def __init__(self, path, fps=30.0, source=None):
+        self.path = path
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.source = source
+        self.shape = None
+        self.dtype = None
+        self.count = 0
+        self._timestamps = []
+        self._f = open(path, "wb")
+
+    def _header(self, complete):
+        frameBytes = int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize if self.shape else 0
+        return {
+            "version": VERSION,
+            "shape": list(self.shape) if self.shape else None,
+            "dtype": np.dtype(self.dtype).str if self.dtype else None,
+            "count": self.count if complete else None,
+            "fps": self.fps,
+            "source": None if self.source is None else str(self.source),
+            "framesOffset": HEADER_SIZE,
+            "timestampsOffset": _align(HEADER_SIZE + self.count * frameBytes) if complete else None,
+        }
+
+    def write(self, frame, timestamp=None):
+        """
+        frame     : array (h, w) atau (h, w, c)
+        timestamp : detik (boleh absolut, disimpan relatif frame pertama);
+                    None = count / fps
+        """
+        if self.shape is None:
+            self.shape = frame.shape
+            self.dtype = frame.dtype
+            _writeHeader(self._f, self._header(complete=False))
+        elif frame.shape != self.shape or frame.dtype != self.dtype:
+            raise ValueError("Ukuran frame berubah: %s %s -> %s %s" % (
+                self.shape, self.dtype, frame.shape, frame.dtype))
+
+        self._f.write(np.ascontiguousarray(frame).data)
+        self._timestamps.append(self.count / self.fps if timestamp is None else float(timestamp))
+        self.count += 1
+
+    def close(self):
+        if self._f is None:
+            return
+        header = self._header(complete=True)
+        if self.shape is not None:
+            timestamps = np.asarray(self._timestamps, np.float64)
+            timestamps -= timestamps[0]
+            self._f.seek(header["timestampsOffset"])
+            self._f.write(timestamps.astype("<f8").tobytes())
+        # rekaman 0 frame tetap mendapat header lengkap (count 0) supaya bisa dibuka FrameReader
+        _writeHeader(self._f, header)
+        self._f.close()
+        self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record(source, path, maxFrames=None, props=None, log=print):
+    """
+    Decode video / webcam SEKALI ke file frame store.
+
+    source    : path video atau index webcam
+    maxFrames : batas jumlah frame (wajib untuk webcam supaya berhenti)
+    props     : dict {property_id: value} untuk cap.set(), seperti ThreadedCapture
+    return    : jumlah frame yang direkam
+    """
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise IOError("Sumber video tidak bisa dibuka: %s" % (source,))
+    for propId, value in (props or {}).items():
+        cap.set(propId, value)
+
+    isFile = isinstance(source, str)
+    t0 = time.perf_counter()
+    with FrameRecorder(path, fps=cap.get(cv2.CAP_PROP_FPS), source=source) as recorder:
+        while maxFrames is None or recorder.count < maxFrames:
+            success, frame = cap.read()
+            if not success:
+                break
+            # file: pakai posisi di video, webcam: waktu frame diterima
+            timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0 if isFile else time.perf_counter()
+            recorder.write(frame, timestamp)
+        count = recorder.count
+    cap.release()
+
+    if log:
+        log("%d frame direkam ke %s dalam %.2f s" % (count, path, time.perf_counter() - t0))
+    return count
+
+
+class FrameReader:
+    """
+    Replay file frame store dengan interface mirip cv2.VideoCapture.
+
+    realtime : True = jaga tempo sesuai timestamp asli, False = secepat mungkin
+    speed    : pengali tempo realtime (2.0 = 2x lebih cepat)
+    loop     : kembali ke frame 0 setelah frame terakhir
+    """
+
+    def __init__(self, path, realtime=False, speed=1.0, loop=False):
+        self.path = path
+        self.header = header = readHeader(path)
+        self.realtime = realtime
+        self.speed = speed
+        self.loop = loop
+
+        shape = tuple(header["shape"] or ())
+        dtype = np.dtype(header["dtype"] or np.uint8)
+        frameBytes = int(np.prod(shape)) * dtype.itemsize if shape else 0
+        count = header["count"]
+        if count is None:
+            # perekaman terputus: hitung frame utuh dari ukuran file
+            available = os.path.getsize(path) - header["framesOffset"]
+            count = available // frameBytes if frameBytes else 0
+
+        self.fps = header["fps"]
+        if count:
+            self.frames = np.memmap(path, dtype, "r", header["framesOffset"], (count,) + shape)
+        else:
+            self.frames = np.empty((0,) + shape, dtype)
+        if header["timestampsOffset"] is not None and count:
+            self.timestamps = np.memmap(path, "<f8", "r", header["timestampsOffset"], (count,))
+        else:
+            self.timestamps = np.arange(count, dtype=np.float64) / self.fps
+
+        self.pos = 0
+        self.framesDelivered = 0
+        self.lateFrames = 0
+        self._anchor = None     # (waktu wall-clock, timestamp) awal tempo realtime
+        self._released = False
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        # akses acak O(1), view read-only ke memmap
+        return self.frames[index]
+
+    def isOpened(self):
+        return not self._released and (self.loop or self.pos < len(self.frames))
+
+    def release(self):
+        # lepas referensi memmap supaya file handle / mapping ditutup
+        # (view frame yang masih dipegang caller tetap menahan mapping-nya sendiri)
+        if not self._released:
+            self.frames = np.empty((0,) + self.frames.shape[1:], self.frames.dtype)
+            self.timestamps = np.empty(0, np.float64)
+        self._released = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def seek(self, index):
+        if not 0 <= index < len(self.frames):
+            raise IndexError("Frame %d di luar 0..%d" % (index, len(self.frames) - 1))
+        self.pos = int(index)
+        self._anchor = None     # tempo realtime dihitung ulang dari posisi baru
+
+    def _pace(self, index):
+        timestamp = self.timestamps[index]
+        now = time.perf_counter()
+        if self._anchor is None:
+            self._anchor = (now, timestamp)
+            return
+        target = self._anchor[0] + (timestamp - self._anchor[1]) / self.speed
+        if target > now:
+            time.sleep(target - now)
+        else:
+            # consumer lebih lambat dari tempo asli: frame tidak dibuang, hanya dicatat
+            self.lateFrames += 1
+
+    def read(self):
+        if self._released or not len(self.frames):
+            return False, None
+        if self.pos >= len(self.frames):
+            if not self.loop:
+                return False, None
+            self.seek(0)
+
+        if self.realtime:
+            self._pace(self.pos)
+        frame = self.frames[self.pos]
+        self.pos += 1
+        self.framesDelivered += 1
+        return True, frame
+
+    def get(self, propId):
+        if propId == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.frames))
+        if propId == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.pos)
+        if propId == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+        if propId == cv2.CAP_PROP_POS_MSEC:
+            if not len(self.frames):
+                return 0.0
+            return 1000.0 * float(self.timestamps[min(self.pos, len(self.frames) - 1)])
+        if propId == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frames.shape[2]) if self.frames.ndim > 2 else 0.0
+        if propId == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frames.shape[1]) if self.frames.ndim > 1 else 0.0
+        return 0.0
+
+    def set(self, propId, value):
+        if propId == cv2.CAP_PROP_POS_FRAMES:
+            self.seek(int(value))
+            return True
+        if propId == cv2.CAP_PROP_POS_MSEC:
+            index = int(np.searchsorted(self.timestamps, value / 1000.0))
+            self.seek(min(index, len(self.frames) - 1))
+            return True
+        return False
+
+    def stats(self):
+        return {
+            "frames": len(self.frames),
+            "pos": self.pos,
+            "framesDelivered": self.framesDelivered,
+            "lateFrames": self.lateFrames,
+        }
+
+
+def benchmarkReplay(videoPath, storePath):
+    """
+    Bandingkan fps decode VideoCapture vs replay FrameReader (unthrottled).
+    """
+    def timeIt(cap):
+        t0 = time.perf_counter()
+        n = 0
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            frame.sum(dtype=np.uint64)  # sentuh semua pixel supaya memmap benar-benar dibaca
+            n += 1
+        cap.release()
+        return n, time.perf_counter() - t0
+
+    decoded, decodeSec = timeIt(cv2.VideoCapture(videoPath))
+    replayed, replaySec = timeIt(FrameReader(storePath))
+    return {
+        "decodeFrames": decoded,
+        "decodeFps": decoded / decodeSec if decodeSec else 0.0,
+        "replayFrames": replayed,
+        "replayFps": replayed / replaySec if replaySec else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python framestore.py record <video|index webcam> <out.frames> [maxFrames]
+    # python framestore.py info <file.frames>
+    # python framestore.py bench <video> <file.frames>
+    usage = "usage: framestore.py record <video|index> <out.frames> [maxFrames] | info <file> | bench <video> <file>"
+    if len(sys.argv) < 3:
+        raise SystemExit(usage)
+
+    command = sys.argv[1]
+    if command == "record" and len(sys.argv) >= 4:
+        source = int(sys.argv[2]) if sys.argv[2].isdigit() else sys.argv[2]
+        maxFrames = int(sys.argv[4]) if len(sys.argv) > 4 else None
+        record(source, sys.argv[3], maxFrames)
+    elif command == "info":
+        print(json.dumps(readHeader(sys.argv[2]), indent=2))
+    elif command == "bench" and len(sys.argv) >= 4:
+        if not os.path.exists(sys.argv[3]):
+            record(sys.argv[2], sys.argv[3])
+        print(benchmarkReplay(sys.argv[2], sys.argv[3]))
+    else:
+        raise SystemExit(usage)
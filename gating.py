@@ -0,0 +1,276 @@
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# MOTION / CHANGE GATING: LEWATI PROSES BERAT DI FRAME YANG DIAM
+# ============================================================
+# Kamera kita kebanyakan terpasang diam dan melihat scene yang sama.
+# Edge (chapter 2), mask HSV (chapter 7), kontur (chapter 8), dan wajah (chapter 9)
+# tetap dihitung ulang di SETIAP frame walaupun hasilnya pasti sama.
+#
+# ChangeDetector: pemeriksa murah di frame gray yang diperkecil banyak (default 80 px lebar):
+# - "diff"    : beda dengan frame REFERENSI (frame terakhir yang dianggap berubah).
+#               Perubahan pelan tetap terkumpul sampai melewati threshold.
+# - "average" : beda dengan background rata-rata berjalan (accumulateWeighted),
+#               perubahan cahaya pelan ikut terserap ke background (tidak memicu proses),
+#               saat frame berubah background langsung diganti frame itu.
+# Pixel dihitung "berubah" kalau |beda| > threshold, frame dianggap berubah kalau
+# fraksi pixel berubah > minChangedFraction.
+#
+# ChangeGate: 1 ChangeDetector di depan beberapa stage mahal.
+#   gate = ChangeGate(ChangeDetector())
+#   for frame in frames:
+#       gate.update(frame)                                    # 1x per frame
+#       edges = gate.run("edges", pipe.run, frame)            # dari cache kalau frame diam
+#       found = gate.run("faces", detectFaces, gray, cascade)
+#   print(gate.stats())                                       # skippedFraction per stage
+#
+# Hasil cache adalah objek yang SAMA dengan hasil terakhir. Stage yang mengembalikan
+# buffer milik pipeline (Pipeline.run) aman selama buffer itu tidak dipakai stage lain.
+# maxStale: paksa hitung ulang tiap N frame walaupun diam (jaga-jaga perubahan halus).
+
+MODE_DIFF = "diff"
+MODE_AVERAGE = "average"
+
+
+class ChangeDetector:
+    """
+    width              : lebar frame kecil untuk perbandingan (tinggi mengikuti aspect ratio)
+    threshold          : beda intensitas per pixel (0..255) yang dianggap berubah
+    minChangedFraction : fraksi pixel berubah minimal supaya frame dianggap berubah
+    mode               : "diff" atau "average"
+    alpha              : kecepatan update background (mode "average")
+    """
+
+    def __init__(self, width=80, threshold=12, minChangedFraction=0.005, mode=MODE_DIFF, alpha=0.05):
+        if mode not in (MODE_DIFF, MODE_AVERAGE):
+            raise ValueError("mode harus 'diff' atau 'average', bukan %r" % (mode,))
+        self.width = width
+        self.threshold = threshold
+        self.minChangedFraction = minChangedFraction
+        self.mode = mode
+        self.alpha = alpha
+
+        self._size = None
+        self._color = None          # hasil resize frame warna (sebelum cvtColor)
+        self._small = None
+        self._reference = None      # uint8 (diff) atau float32 (average)
+        self._background = None     # reference float32 -> uint8 (mode "average")
+        self._diff = None
+        self._mask = None
+
+        self.frames = 0
+        self.changedFrames = 0
+        self.lastChangedFraction = 0.0
+        self.seconds = 0.0
+
+    def reset(self):
+        # frame berikutnya pasti dianggap berubah
+        self._reference = None
+
+    def _shrink(self, frame):
+        h, w = frame.shape[:2]
+        size = (self.width, max(1, int(round(h * self.width / float(w)))))
+        if size != self._size:
+            self._size = size
+            self._small = np.empty((size[1], size[0]), np.uint8)
+            self._diff = np.empty_like(self._small)
+            self._mask = np.empty_like(self._small)
+            self._background = np.empty_like(self._small)
+            self._color = None
+            self._reference = None
+        if frame.ndim == 3:
+            # resize dulu baru gray: convert warna hanya di gambar kecil
+            colorShape = (size[1], size[0], frame.shape[2])
+            if self._color is None or self._color.shape != colorShape:
+                self._color = np.empty(colorShape, np.uint8)
+            cv2.resize(frame, size, self._color, interpolation=cv2.INTER_AREA)
+            cv2.cvtColor(self._color, cv2.COLOR_BGR2GRAY, self._small)
+        else:
+            cv2.resize(frame, size, self._small, interpolation=cv2.INTER_AREA)
+        # blur kecil supaya noise sensor tidak dihitung sebagai perubahan
+        return cv2.GaussianBlur(self._small, (3, 3), 0, self._small)
+
+    def update(self, frame):
+        """
+        return : True kalau frame dianggap berubah (stage mahal perlu dijalankan)
+        """
+        t0 = time.perf_counter()
+        small = self._shrink(frame)
+        self.frames += 1
+
+        if self._reference is None:
+            self._reference = small.astype(np.float32) if self.mode == MODE_AVERAGE else small.copy()
+            changed, fraction = True, 1.0
+        elif self.mode == MODE_DIFF:
+            cv2.absdiff(small, self._reference, self._diff)
+            fraction = self._changedFraction()
+            changed = fraction > self.minChangedFraction
+            if changed:
+                np.copyto(self._reference, small)
+        else:
+            cv2.convertScaleAbs(self._reference, self._background)
+            cv2.absdiff(small, self._background, self._diff)
+            fraction = self._changedFraction()
+            changed = fraction > self.minChangedFraction
+            if changed:
+                # scene baru: background langsung diganti, bukan dikejar pelan-pelan
+                self._reference[:] = small
+            else:
+                cv2.accumulateWeighted(small, self._reference, self.alpha)
+
+        if changed:
+            self.changedFrames += 1
+        self.lastChangedFraction = fraction
+        self.seconds += time.perf_counter() - t0
+        return changed
+
+    def _changedFraction(self):
+        cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY, self._mask)
+        return cv2.countNonZero(self._mask) / float(self._mask.size)
+
+    def stats(self):
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "changedFrames": self.changedFrames,
+            "skippedFraction": 1.0 - self.changedFrames / float(frames) if self.frames else 0.0,
+            "lastChangedFraction": self.lastChangedFraction,
+            "meanMs": 1000.0 * self.seconds / frames,
+        }
+
+
+class ChangeGate:
+    """
+    detector : ChangeDetector
+    maxStale : hitung ulang paksa setelah N frame berturut-turut dari cache (None = tidak pernah)
+    """
+
+    def __init__(self, detector=None, maxStale=None):
+        self.detector = detector or ChangeDetector()
+        self.maxStale = maxStale
+        self.changed = True
+        self._frame = 0
+        self._cache = {}        # nama stage -> (frame dihitung, hasil)
+        self._counts = {}       # nama stage -> [computed, skipped]
+
+    def update(self, frame):
+        self._frame += 1
+        self.changed = self.detector.update(frame)
+        return self.changed
+
+    def invalidate(self, name=None):
+        # buang cache 1 stage (atau semua), misal setelah parameter stage diubah
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+
+    def run(self, name, fn, *args, **kwargs):
+        """
+        Jalankan fn(*args, **kwargs) hanya kalau frame berubah (atau belum ada cache / sudah basi).
+        return : hasil fn, baru atau dari cache
+        """
+        counts = self._counts.setdefault(name, [0, 0])
+        cached = self._cache.get(name)
+        if cached is not None and not self.changed:
+            if self.maxStale is None or self._frame - cached[0] <= self.maxStale:
+                counts[1] += 1
+                return cached[1]
+
+        result = fn(*args, **kwargs)
+        self._cache[name] = (self._frame, result)
+        counts[0] += 1
+        return result
+
+    def stats(self):
+        stages = {}
+        for name, (computed, skipped) in self._counts.items():
+            total = computed + skipped
+            stages[name] = {"computed": computed, "skipped": skipped,
+                            "skippedFraction": skipped / float(total) if total else 0.0}
+        return {"detector": self.detector.stats(), "stages": stages}
+
+
+# ============================================================
+# BENCHMARK: pipeline chapter 2/7/8/9 dengan & tanpa gate
+# ============================================================
+def syntheticStaticScene(img, frames=180, moveEvery=60, moveFrames=10, noise=3, seed=0):
+    """
+    Kamera diam: gambar yang sama + noise sensor, sesekali ada gerakan
+    (gambar digeser selama moveFrames frame setiap moveEvery frame).
+    """
+    rng = np.random.default_rng(seed)
+    shift = 0
+    for i in range(frames):
+        if i % moveEvery < moveFrames and i >= moveEvery:
+            shift += 6
+        frame = np.roll(img, shift, axis=1)
+        jitter = rng.integers(-noise, noise + 1, frame.shape, np.int16)
+        yield np.clip(frame.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+
+
+def benchmarkGating(frames, mode=MODE_DIFF):
+    import colors
+    import faces
+    import preprocess
+    import shapes
+
+    frames = list(frames)
+    cascade = faces.loadCascade()
+    edgePipe = preprocess.chapter2Pipeline()
+    contourPipe = preprocess.chapter8Pipeline()
+    lambo = (0, 19, 110, 240, 153, 255)
+
+    stages = {
+        "edges": lambda f: edgePipe.run(f),
+        "mask": lambda f: colors.hsvMask(cv2.cvtColor(f, cv2.COLOR_BGR2HSV), lambo),
+        "contours": lambda f: shapes.analyzeContours(contourPipe.run(f)),
+        "faces": lambda f: faces.detectFaces(cv2.cvtColor(f, cv2.COLOR_BGR2GRAY), cascade),
+    }
+
+    t0 = time.perf_counter()
+    for frame in frames:
+        for fn in stages.values():
+            fn(frame)
+    ungated = time.perf_counter() - t0
+
+    gate = ChangeGate(ChangeDetector(mode=mode))
+    t0 = time.perf_counter()
+    for frame in frames:
+        gate.update(frame)
+        for name, fn in stages.items():
+            gate.run(name, fn, frame)
+    gated = time.perf_counter() - t0
+
+    return {"frames": len(frames), "ungatedSec": ungated, "gatedSec": gated,
+            "speedup": ungated / gated if gated else 0.0, **gate.stats()}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # python gating.py [video]  -> tanpa argumen: scene diam sintetis dari minji.jpg
+    if len(sys.argv) > 1:
+        cap = cv2.VideoCapture(sys.argv[1])
+        source = []
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            source.append(frame)
+        cap.release()
+    else:
+        img = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "minji.jpg"))
+        source = syntheticStaticScene(img)
+
+    source = list(source)
+    for mode in (MODE_DIFF, MODE_AVERAGE):
+        r = benchmarkGating(source, mode)
+        d = r["detector"]
+        print("[%s] %d frame: tanpa gate %.2f s, dengan gate %.2f s (%.1fx), skipped %.0f%%, detector %.3f ms/frame"
+              % (mode, r["frames"], r["ungatedSec"], r["gatedSec"], r["speedup"],
+                 100.0 * d["skippedFraction"], d["meanMs"]))
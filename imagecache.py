@@ -0,0 +1,219 @@
+import collections
+import hashlib
+import os
+import threading
+
+import cv2
+import numpy as np
+
+# ============================================================
+# CACHE GAMBAR HASIL DECODE (LRU + OPSIONAL .npy DI DISK)
+# ============================================================
+# Semua chapter memanggil cv2.imread untuk file yang sama berulang kali.
+# Di batch (beberapa varian pipeline ke gambar yang sama), decode JPEG/PNG
+# jadi bagian terbesar waktunya.
+#
+# ImageCache:
+# - key = (path absolut, mtime, ukuran file, flags imread)
+#   -> file berubah = key baru, entry lama untuk path + flags itu langsung dibuang
+# - LRU dibatasi total BYTE (bukan jumlah gambar): 1 gambar 4K = ~24 MB
+# - array yang dikembalikan READ-ONLY (flags.writeable = False) karena dipakai
+#   bersama. Mau menggambar di atasnya? pakai img.copy() (seperti imgContour chapter 8)
+# - diskDir (opsional): pixel hasil decode disimpan sebagai <hash path>.<hash versi>.npy
+#   lalu dibaca lagi dengan np.load(mmap_mode="r") -> run berikutnya tanpa decode sama sekali.
+#   File .npy versi lama dari path yang sama (mtime / ukuran sudah beda) dihapus saat
+#   versi barunya dibaca / ditulis, jadi folder cache tidak tumbuh terus
+#
+# Contoh:
+#   cache = ImageCache(maxBytes=256 * 1024 * 1024, diskDir=".imcache")
+#   img = cache.imread("Resources/minji.jpg")        # decode
+#   img = cache.imread("Resources/minji.jpg")        # dari memori
+#   print(cache.stats())
+#
+# Untuk script sederhana: imagecache.imread(path) memakai cache global.
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _fileKey(path, flags):
+    # None kalau file tidak ada (sama seperti cv2.imread -> None)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, int(flags))
+
+
+def _sha1(value):
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()
+
+
+def _diskPrefix(key):
+    # bagian nama file yang sama untuk semua versi 1 file (path + flags)
+    return _sha1((key[0], key[3]))
+
+
+def _diskName(key):
+    return "%s.%s.npy" % (_diskPrefix(key), _sha1((key[1], key[2]))[:16])
+
+
+class ImageCache:
+    """
+    maxBytes : batas total ukuran pixel yang disimpan di memori
+    diskDir  : (opsional) folder cache .npy; None = hanya di memori
+
+    Aman dipakai dari beberapa thread. Untuk process pool: 1 ImageCache per
+    proses, diskDir boleh dipakai bersama (file ditulis atomik lewat os.replace).
+    """
+
+    def __init__(self, maxBytes=DEFAULT_MAX_BYTES, diskDir=None):
+        self.maxBytes = maxBytes
+        self.diskDir = diskDir
+        self._diskIndex = {}                        # prefix -> set nama .npy di diskDir
+        if diskDir is not None:
+            os.makedirs(diskDir, exist_ok=True)
+            for name in os.listdir(diskDir):
+                parts = name.split(".")
+                if len(parts) == 3 and parts[2] == "npy":
+                    self._diskIndex.setdefault(parts[0], set()).add(name)
+
+        self._entries = collections.OrderedDict()   # key -> array (paling lama dipakai di depan)
+        self._latest = {}                           # (path, flags) -> key terbaru
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.diskHits = 0
+        self.decodes = 0
+        self.evictions = 0
+        self.diskEvictions = 0
+
+    def imread(self, path, flags=cv2.IMREAD_COLOR):
+        """
+        Pengganti cv2.imread: return array read-only, atau None kalau gagal dibaca.
+        """
+        key = _fileKey(path, flags)
+        if key is None:
+            return None
+
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        img = self._loadDisk(key)
+        if img is None:
+            img = cv2.imread(path, flags)
+            if img is None:
+                return None
+            with self._lock:
+                self.decodes += 1
+            self._saveDisk(key, img)
+        else:
+            with self._lock:
+                self.diskHits += 1
+        self._pruneDisk(key)
+
+        img.flags.writeable = False
+        self._insert(key, img)
+        return img
+
+    def _insert(self, key, img):
+        with self._lock:
+            # versi lama file yang sama (mtime / ukuran berbeda) tidak akan dipakai lagi
+            pathKey = (key[0], key[3])
+            oldKey = self._latest.get(pathKey)
+            if oldKey is not None and oldKey != key and oldKey in self._entries:
+                self.bytes -= self._entries.pop(oldKey).nbytes
+            self._latest[pathKey] = key
+
+            if img.nbytes > self.maxBytes or key in self._entries:
+                return
+            self._entries[key] = img
+            self.bytes += img.nbytes
+            while self.bytes > self.maxBytes:
+                _, old = self._entries.popitem(last=False)
+                self.bytes -= old.nbytes
+                self.evictions += 1
+
+    def _loadDisk(self, key):
+        if self.diskDir is None:
+            return None
+        try:
+            return np.load(os.path.join(self.diskDir, _diskName(key)), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    def _saveDisk(self, key, img):
+        if self.diskDir is None:
+            return
+        path = os.path.join(self.diskDir, _diskName(key))
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, img)
+            os.replace(tmp, path)
+        except OSError:
+            # cache disk hanya optimasi: gagal tulis (disk penuh, read-only) diabaikan
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _pruneDisk(self, key):
+        # hapus .npy versi lama (mtime / ukuran file sumber berbeda) untuk path + flags ini
+        if self.diskDir is None:
+            return
+        prefix, name = _diskPrefix(key), _diskName(key)
+        with self._lock:
+            names = self._diskIndex.setdefault(prefix, set())
+            stale = names - {name}
+            names.clear()
+            names.add(name)
+        for old in stale:
+            try:
+                os.remove(os.path.join(self.diskDir, old))
+            except OSError:
+                continue    # sudah dihapus proses lain
+            with self._lock:
+                self.diskEvictions += 1
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self.bytes = 0
+            if disk:
+                self._diskIndex.clear()
+        if disk and self.diskDir is not None:
+            for name in os.listdir(self.diskDir):
+                if name.endswith(".npy"):
+                    os.remove(os.path.join(self.diskDir, name))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "maxBytes": self.maxBytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "diskHits": self.diskHits,
+                "decodes": self.decodes,
+                "evictions": self.evictions,
+                "diskEvictions": self.diskEvictions,
+            }
+
+
+# Cache global untuk imread() di bawah
+_default = ImageCache()
+
+
+def imread(path, flags=cv2.IMREAD_COLOR):
+    return _default.imread(path, flags)
+
+
+def defaultCache():
+    return _default
@@ -0,0 +1,405 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from framestore import FrameReader
+from metrics import RollingHistogram
+
+# ============================================================
+# INGEST MULTI-KAMERA (asyncio) + PENJADWALAN DETEKTOR YANG ADIL
+# ============================================================
+# chapter1 hanya bisa membuka 1 VideoCapture dalam loop blocking.
+# Rig robot punya 4-8 kamera USB (+ file video) yang masuk ke detektor yang sama.
+#
+# Susunan:
+#   kamera 1 --read (thread)--> queue 1 (maks queueSize) --\
+#   kamera 2 --read (thread)--> queue 2                  ----> dispatcher round-robin --> pool detektor
+#   file.mp4 --read (thread)--> queue 3                  --/
+#
+# - cap.read() blocking -> dijalankan di executor (1 thread per sumber), event loop tetap bebas
+# - queue per sumber BERBATAS (backpressure):
+#     policy "drop"  : queue penuh -> frame TERLAMA dibuang (kamera live, latency rendah)
+#     policy "block" : queue penuh -> reader menunggu (file, tidak ada frame hilang)
+#   default: webcam "drop", file "block"
+# - dispatcher memilih sumber secara round-robin, dan tiap sumber maksimal 1 frame
+#   yang sedang diproses -> kamera cepat tidak bisa memonopoli detektor, dan
+#   detektor per sumber (FaceStream, ShapeTracker, Pipeline) menerima frame berurutan
+# - metrik per kamera: fps capture / proses, frame dibuang, latency capture -> hasil
+#
+# File video bisa dipakai sebagai "kamera" untuk testing: tempo dijaga sesuai fps
+# file (realtime=True), opsional diulang (loop=True). File .frames (framestore.py) juga bisa.
+#
+# Contoh:
+#   def factory(name):
+#       pipe = preprocess.chapter8Pipeline()
+#       return lambda frame: shapes.analyzeContours(pipe.run(frame))
+#
+#   ingest = MultiCameraIngest({"cam0": 0, "cam1": 1, "demo": "Resources/test_video.mp4"})
+#   stats = asyncio.run(ingest.run(factory, workers=2, duration=10))
+
+POLICY_DROP = "drop"
+POLICY_BLOCK = "block"
+
+
+class CameraSource:
+    """
+    Bungkus 1 sumber frame dengan read() blocking.
+
+    source   : index webcam, path video, atau path .frames
+    props    : dict {property_id: value} untuk cap.set() (seperti chapter 1)
+    realtime : file diputar sesuai fps aslinya (default True: meniru kamera)
+    loop     : file diulang dari awal setelah habis
+    """
+
+    def __init__(self, source, props=None, realtime=True, loop=False):
+        self.source = source
+        self.isFile = not isinstance(source, int)
+        self.loop = loop
+
+        if self.isFile and str(source).endswith(".frames"):
+            self.cap = FrameReader(source, realtime=realtime, loop=loop)
+            self._interval = 0.0      # tempo sudah diurus FrameReader
+        else:
+            self.cap = cv2.VideoCapture(source)
+            for propId, value in (props or {}).items():
+                self.cap.set(propId, value)
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            self._interval = 1.0 / fps if (self.isFile and realtime and fps > 0) else 0.0
+        self._next = None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def read(self):
+        if self._interval:
+            now = time.perf_counter()
+            if self._next is not None and self._next > now:
+                time.sleep(self._next - now)
+            self._next = max(now, self._next or now) + self._interval
+
+        success, frame = self.cap.read()
+        if not success and self.loop and isinstance(self.cap, cv2.VideoCapture):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        return success, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class _SourceState:
+    # state per sumber: queue, counter, histogram latency
+    def __init__(self, name, camera, queueSize, policy):
+        self.name = name
+        self.camera = camera
+        self.policy = policy
+        self.queue = asyncio.Queue(queueSize)
+        self.busy = False
+        self.ended = False
+
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.errors = 0
+        self.lastError = None
+        self.latency = RollingHistogram()     # ms, capture -> hasil detektor selesai
+        self.processMs = RollingHistogram()   # ms, waktu detektor saja
+
+
+class MultiCameraIngest:
+    """
+    sources   : dict {nama: source} atau {nama: CameraSource}
+    queueSize : kapasitas queue per sumber
+    policy    : None (otomatis: webcam "drop", file "block"), "drop", atau "block",
+                atau dict {nama: policy}
+    """
+
+    def __init__(self, sources, queueSize=2, policy=None):
+        if not sources:
+            raise ValueError("Minimal 1 sumber kamera")
+        self.sources = dict(sources)
+        self.queueSize = queueSize
+        self.policy = policy
+        self._states = []
+        self._startTime = None
+        self._stopping = False
+        self._wake = None
+        self._active = 0
+
+    def _policyFor(self, name, camera):
+        policy = self.policy.get(name) if isinstance(self.policy, dict) else self.policy
+        if policy is None:
+            policy = POLICY_BLOCK if camera.isFile else POLICY_DROP
+        if policy not in (POLICY_DROP, POLICY_BLOCK):
+            raise ValueError("policy harus 'drop' atau 'block', bukan %r" % (policy,))
+        return policy
+
+    def stop(self):
+        # boleh dipanggil dari onResult / task lain untuk menghentikan run()
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+
+    # ---------------------------
+    # Reader per sumber (producer)
+    # ---------------------------
+    async def _reader(self, state, captureExecutor):
+        loop = asyncio.get_running_loop()
+        index = 0
+        try:
+            while not self._stopping:
+                success, frame = await loop.run_in_executor(captureExecutor, state.camera.read)
+                if not success:
+                    break
+                item = (index, time.perf_counter(), frame)
+                index += 1
+                state.captured += 1
+
+                if state.policy == POLICY_DROP:
+                    if state.queue.full():
+                        state.queue.get_nowait()
+                        state.dropped += 1
+                    state.queue.put_nowait(item)
+                else:
+                    await state.queue.put(item)
+                self._wake.set()
+        finally:
+            state.ended = True
+            self._wake.set()
+
+    # ---------------------------
+    # Dispatcher (consumer)
+    # ---------------------------
+    def _pick(self, start):
+        # round-robin: sumber berikutnya yang punya frame & tidak sedang diproses
+        n = len(self._states)
+        for k in range(n):
+            state = self._states[(start + k) % n]
+            if not state.busy and not state.queue.empty():
+                return state, (start + k + 1) % n
+        return None, start
+
+    def _finished(self):
+        return all(s.ended and s.queue.empty() and not s.busy for s in self._states)
+
+    async def _process(self, state, detector, item, pool, onResult):
+        loop = asyncio.get_running_loop()
+        index, capturedAt, frame = item
+
+        def timedDetect():
+            t0 = time.perf_counter()
+            result = detector(frame)
+            return result, time.perf_counter() - t0
+
+        try:
+            result, seconds = await loop.run_in_executor(pool, timedDetect)
+        except Exception as e:
+            # 1 frame gagal tidak menghentikan sumber lain, error terakhir disimpan di stats
+            state.errors += 1
+            state.lastError = repr(e)
+        else:
+            state.processed += 1
+            state.processMs.add(1000.0 * seconds)
+            state.latency.add(1000.0 * (time.perf_counter() - capturedAt))
+            if onResult is not None:
+                onResult(state.name, index, frame, result)
+        finally:
+            # slot worker dilepas SEBELUM dispatcher dibangunkan: done-callback task baru jalan
+            # setelah ini, jadi kalau hitungan in-flight menunggu callback, dispatcher bisa
+            # tidur lagi selamanya (semua queue penuh, reader tertahan di queue.put)
+            state.busy = False
+            self._active -= 1
+            self._wake.set()
+
+    async def run(self, detectorFactory, workers=2, duration=None, onResult=None):
+        """
+        detectorFactory : fungsi(nama) -> fungsi(frame) -> hasil. Dipanggil sekali per sumber,
+                          jadi state detektor (buffer, tracker) tidak dipakai bersama
+        workers         : jumlah thread detektor (OpenCV melepas GIL)
+        duration        : detik; None = sampai semua sumber habis (webcam: pakai stop())
+        onResult        : (opsional) fungsi(nama, indexFrame, frame, hasil), dipanggil di event loop
+        return          : stats()
+        """
+        self._wake = asyncio.Event()
+        self._active = 0            # detektor yang sedang jalan (dikurangi di _process)
+        self._stopping = False
+        self._states = []
+        cameras = []
+        try:
+            for name, source in self.sources.items():
+                camera = source if isinstance(source, CameraSource) else CameraSource(source)
+                cameras.append(camera)
+                if not camera.isOpened():
+                    raise IOError("Sumber %r tidak bisa dibuka: %s" % (name, camera.source))
+                self._states.append(_SourceState(name, camera, self.queueSize, self._policyFor(name, camera)))
+            detectors = {state.name: detectorFactory(state.name) for state in self._states}
+        except BaseException:
+            # sumber ke-k gagal: sumber 0..k yang sudah dibuka dilepas dulu sebelum error diteruskan
+            for camera in cameras:
+                camera.release()
+            self._states = []
+            raise
+
+        captureExecutor = ThreadPoolExecutor(len(self._states), thread_name_prefix="ingest-read")
+        pool = ThreadPoolExecutor(workers, thread_name_prefix="ingest-detect")
+        self._startTime = time.perf_counter()
+        deadline = None if duration is None else self._startTime + duration
+
+        readers = [asyncio.ensure_future(self._reader(state, captureExecutor)) for state in self._states]
+        inflight = set()
+        nextIndex = 0
+        try:
+            while not self._stopping:
+                self._wake.clear()
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if self._finished():
+                    break
+
+                state = None
+                if self._active < workers:
+                    state, nextIndex = self._pick(nextIndex)
+                if state is None:
+                    timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                state.busy = True
+                self._active += 1
+                task = asyncio.ensure_future(self._process(state, detectors[state.name],
+                                                           state.queue.get_nowait(), pool, onResult))
+                inflight.add(task)
+                task.add_done_callback(inflight.discard)
+        finally:
+            self._stopping = True
+            for task in readers:
+                task.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            await asyncio.gather(*inflight, return_exceptions=True)
+            # tunggu read() yang masih jalan di thread sebelum kamera di-release
+            await asyncio.get_running_loop().run_in_executor(None, captureExecutor.shutdown)
+            pool.shutdown()
+            for state in self._states:
+                state.camera.release()
+        return self.stats()
+
+    def stats(self):
+        elapsed = max(time.perf_counter() - self._startTime, 1e-9) if self._startTime else 0.0
+        result = {}
+        for s in self._states:
+            result[s.name] = {
+                "policy": s.policy,
+                "captured": s.captured,
+                "dropped": s.dropped,
+                "processed": s.processed,
+                "errors": s.errors,
+                "lastError": s.lastError,
+                "queueDepth": s.queue.qsize(),
+                "captureFps": s.captured / elapsed if elapsed else 0.0,
+                "processFps": s.processed / elapsed if elapsed else 0.0,
+                "latencyMs": {"mean": s.latency.summary()["meanMs"],
+                              "p50": s.latency.percentile(50),
+                              "p95": s.latency.percentile(95),
+                              "max": s.latency.max},
+                "processMs": s.processMs.summary()["meanMs"],
+            }
+        return result
+
+
+def printStats(stats):
+    print("%-12s %6s %9s %9s %8s %8s %8s %9s %9s" % (
+        "sumber", "policy", "captured", "processed", "dropped", "cap fps", "proc fps", "lat p50", "lat p95"))
+    for name, s in stats.items():
+        print("%-12s %6s %9d %9d %8d %8.1f %8.1f %9.1f %9.1f" % (
+            name, s["policy"], s["captured"], s["processed"], s["dropped"], s["captureFps"], s["processFps"],
+            s["latencyMs"]["p50"], s["latencyMs"]["p95"]))
+
+
+def selfTest(sourceCount=3, frames=60, workers=2, timeout=30.0):
+    """
+    Beberapa sumber file (.frames sintetis), policy "block", dibaca secepat mungkin,
+    sumber >= workers: jalur yang dulu bisa deadlock (semua queue penuh, dispatcher tidur).
+    return : stats(); RuntimeError kalau tidak selesai dalam timeout / ada frame hilang
+    """
+    import os
+    import tempfile
+
+    import numpy as np
+
+    from framestore import FrameRecorder
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = {}
+        for i in range(sourceCount):
+            path = os.path.join(tmp, "src%d.frames" % i)
+            with FrameRecorder(path, fps=30.0) as recorder:
+                for k in range(frames):
+                    recorder.write(np.full((48, 64, 3), (k * 7 + i * 40) % 256, np.uint8))
+            sources["src%d" % i] = CameraSource(path, realtime=False)
+
+        ingest = MultiCameraIngest(sources, queueSize=2, policy=POLICY_BLOCK)
+
+        async def runWithTimeout():
+            return await asyncio.wait_for(ingest.run(lambda name: lambda frame: frame.mean(), workers), timeout)
+
+        try:
+            stats = asyncio.run(runWithTimeout())
+        except asyncio.TimeoutError:
+            raise RuntimeError("ingest tidak selesai dalam %.0f s (deadlock dispatcher?)" % timeout)
+
+    for name, s in stats.items():
+        if s["processed"] != frames or s["dropped"]:
+            raise RuntimeError("%s: %d/%d frame diproses, %d dibuang" % (name, s["processed"], frames, s["dropped"]))
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import faces
+    import preprocess
+    import shapes
+
+    # python ingest.py 0 1 Resources/test_video.mp4 --detector shapes --duration 10
+    # python ingest.py --selftest   (beberapa sumber, policy block, tanpa tempo)
+    parser = argparse.ArgumentParser(description="Ingest beberapa kamera / file sekaligus ke 1 detektor.")
+    parser.add_argument("sources", nargs="*", help="index webcam atau path video / .frames")
+    parser.add_argument("--detector", choices=("edges", "shapes", "faces"), default="shapes")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=None, help="detik (default: sampai file habis)")
+    parser.add_argument("--loop", action="store_true", help="ulang file video setelah habis")
+    parser.add_argument("--fast", action="store_true", help="file dibaca secepat mungkin (bukan tempo asli)")
+    parser.add_argument("--policy", choices=(POLICY_DROP, POLICY_BLOCK), default=None,
+                        help="policy semua sumber (default: webcam drop, file block)")
+    parser.add_argument("--selftest", action="store_true",
+                        help="3 sumber sintetis, policy block, tanpa tempo: harus selesai tanpa frame hilang")
+    args = parser.parse_args()
+
+    if args.selftest or not args.sources:
+        for workers in (1, 2, 3):
+            printStats(selfTest(workers=workers))
+        raise SystemExit(0)
+
+    def detectorFactory(name):
+        if args.detector == "faces":
+            stream = faces.FaceStream(faces.loadCascade())
+            return stream.process
+        pipe = preprocess.chapter8Pipeline() if args.detector == "shapes" else preprocess.chapter2Pipeline()
+        if args.detector == "shapes":
+            return lambda frame: shapes.analyzeContours(pipe.run(frame))
+        return pipe.run
+
+    sources = {}
+    for i, src in enumerate(args.sources):
+        source = int(src) if src.isdigit() else src
+        name = "cam%d" % source if isinstance(source, int) else "file%d" % i
+        sources[name] = CameraSource(source, realtime=not args.fast, loop=args.loop)
+
+    ingest = MultiCameraIngest(sources, queueSize=args.queue_size, policy=args.policy)
+    printStats(asyncio.run(ingest.run(detectorFactory, args.workers, args.duration)))
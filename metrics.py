@@ -0,0 +1,266 @@
+import functools
+import json
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# INSTRUMENTASI: TIMER PER STAGE + COUNTER + SNAPSHOT
+# ============================================================
+# Kalau pipeline (misal chapter 8) melambat di lapangan, kita perlu tahu
+# stage mana penyebabnya: GaussianBlur, Canny, findContours, atau menggambar.
+#
+# Pemakaian:
+#   profiler = Profiler()
+#   with profiler.stage("blur"):
+#       imgBlur = cv2.GaussianBlur(imgGray, (7, 7), 1)
+#
+#   @profiler.timed("contours")
+#   def getContours(...): ...
+#
+#   profiler.frame()            # 1 frame selesai (untuk fps)
+#   profiler.drop()             # 1 frame dibuang
+#   print(profiler.report())    # teks, atau profiler.snapshot() / toJSON()
+#   drawOverlay(imgStack, profiler)   # tulis fps + waktu stage ke mosaic
+#
+# Profiler(enabled=False) -> stage() mengembalikan context manager kosong
+# yang sama terus (tanpa alokasi, tanpa perf_counter), timed() langsung
+# memanggil fungsi aslinya. Jadi instrumentasi boleh dibiarkan di kode.
+
+# Batas bucket histogram (ms). Bucket terakhir = ">= 1000 ms".
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class RollingHistogram:
+    """
+    Simpan `window` sampel terakhir (ring buffer) + statistik kumulatif.
+    Percentile & bucket dihitung dari window (kondisi terbaru),
+    count / total / max dari awal (atau sejak reset).
+    """
+
+    def __init__(self, window=256):
+        self._samples = np.zeros(window, np.float64)
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self._samples[self._next] = value
+        self._next = (self._next + 1) % len(self._samples)
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def values(self):
+        # sampel di window (urutan tidak dijamin)
+        return self._samples[:min(self.count, len(self._samples))]
+
+    def percentile(self, q):
+        values = self.values()
+        return float(np.percentile(values, q)) if len(values) else 0.0
+
+    def buckets(self, edges=BUCKET_EDGES_MS):
+        counts = np.zeros(len(edges) + 1, np.int64)
+        np.add.at(counts, np.searchsorted(edges, self.values(), side="right"), 1)
+        return counts.tolist()
+
+    def summary(self):
+        values = self.values()
+        return {
+            "count": self.count,
+            "totalMs": self.total,
+            "meanMs": self.total / self.count if self.count else 0.0,
+            "maxMs": self.max,
+            "p50Ms": float(np.percentile(values, 50)) if len(values) else 0.0,
+            "p90Ms": float(np.percentile(values, 90)) if len(values) else 0.0,
+            "p99Ms": float(np.percentile(values, 99)) if len(values) else 0.0,
+            "buckets": self.buckets(),
+        }
+
+
+class _NullTimer:
+    # context manager kosong untuk Profiler yang dimatikan
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    __slots__ = ("_profiler", "_name", "_t0")
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.record(self._name, time.perf_counter() - self._t0)
+        return False
+
+
+class Profiler:
+    """
+    enabled   : False = semua timer jadi no-op (counter juga tidak dicatat)
+    window    : jumlah sampel terakhir per stage untuk percentile / histogram
+    fpsWindow : jumlah timestamp frame terakhir untuk menghitung fps
+
+    Aman dipakai dari beberapa thread (record / count / frame pakai lock).
+    Urutan stage di snapshot / overlay = urutan pertama kali stage tercatat.
+    """
+
+    def __init__(self, enabled=True, window=256, fpsWindow=60):
+        self.enabled = enabled
+        self.window = window
+        self.fpsWindow = fpsWindow
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self._stages = {}
+        self._counters = {}
+        self._frameTimes = np.zeros(self.fpsWindow, np.float64)
+        self.frames = 0
+        self.dropped = 0
+        self._startTime = time.perf_counter()
+
+    # ---------- timer ----------
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def timed(self, name=None):
+        # decorator; nama default = nama fungsi
+        def decorate(fn):
+            stageName = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(stageName, time.perf_counter() - t0)
+            return wrapper
+        return decorate
+
+    def record(self, name, seconds):
+        # catat durasi (detik) untuk 1 stage, misal dari timer milik Pipeline
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(name)
+            if hist is None:
+                hist = self._stages[name] = RollingHistogram(self.window)
+            hist.add(1000.0 * seconds)
+
+    # ---------- counter ----------
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def frame(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._frameTimes[self.frames % self.fpsWindow] = time.perf_counter()
+            self.frames += 1
+
+    def drop(self, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.dropped += n
+
+    def fps(self):
+        # fps dari fpsWindow frame terakhir (0 kalau belum ada 2 frame)
+        n = min(self.frames, self.fpsWindow)
+        if n < 2:
+            return 0.0
+        times = self._frameTimes[:n]
+        span = times.max() - times.min()
+        return (n - 1) / span if span > 0 else 0.0
+
+    # ---------- laporan ----------
+    def snapshot(self):
+        with self._lock:
+            stages = {name: hist.summary() for name, hist in self._stages.items()}
+            counters = dict(self._counters)
+        return {
+            "uptimeSec": time.perf_counter() - self._startTime,
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "fps": self.fps(),
+            "bucketEdgesMs": list(BUCKET_EDGES_MS),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def toJSON(self, path=None):
+        text = json.dumps(self.snapshot(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+    def report(self):
+        snap = self.snapshot()
+        lines = ["frames %d  dropped %d  fps %.1f" % (snap["frames"], snap["dropped"], snap["fps"]),
+                 "%-14s %8s %9s %9s %9s %9s" % ("stage", "count", "mean ms", "p50 ms", "p99 ms", "max ms")]
+        for name, s in snap["stages"].items():
+            lines.append("%-14s %8d %9.2f %9.2f %9.2f %9.2f" % (
+                name, s["count"], s["meanMs"], s["p50Ms"], s["p99Ms"], s["maxMs"]))
+        for name, value in snap["counters"].items():
+            lines.append("%-14s %8d" % (name, value))
+        return "\n".join(lines)
+
+    def overlayLines(self):
+        # baris teks singkat untuk overlay (fps + mean ms per stage)
+        with self._lock:
+            stages = [(name, hist.summary()) for name, hist in self._stages.items()]
+        lines = ["fps %.1f  drop %d" % (self.fps(), self.dropped)]
+        for name, s in stages:
+            lines.append("%s %.2f ms (p99 %.2f)" % (name, s["meanMs"], s["p99Ms"]))
+        return lines
+
+
+# ============================================================
+# OVERLAY DI MOSAIC stackImages
+# ============================================================
+def drawOverlay(img, profiler, origin=(10, 10), fontScale=0.5, color=(0, 255, 0), background=(0, 0, 0)):
+    """
+    Tulis fps + waktu tiap stage di pojok gambar (misal hasil stackImages), in-place.
+    Background gelap di belakang teks supaya tetap terbaca di atas gambar apa pun.
+    return : img
+    """
+    lines = profiler.overlayLines()
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    sizes = [cv2.getTextSize(line, font, fontScale, 1) for line in lines]
+    lineH = max(h + base for (_, h), base in sizes) + 4
+    boxW = max(w for (w, _), _ in sizes) + 10
+
+    x, y = origin
+    x2 = min(img.shape[1], x + boxW)
+    y2 = min(img.shape[0], y + lineH * len(lines) + 4)
+    cv2.rectangle(img, (x, y), (x2, y2), background, cv2.FILLED)
+    for i, line in enumerate(lines):
+        cv2.putText(img, line, (x + 5, y + lineH * (i + 1)), font, fontScale, color, 1, cv2.LINE_AA)
+    return img
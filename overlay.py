@@ -0,0 +1,550 @@
+import collections
+import time
+
+import cv2
+import numpy as np
+
+from shapes import SHAPE_NAMES
+
+# ============================================================
+# OVERLAY RETAINED-MODE: ANOTASI DIKUMPULKAN, DIGAMBAR SEKALI
+# ============================================================
+# chapter 4/8/9 menggambar garis, kotak, lingkaran, dan putText langsung ke frame,
+# 1 panggilan OpenCV per objek, di atas img.copy() per frame. Dengan ratusan
+# deteksi per frame, menggambar + copy itu terlihat jelas di profiler.
+#
+# Overlay:
+# - anotasi dikumpulkan dulu sebagai ARRAY primitif (rects, lines, circles, text),
+#   lalu dirasterisasi saat render(): kotak & garis 1x cv2.polylines per gaya,
+#   ratusan kotak tebal = outline 1 pixel + 1x dilate (pixel-identik, jauh lebih murah)
+# - layer STATIS (grid, kotak ROI, legenda) dirasterisasi SEKALI lalu di-cache,
+#   digambar ulang hanya setelah invalidate() atau ukuran frame berubah
+# - teks dan lingkaran dirender sekali jadi sprite mask, di-cache per
+#   (string, font, skala, tebal) / (radius, tebal), lalu cukup ditempel per frame
+# - komposit ke frame = 1 masked blend (cv2.copyTo / addWeighted) di area yang
+#   benar-benar berisi anotasi, langsung in-place -> tidak perlu img.copy().
+#   alpha = 1 (opaque): hanya layer statis yang lewat mask, anotasi dinamis langsung
+#   dirasterisasi ke frame (hasil sama, tanpa menggambar 2x ke canvas + mask)
+#
+# Contoh (video, chapter 9):
+#   overlay = Overlay()
+#   overlay.static("grid").lines(starts, ends, (80, 80, 80))     # sekali saja
+#   while True:
+#       success, frame = cap.read()
+#       faces = detectFaces(gray, cascade)
+#       overlay.rects(faces, (255, 0, 0), 2)
+#       overlay.text(["face"] * len(faces), [(x, y - 5) for (x, y, w, h) in faces], (255, 0, 0))
+#       overlay.render(frame)                  # in-place; frame read-only? render(frame, dst=buf)
+#
+# Catatan: teks & lingkaran ditempel tanpa anti-aliasing (LINE_8, default chapter).
+# Hasilnya pixel-identik dengan cv2.putText / cv2.circle, kecuali beberapa pixel pada
+# objek yang terpotong tepi gambar (OpenCV meng-clip garis tebal sedikit berbeda).
+
+DEFAULT_FONT = cv2.FONT_HERSHEY_SIMPLEX
+# mulai jumlah kotak ini, kotak tebal digambar lewat outline tipis + dilate (lihat _brushRects)
+BRUSH_MIN_RECTS = 150
+
+
+def _bbox(points, pad):
+    pts = points.reshape(-1, 2)
+    x1, y1 = pts.min(0)
+    x2, y2 = pts.max(0)
+    return int(x1) - pad, int(y1) - pad, int(x2) + pad + 1, int(y2) + pad + 1
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _clip(box, shape):
+    # None kalau box kosong / di luar gambar
+    if box is None:
+        return None
+    x1, y1 = max(0, box[0]), max(0, box[1])
+    x2, y2 = min(shape[1], box[2]), min(shape[0], box[3])
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+def _colorFor(color, canvas):
+    # warna BGR untuk canvas 3 channel, atau 1 nilai untuk canvas gray
+    if canvas.ndim == 2:
+        return color[0] if isinstance(color, (tuple, list)) else color
+    return tuple(color) if isinstance(color, (tuple, list)) else (color,) * canvas.shape[2]
+
+
+class SpriteCache:
+    """
+    Glyph teks & lingkaran yang sudah dirender, disimpan sebagai offset pixel (ys, xs)
+    relatif ke titik tempel -> ratusan label yang sama ditempel dengan 1 operasi NumPy.
+    LRU dibatasi maxEntries supaya label unik (misal id objek) tidak membuat cache tumbuh terus.
+    """
+
+    def __init__(self, maxEntries=2048):
+        self.maxEntries = maxEntries
+        self._entries = collections.OrderedDict()   # key -> (ys, xs)
+        self._solids = {}                           # kernel pena & gambar 1 warna
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, render):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        mask, dx, dy = render()
+        ys, xs = np.nonzero(mask)
+        entry = self._entries[key] = ((ys + dy).astype(np.int32), (xs + dx).astype(np.int32))
+        if len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def glyph(self, string, fontFace, fontScale, thickness):
+        """
+        return : (ys, xs) pixel teks relatif ke org (titik kiri bawah teks seperti cv2.putText)
+        """
+        def render():
+            (w, h), baseline = cv2.getTextSize(string, fontFace, fontScale, thickness)
+            # font miring / script bisa keluar dari kotak getTextSize -> pad lebar, sprite tetap kecil
+            pad = h + thickness + 2
+            mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), np.uint8)
+            cv2.putText(mask, string, (pad, pad + h), fontFace, fontScale, 255, thickness)
+            return mask, -pad, -pad - h
+        return self._get(("text", string, fontFace, fontScale, thickness), render)
+
+    def circle(self, radius, thickness):
+        # (ys, xs) pixel lingkaran relatif ke pusat
+        def render():
+            pad = max(thickness, 0) // 2 + 2
+            mask = np.zeros((2 * (radius + pad) + 1,) * 2, np.uint8)
+            cv2.circle(mask, (radius + pad, radius + pad), radius, 255, thickness)
+            return mask, -radius - pad, -radius - pad
+        return self._get(("circle", radius, thickness), render)
+
+    def brush(self, thickness):
+        # kernel dilate = "ujung pena" cv2.line setebal thickness (garis 1 titik)
+        def render():
+            size = thickness + 3
+            pen = np.zeros((size, size), np.uint8)
+            cv2.line(pen, (size // 2, size // 2), (size // 2, size // 2), 1, thickness)
+            return pen[np.ix_(pen.any(1), pen.any(0))]
+        key = ("brush", thickness)
+        if key not in self._solids:
+            self._solids[key] = render()
+        return self._solids[key]
+
+    def solid(self, shape, dtype, value):
+        # gambar 1 warna ukuran frame, sumber cv2.copyTo (np.full per frame jauh lebih mahal)
+        key = (shape, np.dtype(dtype).str, value)
+        img = self._solids.get(key)
+        if img is None:
+            if len(self._solids) > 16:
+                self._solids.clear()
+            img = self._solids[key] = np.empty(shape, dtype)
+            cv2.rectangle(img, (0, 0), (shape[1], shape[0]), value, cv2.FILLED)
+        return img
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "hitRate": self.hits / float(requests) if requests else 0.0}
+
+
+def _stamp(canvas, mask, sprite, anchors, value):
+    """
+    Tempel 1 sprite di banyak titik sekaligus (pixel di luar gambar dibuang).
+    return : bounding box area yang tersentuh, atau None
+    """
+    ys = anchors[:, 1, None] + sprite[0][None, :]
+    xs = anchors[:, 0, None] + sprite[1][None, :]
+    inside = (ys >= 0) & (ys < canvas.shape[0]) & (xs >= 0) & (xs < canvas.shape[1])
+    ys, xs = ys[inside], xs[inside]
+    if not len(ys):
+        return None
+    canvas[ys, xs] = value
+    if mask is not None:
+        mask[ys, xs] = 255
+    return int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
+
+
+def _polylines(canvas, mask, pts, closed, value, thickness):
+    cv2.polylines(canvas, pts, closed, value, thickness)
+    if mask is not None:
+        cv2.polylines(mask, pts, closed, 255, thickness)
+    return _bbox(np.concatenate([p.reshape(-1, 2) for p in pts]), thickness)
+
+
+def _brushRects(canvas, mask, boxes, value, thickness, sprites):
+    """
+    Banyak kotak tebal sekaligus: outline 1 pixel (cepat, tanpa polygon per segmen)
+    lalu dilate dengan kernel pena cv2.line -> pixel-identik dengan polylines tebal
+    untuk garis horizontal / vertikal, lalu 1x cv2.copyTo warna.
+    """
+    pen = sprites.brush(thickness)
+    r = pen.shape[0] // 2
+    box = _clip(_bbox(boxes, r), canvas.shape)
+    if box is None:
+        return None
+    x1, y1, x2, y2 = box
+    # scratch diperlebar r pixel: garis tepat di luar box tetap ikut tebal ke dalam
+    thin = np.zeros((y2 - y1 + 2 * r, x2 - x1 + 2 * r), np.uint8)
+    cv2.polylines(thin, list(boxes - np.int32([x1 - r, y1 - r])), True, 255, 1)
+    band = cv2.dilate(thin, pen)[r:-r, r:-r]
+    cv2.copyTo(sprites.solid(canvas.shape, canvas.dtype, value)[y1:y2, x1:x2], band, canvas[y1:y2, x1:x2])
+    if mask is not None:
+        cv2.bitwise_or(mask[y1:y2, x1:x2], band, mask[y1:y2, x1:x2])
+    return box
+
+
+class Layer:
+    """
+    Kumpulan primitif (belum digambar). Semua method mengembalikan self supaya bisa dirantai.
+    Koordinat sama seperti fungsi cv2 (x, y), warna BGR, thickness < 0 = diisi penuh.
+    """
+
+    def __init__(self):
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def clear(self):
+        self.commands = []
+        return self
+
+    def lines(self, starts, ends, color, thickness=1):
+        # garis starts[i] -> ends[i], array (N, 2)
+        starts = np.asarray(starts, np.int32).reshape(-1, 2)
+        ends = np.asarray(ends, np.int32).reshape(-1, 2)
+        if len(starts):
+            self.commands.append(("polylines", np.stack([starts, ends], 1), color, thickness, False))
+        return self
+
+    def line(self, pt1, pt2, color, thickness=1):
+        return self.lines([pt1], [pt2], color, thickness)
+
+    def rects(self, rects, color, thickness=1):
+        # kotak (x, y, w, h), array (N, 4), misal hasil detectFaces / boundingRect
+        rects = np.asarray(rects, np.int32).reshape(-1, 4)
+        if not len(rects):
+            return self
+        x, y, w, h = rects.T
+        boxes = np.stack([np.stack([x, y], 1), np.stack([x + w, y], 1),
+                          np.stack([x + w, y + h], 1), np.stack([x, y + h], 1)], 1)
+        kind = "filled" if thickness < 0 else "rects"
+        self.commands.append((kind, boxes, color, thickness, True))
+        return self
+
+    def rectangle(self, pt1, pt2, color, thickness=1):
+        # gaya cv2.rectangle: pojok kiri atas & kanan bawah
+        return self.rects([(pt1[0], pt1[1], pt2[0] - pt1[0], pt2[1] - pt1[1])], color, thickness)
+
+    def polylines(self, contours, color, thickness=1, closed=True):
+        # kontur (list array titik) seperti cv2.drawContours / cv2.polylines
+        contours = [np.asarray(c, np.int32).reshape(-1, 2) for c in contours]
+        if contours:
+            self.commands.append(("polylines", contours, color, thickness, closed))
+        return self
+
+    def circles(self, centers, radius, color, thickness=1):
+        # radius: 1 angka untuk semua, atau array per lingkaran
+        centers = np.asarray(centers, np.int32).reshape(-1, 2)
+        if len(centers):
+            radii = np.broadcast_to(np.asarray(radius, np.int32), (len(centers),))
+            self.commands.append(("circles", centers, color, thickness, radii))
+        return self
+
+    def text(self, strings, orgs, color, fontFace=DEFAULT_FONT, fontScale=1.0, thickness=1):
+        # 1 string + 1 org, atau list string + array org (N, 2)
+        if isinstance(strings, str):
+            strings, orgs = [strings], [orgs]
+        orgs = np.asarray(orgs, np.int32).reshape(-1, 2)
+        if len(orgs):
+            self.commands.append(("text", (list(strings), orgs), color, thickness, (fontFace, fontScale)))
+        return self
+
+    def rasterize(self, canvas, mask, sprites):
+        """
+        Gambar semua primitif ke canvas (warna) dan mask (255, None = tanpa mask).
+        return : bounding box (x1, y1, x2, y2) area yang tersentuh, atau None
+        """
+        box = None
+        for kind, data, color, thickness, extra in self.commands:
+            value = _colorFor(color, canvas)
+            if kind == "rects" and thickness > 1 and len(data) >= BRUSH_MIN_RECTS:
+                box = _union(box, _brushRects(canvas, mask, data, value, thickness, sprites))
+            elif kind in ("polylines", "rects"):
+                box = _union(box, _polylines(canvas, mask, list(data), extra, value, thickness))
+            elif kind == "filled":
+                # fillPoly dengan banyak polygon memakai aturan even-odd (overlap jadi lubang)
+                for quad in data:
+                    cv2.rectangle(canvas, tuple(quad[0]), tuple(quad[2]), value, cv2.FILLED)
+                    if mask is not None:
+                        cv2.rectangle(mask, tuple(quad[0]), tuple(quad[2]), 255, cv2.FILLED)
+                box = _union(box, _bbox(data, 0))
+            elif kind == "circles":
+                for radius in np.unique(extra).tolist():
+                    sprite = sprites.circle(radius, thickness)
+                    box = _union(box, _stamp(canvas, mask, sprite, data[extra == radius], value))
+            else:
+                fontFace, fontScale = extra
+                strings, orgs = data
+                groups = collections.defaultdict(list)
+                for i, string in enumerate(strings):
+                    groups[string].append(i)
+                for string, rows in groups.items():
+                    sprite = sprites.glyph(string, fontFace, fontScale, thickness)
+                    box = _union(box, _stamp(canvas, mask, sprite, orgs[rows], value))
+        return box
+
+
+class Overlay(Layer):
+    """
+    Layer dinamis (anotasi per frame, dikosongkan setiap render) + layer statis bernama.
+
+    maxSprites : batas cache glyph / lingkaran
+    """
+
+    def __init__(self, maxSprites=2048):
+        super().__init__()
+        self.sprites = SpriteCache(maxSprites)
+        self._static = collections.OrderedDict()    # nama -> Layer, digambar berurutan
+        self._staticDirty = True
+        self._key = None                            # (shape, dtype) frame terakhir
+        self._base = self._baseMask = None          # rasterisasi layer statis
+        self._canvas = self._mask = None            # base + anotasi dinamis (mode transparan)
+        self._staticBox = None
+
+        self.frames = 0
+        self.rebuilds = 0
+        self.seconds = 0.0
+
+    def static(self, name):
+        """
+        Layer statis `name` (dibuat kalau belum ada). Isi layer BARU ikut dirasterisasi
+        di render berikutnya; kalau layer lama diubah, panggil invalidate().
+        """
+        layer = self._static.get(name)
+        if layer is None:
+            layer = self._static[name] = Layer()
+            self._staticDirty = True
+        return layer
+
+    def removeStatic(self, name):
+        if self._static.pop(name, None) is not None:
+            self._staticDirty = True
+
+    def invalidate(self):
+        self._staticDirty = True
+
+    def _prepare(self, frame):
+        key = (frame.shape, frame.dtype)
+        if key != self._key:
+            self._key = key
+            self._base = np.zeros_like(frame)
+            self._baseMask = np.zeros(frame.shape[:2], np.uint8)
+            self._canvas = self._mask = None        # hanya untuk alpha < 1, dibuat saat perlu
+            self._staticDirty = True
+
+        if self._staticDirty:
+            self._base.fill(0)
+            self._baseMask.fill(0)
+            box = None
+            for layer in self._static.values():
+                box = _union(box, layer.rasterize(self._base, self._baseMask, self.sprites))
+            self._staticBox = _clip(box, frame.shape)
+            self._canvas = self._mask = None
+            self._staticDirty = False
+            self.rebuilds += 1
+
+    def render(self, frame, dst=None, alpha=1.0, keep=False):
+        """
+        Tempel semua layer ke frame.
+
+        dst   : None = in-place ke frame (tanpa copy), atau buffer output ukuran sama
+        alpha : 1.0 = anotasi menutup frame, < 1.0 = transparan
+        keep  : True = anotasi dinamis tidak dikosongkan (dipakai lagi frame berikutnya)
+        return: dst
+        """
+        t0 = time.perf_counter()
+        if dst is None:
+            dst = frame
+        elif dst is not frame:
+            np.copyto(dst, frame)
+        self._prepare(frame)
+
+        if alpha >= 1.0:
+            # opaque: layer statis = 1 masked copy, anotasi dinamis langsung ke dst
+            # (hasilnya sama dengan canvas + mask, tanpa rasterisasi 2x dan tanpa restore)
+            if self._staticBox is not None:
+                x1, y1, x2, y2 = self._staticBox
+                cv2.copyTo(self._base[y1:y2, x1:x2], self._baseMask[y1:y2, x1:x2], dst[y1:y2, x1:x2])
+            self.rasterize(dst, None, self.sprites)
+        else:
+            self._blend(dst, alpha)
+        if not keep:
+            self.clear()
+
+        self.frames += 1
+        self.seconds += time.perf_counter() - t0
+        return dst
+
+    def _blend(self, dst, alpha):
+        # transparan: statis + dinamis di canvas, lalu 1 masked blend di area anotasi
+        if self._canvas is None:
+            self._canvas = self._base.copy()
+            self._mask = self._baseMask.copy()
+        dynamicBox = _clip(self.rasterize(self._canvas, self._mask, self.sprites), dst.shape)
+        box = _union(self._staticBox, dynamicBox)
+        if box is not None:
+            x1, y1, x2, y2 = box
+            roi = dst[y1:y2, x1:x2]
+            blended = cv2.addWeighted(roi, 1.0 - alpha, self._canvas[y1:y2, x1:x2], alpha, 0)
+            cv2.copyTo(blended, self._mask[y1:y2, x1:x2], roi)
+        if dynamicBox is not None:
+            # kembalikan canvas ke isi layer statis, hanya di area anotasi dinamis
+            x1, y1, x2, y2 = dynamicBox
+            self._canvas[y1:y2, x1:x2] = self._base[y1:y2, x1:x2]
+            self._mask[y1:y2, x1:x2] = self._baseMask[y1:y2, x1:x2]
+
+    def stats(self):
+        return {"frames": self.frames, "staticLayers": len(self._static), "rebuilds": self.rebuilds,
+                "renderMs": 1000.0 * self.seconds / max(self.frames, 1), "sprites": self.sprites.stats()}
+
+
+# ============================================================
+# ANOTASI GAYA CHAPTER 8 / 9
+# ============================================================
+def annotateContours(layer, analysis, drawAll=False, drawLabels=True):
+    """
+    Sama seperti shapes.drawContourAnalysis(), tapi dikumpulkan ke layer.
+    """
+    if drawAll:
+        layer.polylines(analysis.contours, (255, 0, 0), 3)
+    table = analysis.table
+    if not len(table):
+        return layer
+    layer.polylines(analysis.kept(), (0, 0, 255), 3)
+    layer.rects(np.stack([table["x"], table["y"], table["w"], table["h"]], 1), (0, 255, 0), 2)
+    if drawLabels:
+        orgs = np.stack([table["x"] + table["w"] // 2 - 10, table["y"] + table["h"] // 2 - 10], 1)
+        layer.text([SHAPE_NAMES[label] for label in table["label"]], orgs, (0, 0, 0),
+                   cv2.FONT_HERSHEY_COMPLEX, 0.7, 2)
+    return layer
+
+
+def annotateFaces(layer, faces, color=(255, 0, 0)):
+    # sama seperti faces.drawFaces()
+    return layer.rects(faces, color, 2)
+
+
+def gridLines(shape, step):
+    # garis grid vertikal + horizontal tiap `step` pixel -> (starts, ends) untuk Layer.lines
+    h, w = shape[:2]
+    xs, ys = np.arange(step, w, step), np.arange(step, h, step)
+    starts = np.concatenate([np.stack([xs, np.zeros_like(xs)], 1), np.stack([np.zeros_like(ys), ys], 1)])
+    ends = np.concatenate([np.stack([xs, np.full_like(xs, h - 1)], 1), np.stack([np.full_like(ys, w - 1), ys], 1)])
+    return starts, ends
+
+
+# ============================================================
+# BENCHMARK: ratusan deteksi per frame, immediate vs retained
+# ============================================================
+LABELS = ("Tri", "Square", "Rectangle", "Circle", "face")
+ROI_BOXES = ((40, 40, 400, 300), (500, 40, 400, 300))
+
+
+def _syntheticDetections(shape, count, frames, seed=0):
+    rng = np.random.default_rng(seed)
+    h, w = shape[:2]
+    base = np.stack([rng.integers(0, w - 80, count), rng.integers(20, h - 80, count),
+                     rng.integers(20, 80, count), rng.integers(20, 80, count)], 1)
+    labels = [LABELS[i] for i in rng.integers(0, len(LABELS), count)]
+    for _ in range(frames):
+        jitter = rng.integers(-3, 4, (count, 2))
+        rects = base.copy()
+        rects[:, :2] += jitter
+        yield rects, labels
+
+
+def _immediate(frame, rects, labels, step):
+    # cara chapter 4/8/9: copy + 1 panggilan cv2 per primitif, grid & legenda digambar ulang
+    out = frame.copy()
+    h, w = out.shape[:2]
+    for x in range(step, w, step):
+        cv2.line(out, (x, 0), (x, h - 1), (80, 80, 80), 1)
+    for y in range(step, h, step):
+        cv2.line(out, (0, y), (w - 1, y), (80, 80, 80), 1)
+    for (x, y, bw, bh) in ROI_BOXES:
+        cv2.rectangle(out, (x, y), (x + bw, y + bh), (0, 255, 255), 2)
+    cv2.putText(out, "ROI kiri / kanan", (10, h - 10), DEFAULT_FONT, 0.6, (0, 255, 255), 1)
+    for (x, y, bw, bh), label in zip(rects.tolist(), labels):
+        cv2.rectangle(out, (x, y), (x + bw, y + bh), (0, 255, 0), 2)
+        cv2.putText(out, label, (x, y - 4), DEFAULT_FONT, 0.5, (0, 255, 0), 1)
+    return out
+
+
+def _retained(overlay, frame, rects, labels, step, dst=None):
+    h, w = frame.shape[:2]
+    if not overlay.static("grid"):
+        overlay.static("grid").lines(*gridLines(frame.shape, step), (80, 80, 80))
+        overlay.static("roi").rects(ROI_BOXES, (0, 255, 255), 2)
+        overlay.static("legend").text("ROI kiri / kanan", (10, h - 10), (0, 255, 255), DEFAULT_FONT, 0.6)
+    overlay.rects(rects, (0, 255, 0), 2)
+    overlay.text(labels, rects[:, :2] - (0, 4), (0, 255, 0), DEFAULT_FONT, 0.5)
+    return overlay.render(frame, dst)
+
+
+def benchmarkOverlay(frame, count=300, frames=30, step=60):
+    """
+    return : ms per frame immediate vs retained, + fraksi pixel yang berbeda
+    """
+    detections = list(_syntheticDetections(frame.shape, count, frames))
+
+    overlay = Overlay()
+    reference = _immediate(frame, *detections[0], step)
+    candidate = _retained(overlay, frame, *detections[0], step, dst=np.empty_like(frame))
+    mismatch = np.count_nonzero((reference != candidate).any(axis=-1)) / float(frame.shape[0] * frame.shape[1])
+
+    t0 = time.perf_counter()
+    for rects, labels in detections:
+        _immediate(frame, rects, labels, step)
+    immediateMs = 1000.0 * (time.perf_counter() - t0) / frames
+
+    # retained: in-place ke frame milik pipeline (di sini 1 buffer kerja yang dipakai ulang)
+    work = frame.copy()
+    t0 = time.perf_counter()
+    for rects, labels in detections:
+        _retained(overlay, work, rects, labels, step)
+    retainedMs = 1000.0 * (time.perf_counter() - t0) / frames
+
+    return {"detections": count, "immediateMs": immediateMs, "retainedMs": retainedMs,
+            "speedup": immediateMs / retainedMs if retainedMs else 0.0,
+            "mismatchFraction": mismatch, **overlay.stats()}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # python overlay.py [gambar] -> diperbesar ke 1080p, 100 / 300 / 1000 deteksi per frame
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "resources", "lambo.png")
+    img = cv2.imread(path)
+    if img is None:
+        raise SystemExit("Gambar tidak ditemukan: " + path)
+    frame = cv2.resize(img, (1920, 1080))
+
+    for count in (100, 300, 1000):
+        r = benchmarkOverlay(frame, count)
+        print("%5d deteksi: immediate %6.2f ms  retained %6.2f ms  (%.1fx)  pixel beda %.3f%%  "
+              "sprite hit %.0f%%  rebuild static %d" % (
+                  count, r["immediateMs"], r["retainedMs"], r["speedup"], 100.0 * r["mismatchFraction"],
+                  100.0 * r["sprites"]["hitRate"], r["rebuilds"]))
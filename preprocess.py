@@ -0,0 +1,635 @@
+import copy
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# PREPROCESSING (dari chapter 2 & chapter 8)
+# ============================================================
+# Pipeline umum:
+# BGR -> Gray -> GaussianBlur -> Canny -> dilate -> erode
+#
+# Versi fungsi ini dipakai script lain (batch, benchmark) supaya tidak perlu
+# copy-paste urutan langkah dari chapter 2.
+
+# Parameter bawaan chapter 2
+CH2_BLUR = (15, 15)
+CH2_CANNY = (150, 200)
+CH2_KERNEL = 5
+
+# Parameter bawaan chapter 8
+CH8_BLUR = (7, 7)
+CH8_SIGMA = 1
+CH8_CANNY = (50, 50)
+
+
+def preprocessEdges(img, blurSize=CH2_BLUR, blurSigma=0, canny=CH2_CANNY,
+                    kernelSize=CH2_KERNEL, iterations=1):
+    """
+    img        : gambar BGR (atau grayscale 1 channel)
+    blurSize   : ukuran kernel GaussianBlur (w, h), harus ganjil
+    blurSigma  : sigma GaussianBlur (0 = otomatis)
+    canny      : (threshold1, threshold2) untuk Canny
+    kernelSize : ukuran kernel kotak untuk dilate/erode
+    return     : dict berisi semua tahap: gray, blur, canny, dilation, eroded
+    """
+    if img.ndim == 3:
+        imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    else:
+        imgGray = img
+
+    kernel = np.ones((kernelSize, kernelSize), np.uint8)
+    imgBlur = cv2.GaussianBlur(imgGray, blurSize, blurSigma)
+    imgCanny = cv2.Canny(imgBlur, canny[0], canny[1])
+    imgDilation = cv2.dilate(imgCanny, kernel, iterations=iterations)
+    imgEroded = cv2.erode(imgDilation, kernel, iterations=iterations)
+
+    return {
+        "gray": imgGray,
+        "blur": imgBlur,
+        "canny": imgCanny,
+        "dilation": imgDilation,
+        "eroded": imgEroded,
+    }
+
+
+def edgeMap(img, blurSize=CH8_BLUR, blurSigma=CH8_SIGMA, canny=CH8_CANNY):
+    """
+    Versi pendek pipeline chapter 8: Gray -> Blur -> Canny (tanpa morfologi).
+    return : edge map biner (hasil Canny)
+    """
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    imgBlur = cv2.GaussianBlur(imgGray, blurSize, blurSigma)
+    return cv2.Canny(imgBlur, canny[0], canny[1])
+
+
+# ============================================================
+# PIPELINE DENGAN BUFFER OUTPUT YANG DIPAKAI ULANG
+# ============================================================
+# preprocessEdges() di atas membuat array baru di SETIAP langkah untuk SETIAP frame.
+# Untuk video/webcam, alokasi berulang ini jadi beban allocator + GC.
+#
+# Pipeline di bawah:
+# - langkah-langkah dikonfigurasi sekali (deklaratif)
+# - buffer output tiap langkah dialokasikan saat frame pertama (ukuran baru diketahui),
+#   lalu dipakai lagi lewat parameter dst= OpenCV -> frame berikutnya tanpa alokasi
+# - waktu per langkah dicatat (timings())
+#
+# Contoh:
+#   pipe = chapter2Pipeline()
+#   for frame in frames:                # video, webcam, atau batch
+#       imgEroded = pipe.run(frame)
+#       imgCanny = pipe.outputs()["canny"]
+#
+# Catatan: hasil run() adalah buffer milik pipeline, hanya valid sampai run()
+# berikutnya dengan ukuran input yang sama. Buffer disimpan per ukuran input,
+# jadi gambar batch dengan ukuran berbeda tidak saling menimpa.
+# Untuk beberapa thread sekaligus, pakai 1 pipeline per thread (copy()).
+
+
+class Stage:
+    # Nama langkah (dipakai di outputs() dan timings())
+    name = "stage"
+
+    def outputShape(self, inShape):
+        # None = langkah ini tidak butuh buffer (pass-through)
+        return inShape
+
+    def reset(self):
+        # Stage tanpa state: tidak ada yang perlu dilupakan
+        pass
+
+    def apply(self, src, dst):
+        raise NotImplementedError
+
+
+class Gray(Stage):
+    name = "gray"
+
+    def outputShape(self, inShape):
+        return inShape[:2] if len(inShape) == 3 else None
+
+    def apply(self, src, dst):
+        if dst is None:
+            return src  # sudah grayscale
+        return cv2.cvtColor(src, cv2.COLOR_BGR2GRAY, dst)
+
+
+class GaussianBlur(Stage):
+    name = "blur"
+
+    def __init__(self, ksize=CH2_BLUR, sigma=0):
+        self.ksize = tuple(ksize)
+        self.sigma = sigma
+
+    def apply(self, src, dst):
+        return cv2.GaussianBlur(src, self.ksize, self.sigma, dst)
+
+
+class Canny(Stage):
+    name = "canny"
+
+    def __init__(self, threshold1=CH2_CANNY[0], threshold2=CH2_CANNY[1]):
+        self.threshold1 = threshold1
+        self.threshold2 = threshold2
+
+    def apply(self, src, dst):
+        return cv2.Canny(src, self.threshold1, self.threshold2, dst)
+
+
+# ============================================================
+# CANNY DENGAN THRESHOLD OTOMATIS
+# ============================================================
+# Canny(150, 200) chapter 2 dan Canny(50, 50) chapter 8 dipilih manual: saat cahaya
+# berubah (gambar lebih gelap / terang), jumlah edge ikut berubah drastis.
+#
+# AutoCanny menghitung threshold dari statistik gambar:
+# - "median" : low = (1 - sigma) * median, high = (1 + sigma) * median
+# - "otsu"   : high = threshold Otsu, low = 0.5 * high
+# Statistik diambil dari grid subsample (tiap `step` pixel, default 1/16 pixel),
+# dan untuk video dihaluskan antar frame dengan EMA (alpha) supaya threshold tidak
+# berkedip. updateEvery > 1 -> statistik hanya dihitung tiap N frame.
+#
+# Stage ini menyimpan state (threshold terakhir): pakai 1 pipeline per stream video.
+
+CANNY_FIXED = "fixed"
+CANNY_MEDIAN = "median"
+CANNY_OTSU = "otsu"
+
+
+class AutoCanny(Stage):
+    name = "canny"
+
+    def __init__(self, method=CANNY_MEDIAN, sigma=0.33, step=4, alpha=0.2, updateEvery=1):
+        if method not in (CANNY_MEDIAN, CANNY_OTSU):
+            raise ValueError("method harus 'median' atau 'otsu', bukan %r" % (method,))
+        self.method = method
+        self.sigma = sigma
+        self.step = step
+        self.alpha = alpha
+        self.updateEvery = max(1, updateEvery)
+
+        self.threshold1 = None
+        self.threshold2 = None
+        self.frames = 0
+        self.statsSeconds = 0.0
+        self.cannySeconds = 0.0
+
+    def reset(self):
+        # lupakan threshold lama (misal ganti scene / kamera)
+        self.threshold1 = self.threshold2 = None
+        self.frames = 0
+
+    def measure(self, imgGray):
+        """
+        Threshold (low, high) untuk 1 gambar, TANPA smoothing.
+        """
+        sample = np.ascontiguousarray(imgGray[::self.step, ::self.step])
+        if self.method == CANNY_OTSU:
+            high, _ = cv2.threshold(sample, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+            return 0.5 * high, high
+
+        # median dari histogram 256 bin (lebih murah dari np.median yang mengurutkan)
+        hist = cv2.calcHist([sample], [0], None, [256], [0, 256]).ravel()
+        median = float(np.searchsorted(np.cumsum(hist), sample.size / 2.0))
+        return max(0.0, (1.0 - self.sigma) * median), min(255.0, (1.0 + self.sigma) * median)
+
+    def update(self, imgGray):
+        t0 = time.perf_counter()
+        if self.threshold1 is None or self.frames % self.updateEvery == 0:
+            low, high = self.measure(imgGray)
+            if self.threshold1 is None:
+                self.threshold1, self.threshold2 = low, high
+            else:
+                a = self.alpha
+                self.threshold1 = a * low + (1.0 - a) * self.threshold1
+                self.threshold2 = a * high + (1.0 - a) * self.threshold2
+        self.frames += 1
+        self.statsSeconds += time.perf_counter() - t0
+        return self.threshold1, self.threshold2
+
+    def apply(self, src, dst):
+        low, high = self.update(src)
+        t0 = time.perf_counter()
+        out = cv2.Canny(src, low, high, dst)
+        self.cannySeconds += time.perf_counter() - t0
+        return out
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "threshold1": self.threshold1,
+            "threshold2": self.threshold2,
+            "statsMs": 1000.0 * self.statsSeconds / max(self.frames, 1),
+            "cannyMs": 1000.0 * self.cannySeconds / max(self.frames, 1),
+            "statsFraction": self.statsSeconds / self.cannySeconds if self.cannySeconds else 0.0,
+        }
+
+
+def cannyStage(mode, thresholds):
+    # "fixed" = Canny(thresholds) seperti chapter, "median" / "otsu" = AutoCanny
+    if mode == CANNY_FIXED:
+        return Canny(*thresholds)
+    return AutoCanny(mode)
+
+
+def _morphSeparable(op, src, dst, kernelSize, iterations):
+    # kernel kotak k x k = baris (1 x k) lalu kolom (k x 1), pass kedua in-place di dst
+    row = np.ones((1, kernelSize), np.uint8)
+    col = np.ones((kernelSize, 1), np.uint8)
+    op(src, row, dst, iterations=iterations)
+    return op(dst, col, dst, iterations=iterations)
+
+
+class Dilate(Stage):
+    name = "dilation"
+
+    def __init__(self, kernelSize=CH2_KERNEL, iterations=1, separable=False):
+        self.kernelSize = kernelSize
+        self.kernel = np.ones((kernelSize, kernelSize), np.uint8)
+        self.iterations = iterations
+        self.separable = separable
+
+    def apply(self, src, dst):
+        if self.separable:
+            return _morphSeparable(cv2.dilate, src, dst, self.kernelSize, self.iterations)
+        return cv2.dilate(src, self.kernel, dst, iterations=self.iterations)
+
+
+class Erode(Stage):
+    name = "eroded"
+
+    def __init__(self, kernelSize=CH2_KERNEL, iterations=1, separable=False):
+        self.kernelSize = kernelSize
+        self.kernel = np.ones((kernelSize, kernelSize), np.uint8)
+        self.iterations = iterations
+        self.separable = separable
+
+    def apply(self, src, dst):
+        if self.separable:
+            return _morphSeparable(cv2.erode, src, dst, self.kernelSize, self.iterations)
+        return cv2.erode(src, self.kernel, dst, iterations=self.iterations)
+
+
+# ============================================================
+# FAST PATH: CLOSING 1 LANGKAH + BLUR CEPAT
+# ============================================================
+# Di 4K, blur 15x15 + dilate + erode chapter 2 adalah bagian termahal pre-stage edge.
+#
+# - Close      : dilate -> erode = closing, dijalankan sebagai 1 morphologyEx(MORPH_CLOSE).
+#                Hasil IDENTIK dengan Dilate + Erode, tanpa buffer "dilation" di antaranya.
+# - separable  : kernel kotak k x k dipecah jadi pass baris (1 x k) + kolom (k x 1).
+#                Hasil identik. Catatan: OpenCV sendiri sudah memecah kernel kotak
+#                berisi 1 semua, jadi pass manual ini biasanya TIDAK lebih cepat
+#                (lihat benchmarkMorphology). Disediakan untuk perbandingan.
+# - SeparableGaussianBlur : kernel 1D Gaussian dihitung sekali (cache), lalu sepFilter2D.
+# - BoxBlur    : 3 box filter bertumpuk ~ Gaussian dengan sigma yang sama
+#                (teorema limit pusat). cv2.blur memakai running sum, jadi biayanya
+#                hampir TIDAK bergantung ukuran kernel. Hasil tidak identik -> lihat compareMasks.
+#
+# Selisih akurasi vs pipeline referensi diukur dengan compareImages / compareMasks,
+# dan benchmarkBlur / benchmarkMorphology mengukur waktu di beberapa ukuran kernel.
+# python preprocess.py [gambar] mencetak semuanya (default: minji.jpg diperbesar ke 4K).
+
+BLUR_GAUSSIAN = "gaussian"
+BLUR_SEPARABLE = "separable"
+BLUR_BOX = "box"
+
+
+def gaussianSigma(ksize):
+    # sigma yang dipakai OpenCV kalau sigma = 0
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def boxSizesForGauss(sigma, passes=3):
+    """
+    Ukuran box (ganjil) untuk `passes` kali box filter yang variansinya = sigma^2.
+    return : list ukuran, panjang = passes
+    """
+    ideal = np.sqrt(12.0 * sigma * sigma / passes + 1)
+    wl = int(np.floor(ideal))
+    if wl % 2 == 0:
+        wl -= 1
+    wl = max(wl, 1)
+    wu = wl + 2
+    m = int(round((12.0 * sigma * sigma - passes * wl * wl - 4 * passes * wl - 3 * passes) / (-4.0 * wl - 4)))
+    return [wl if i < m else wu for i in range(passes)]
+
+
+class SeparableGaussianBlur(Stage):
+    name = "blur"
+
+    def __init__(self, ksize=CH2_BLUR, sigma=0):
+        kw, kh = ksize
+        sx = sigma if sigma > 0 else gaussianSigma(kw)
+        sy = sigma if sigma > 0 else gaussianSigma(kh)
+        self.kernelX = cv2.getGaussianKernel(kw, sx, cv2.CV_32F)
+        self.kernelY = cv2.getGaussianKernel(kh, sy, cv2.CV_32F)
+
+    def apply(self, src, dst):
+        return cv2.sepFilter2D(src, -1, self.kernelX, self.kernelY, dst)
+
+
+class BoxBlur(Stage):
+    name = "blur"
+
+    def __init__(self, ksize=CH2_BLUR, sigma=0, passes=3):
+        kw, kh = ksize
+        sx = sigma if sigma > 0 else gaussianSigma(kw)
+        sy = sigma if sigma > 0 else gaussianSigma(kh)
+        sizes = list(zip(boxSizesForGauss(sx, passes), boxSizesForGauss(sy, passes)))
+        # box 1x1 tidak mengubah apa-apa (sigma kecil), lewati
+        self.sizes = [size for size in sizes if size != (1, 1)] or [(1, 1)]
+
+    def apply(self, src, dst):
+        cv2.blur(src, self.sizes[0], dst)
+        for size in self.sizes[1:]:
+            cv2.blur(dst, size, dst)    # cv2.blur aman in-place
+        return dst
+
+
+class Close(Stage):
+    name = "closed"
+
+    def __init__(self, kernelSize=CH2_KERNEL, iterations=1, separable=False):
+        self.kernelSize = kernelSize
+        self.kernel = np.ones((kernelSize, kernelSize), np.uint8)
+        self.iterations = iterations
+        self.separable = separable
+
+    def apply(self, src, dst):
+        if self.separable:
+            _morphSeparable(cv2.dilate, src, dst, self.kernelSize, self.iterations)
+            return _morphSeparable(cv2.erode, dst, dst, self.kernelSize, self.iterations)
+        return cv2.morphologyEx(src, cv2.MORPH_CLOSE, self.kernel, dst, iterations=self.iterations)
+
+
+def blurStage(mode, ksize, sigma=0):
+    if mode == BLUR_GAUSSIAN:
+        return GaussianBlur(ksize, sigma)
+    if mode == BLUR_SEPARABLE:
+        return SeparableGaussianBlur(ksize, sigma)
+    if mode == BLUR_BOX:
+        return BoxBlur(ksize, sigma)
+    raise ValueError("blur harus 'gaussian', 'separable', atau 'box', bukan %r" % (mode,))
+
+
+class Pipeline:
+    """
+    stages         : list Stage, dijalankan berurutan
+    maxBufferSets  : berapa set buffer (per ukuran input) yang disimpan sekaligus
+    profiler       : (opsional) metrics.Profiler, waktu tiap stage ikut dicatat di sana
+    """
+
+    def __init__(self, stages, maxBufferSets=4, profiler=None):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Nama stage harus unik: %s" % names)
+
+        self.stages = list(stages)
+        self.maxBufferSets = maxBufferSets
+        self.profiler = profiler
+        self._bufferSets = {}       # (shape, dtype) -> list buffer per stage
+        self._last = None           # hasil tiap stage dari run() terakhir
+        self.resetTimings()
+
+    def copy(self):
+        # Pipeline baru dengan konfigurasi sama tapi stage, buffer & timing sendiri
+        # (stage di-deepcopy lalu di-reset: state AutoCanny tidak ikut terbagi)
+        stages = copy.deepcopy(self.stages)
+        for stage in stages:
+            stage.reset()
+        return Pipeline(stages, self.maxBufferSets, self.profiler)
+
+    def _buffers(self, img):
+        key = (img.shape, img.dtype.str)
+        buffers = self._bufferSets.get(key)
+        if buffers is None:
+            if len(self._bufferSets) >= self.maxBufferSets:
+                # buang set paling lama (dict menyimpan urutan insert)
+                self._bufferSets.pop(next(iter(self._bufferSets)))
+            buffers = []
+            shape = img.shape
+            for stage in self.stages:
+                outShape = stage.outputShape(shape)
+                buffers.append(None if outShape is None else np.empty(outShape, np.uint8))
+                if outShape is not None:
+                    shape = outShape
+            self._bufferSets[key] = buffers
+        return buffers
+
+    def run(self, img):
+        """
+        img    : frame input (BGR atau grayscale)
+        return : output stage terakhir (buffer milik pipeline)
+        """
+        buffers = self._buffers(img)
+        results = []
+        x = img
+        for i, stage in enumerate(self.stages):
+            t0 = time.perf_counter()
+            x = stage.apply(x, buffers[i])
+            seconds = time.perf_counter() - t0
+            self._seconds[i] += seconds
+            if self.profiler is not None:
+                self.profiler.record(stage.name, seconds)
+            results.append(x)
+        self.frames += 1
+        self._last = results
+        return x
+
+    def outputs(self):
+        # dict nama stage -> hasil dari run() terakhir
+        if self._last is None:
+            return {}
+        return {stage.name: out for stage, out in zip(self.stages, self._last)}
+
+    def resetTimings(self):
+        self.frames = 0
+        self._seconds = [0.0] * len(self.stages)
+
+    def timings(self):
+        # dict nama stage -> {"totalMs", "meanMs"}
+        frames = max(self.frames, 1)
+        return {
+            stage.name: {"totalMs": 1000.0 * s, "meanMs": 1000.0 * s / frames}
+            for stage, s in zip(self.stages, self._seconds)
+        }
+
+
+def chapter2Pipeline(profiler=None, blur=BLUR_GAUSSIAN, fused=False, separable=False, canny=CANNY_FIXED):
+    """
+    Gray -> Blur(15x15) -> Canny(150, 200) -> dilate -> erode
+
+    blur      : "gaussian" (referensi), "separable", atau "box" (lihat FAST PATH)
+    fused     : True = dilate + erode jadi 1 stage Close (output "closed")
+    separable : morfologi dengan pass baris + kolom
+    canny     : "fixed" (150, 200), atau "median" / "otsu" (AutoCanny)
+    """
+    stages = [Gray(), blurStage(blur, CH2_BLUR, 0), cannyStage(canny, CH2_CANNY)]
+    if fused:
+        stages.append(Close(CH2_KERNEL, separable=separable))
+    else:
+        stages += [Dilate(CH2_KERNEL, separable=separable), Erode(CH2_KERNEL, separable=separable)]
+    return Pipeline(stages, profiler=profiler)
+
+
+def chapter2FastPipeline(profiler=None):
+    # mode cepat: box blur bertumpuk + closing 1 langkah
+    return chapter2Pipeline(profiler, blur=BLUR_BOX, fused=True)
+
+
+def chapter8Pipeline(profiler=None, canny=CANNY_FIXED):
+    # Gray -> Blur(7x7, sigma 1) -> Canny(50, 50), canny="median" / "otsu" = AutoCanny
+    return Pipeline([Gray(), GaussianBlur(CH8_BLUR, CH8_SIGMA), cannyStage(canny, CH8_CANNY)],
+                    profiler=profiler)
+
+
+# ============================================================
+# AKURASI & BENCHMARK FAST PATH
+# ============================================================
+def compareImages(reference, candidate):
+    # selisih pixel (misal hasil blur): rata-rata & maksimum |beda|
+    diff = cv2.absdiff(reference, candidate)
+    return {"meanAbsDiff": float(diff.mean()), "maxAbsDiff": int(diff.max())}
+
+
+def compareMasks(reference, candidate):
+    """
+    Bandingkan 2 gambar biner (edge / hasil morfologi).
+    return : fraksi pixel yang beda + IoU pixel putih
+    """
+    ref = reference > 0
+    cand = candidate > 0
+    union = np.count_nonzero(ref | cand)
+    return {
+        "mismatchFraction": float(np.count_nonzero(ref != cand)) / ref.size,
+        "iou": float(np.count_nonzero(ref & cand)) / union if union else 1.0,
+    }
+
+
+def _timeMs(fn, repeat):
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return 1000.0 * (time.perf_counter() - t0) / repeat
+
+
+def benchmarkBlur(imgGray, kernelSizes=(5, 9, 15, 25, 41), repeat=10):
+    """
+    Waktu (ms) + selisih akurasi tiap mode blur vs GaussianBlur, per ukuran kernel.
+    edge = selisih hasil Canny chapter 2 setelah blur itu.
+    """
+    rows = []
+    for k in kernelSizes:
+        reference = cv2.GaussianBlur(imgGray, (k, k), 0)
+        refEdges = cv2.Canny(reference, *CH2_CANNY)
+        for mode in (BLUR_GAUSSIAN, BLUR_SEPARABLE, BLUR_BOX):
+            stage = blurStage(mode, (k, k))
+            dst = np.empty_like(imgGray)
+            ms = _timeMs(lambda: stage.apply(imgGray, dst), repeat)
+            row = {"kernel": k, "mode": mode, "ms": ms}
+            row.update(compareImages(reference, dst))
+            row.update({"edge" + key[0].upper() + key[1:]: v
+                        for key, v in compareMasks(refEdges, cv2.Canny(dst, *CH2_CANNY)).items()})
+            rows.append(row)
+    return rows
+
+
+def benchmarkMorphology(imgEdge, kernelSizes=(3, 5, 9, 15, 25), repeat=10):
+    """
+    dilate + erode (referensi chapter 2) vs Close (1 langkah) vs pass separable.
+    """
+    rows = []
+    for k in kernelSizes:
+        kernel = np.ones((k, k), np.uint8)
+        reference = cv2.erode(cv2.dilate(imgEdge, kernel), kernel)
+        variants = {
+            "dilate+erode": lambda: cv2.erode(cv2.dilate(imgEdge, kernel), kernel),
+            "close": None,
+            "close-separable": None,
+        }
+        closeStage = Close(k)
+        sepStage = Close(k, separable=True)
+        dst = np.empty_like(imgEdge)
+        variants["close"] = lambda: closeStage.apply(imgEdge, dst)
+        variants["close-separable"] = lambda: sepStage.apply(imgEdge, dst)
+        for name, fn in variants.items():
+            ms = _timeMs(fn, repeat)
+            row = {"kernel": k, "mode": name, "ms": ms}
+            row.update(compareMasks(reference, fn()))
+            rows.append(row)
+    return rows
+
+
+def benchmarkChapter2(img, repeat=10):
+    # pipeline chapter 2 lengkap: referensi vs fast (hasil akhir dibandingkan)
+    reference = chapter2Pipeline()
+    fast = chapter2FastPipeline()
+    result = {
+        "referenceMs": _timeMs(lambda: reference.run(img), repeat),
+        "fastMs": _timeMs(lambda: fast.run(img), repeat),
+    }
+    result.update(compareMasks(reference.run(img), fast.run(img)))
+    return result
+
+
+def benchmarkAutoCanny(img, gains=(0.4, 0.6, 0.8, 1.0, 1.2), repeat=5):
+    """
+    Gambar yang sama dengan cahaya berbeda (dikali gain): jumlah pixel edge
+    Canny fixed (chapter 8) vs AutoCanny, + biaya pemilihan threshold relatif ke Canny.
+    """
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    rows = []
+    for gain in gains:
+        imgBlur = cv2.GaussianBlur(cv2.convertScaleAbs(imgGray, alpha=gain), CH8_BLUR, CH8_SIGMA)
+        row = {"gain": gain, "fixedEdges": cv2.countNonZero(cv2.Canny(imgBlur, *CH8_CANNY))}
+        for method in (CANNY_MEDIAN, CANNY_OTSU):
+            stage = AutoCanny(method, alpha=1.0)
+            dst = np.empty_like(imgBlur)
+            for _ in range(repeat):
+                stage.apply(imgBlur, dst)
+            row[method + "Edges"] = cv2.countNonZero(dst)
+            row[method + "StatsFraction"] = stage.stats()["statsFraction"]
+        rows.append(row)
+    return rows
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # python preprocess.py [gambar]  -> default minji.jpg diperbesar ke 3840x2160
+    if len(sys.argv) > 1:
+        img = cv2.imread(sys.argv[1])
+    else:
+        img = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "minji.jpg"))
+        img = cv2.resize(img, (3840, 2160))
+    if img is None:
+        raise FileNotFoundError("Gambar tidak ditemukan")
+    imgGray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    print("gambar %dx%d" % (img.shape[1], img.shape[0]))
+
+    print("\n%-7s %-10s %8s %10s %8s %12s %9s" % ("kernel", "blur", "ms", "mean|d|", "max|d|", "edge beda", "edge IoU"))
+    for r in benchmarkBlur(imgGray):
+        print("%-7d %-10s %8.2f %10.3f %8d %11.4f%% %9.3f" % (
+            r["kernel"], r["mode"], r["ms"], r["meanAbsDiff"], r["maxAbsDiff"],
+            100.0 * r["edgeMismatchFraction"], r["edgeIou"]))
+
+    imgEdge = cv2.Canny(cv2.GaussianBlur(imgGray, CH2_BLUR, 0), *CH2_CANNY)
+    print("\n%-7s %-16s %8s %10s %6s" % ("kernel", "morfologi", "ms", "beda", "IoU"))
+    for r in benchmarkMorphology(imgEdge):
+        print("%-7d %-16s %8.2f %9.3f%% %6.3f" % (
+            r["kernel"], r["mode"], r["ms"], 100.0 * r["mismatchFraction"], r["iou"]))
+
+    r = benchmarkChapter2(img)
+    print("\nchapter 2 lengkap: referensi %.2f ms, fast %.2f ms (%.2fx), beda %.3f%%, IoU %.3f" % (
+        r["referenceMs"], r["fastMs"], r["referenceMs"] / r["fastMs"], 100.0 * r["mismatchFraction"], r["iou"]))
+
+    print("\n%-6s %10s %12s %10s %12s %10s" % ("gain", "fixed", "median", "stat/canny", "otsu", "stat/canny"))
+    for r in benchmarkAutoCanny(img):
+        print("%-6.1f %10d %12d %9.1f%% %12d %9.1f%%" % (
+            r["gain"], r["fixedEdges"], r["medianEdges"], 100.0 * r["medianStatsFraction"],
+            r["otsuEdges"], 100.0 * r["otsuStatsFraction"]))
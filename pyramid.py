@@ -0,0 +1,300 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# RESIZE CACHE PER FRAME (PYRAMID) + CROP ZERO-COPY
+# ============================================================
+# chapter3 me-resize gambar ke 300x300 dan 800x800 lalu crop tengah 250x250
+# dengan clamp manual. Di service kita, 1 frame sumber yang sama di-resize ke
+# beberapa ukuran oleh consumer yang berbeda (thumbnail, detektor, preview), dan
+# setiap consumer memanggil cv2.resize sendiri dari frame penuh.
+#
+# ResizeCache (1 per frame sumber):
+# - setiap ukuran (w, h) dihitung PALING BANYAK 1x per frame
+# - dihitung dari level cache terkecil yang masih >= ukuran target (bukan selalu dari
+#   frame penuh), downscale dengan INTER_AREA, upscale dengan INTER_LINEAR dari sumber
+# - target < setengah level asal -> lewat level pyramid (w/2, h/2) dulu, level itu
+#   ikut di-cache untuk consumer berikutnya
+# - crop = VIEW NumPy (tanpa copy), koordinat di-clamp ke batas gambar;
+#   crop yang seluruhnya di luar gambar -> ValueError
+# - semua hasil READ-ONLY (dipakai bersama consumer lain). Mau menggambar? .copy()
+# - buffer resize dipakai ulang di frame berikutnya (setFrame): hasil frame lama
+#   ikut tertimpa, sama seperti output Pipeline.run
+#
+# Contoh (chapter 3):
+#   cache = ResizeCache(img)
+#   imgResizeSmall = cache.resize((300, 300))      # dihitung dari imgResizeBig kalau sudah ada
+#   imgResizeBig = cache.resize((800, 800))
+#   imgCroppedCenter = cache.centerCrop((250, 250))
+#   print(cache.stats())                          # hits / misses / resize dari level cache
+
+
+def clampRect(x, y, w, h, shape):
+    """
+    Rect (x, y, w, h) dipotong ke batas gambar shape (h, w, ...).
+    return : (x1, y1, x2, y2), atau None kalau tidak ada pixel yang tersisa
+    """
+    x1, y1 = max(0, int(x)), max(0, int(y))
+    x2, y2 = min(shape[1], int(x) + int(w)), min(shape[0], int(y) + int(h))
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+def centerRect(size, shape):
+    # rect (x, y, w, h) ukuran size = (w, h) tepat di tengah gambar, seperti chapter3
+    cropW, cropH = size
+    cx, cy = shape[1] // 2, shape[0] // 2
+    return cx - cropW // 2, cy - cropH // 2, cropW, cropH
+
+
+def _readOnly(img):
+    view = img.view()
+    view.flags.writeable = False
+    return view
+
+
+class ResizeCache:
+    """
+    frame : frame sumber (boleh None, set nanti lewat setFrame)
+
+    Aman dipakai beberapa thread untuk frame yang sama; setFrame() sebaiknya
+    dipanggil setelah semua consumer selesai dengan frame sebelumnya.
+    """
+
+    def __init__(self, frame=None):
+        self._lock = threading.Lock()
+        self._buffers = {}      # (w, h) -> buffer, dipakai ulang antar frame
+        self._valid = set()     # ukuran yang sudah dihitung untuk frame sekarang
+        self._source = None
+        self.frames = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.fromCache = 0      # miss yang dihitung dari level cache (bukan dari sumber)
+        self.pixelsSaved = 0    # pixel input resize yang tidak perlu dibaca berkat level cache
+        self.seconds = 0.0
+        self.crops = 0
+
+        if frame is not None:
+            self.setFrame(frame)
+
+    def setFrame(self, frame):
+        # frame baru: semua ukuran dihitung ulang saat diminta (buffer tetap dipakai ulang)
+        with self._lock:
+            self._source = frame
+            self._valid.clear()
+            if len(self._buffers) > 16:
+                self._buffers.clear()
+            self.frames += 1
+
+    @property
+    def source(self):
+        return self._source
+
+    @property
+    def shape(self):
+        return self._requireSource().shape
+
+    def _requireSource(self):
+        source = self._source
+        if source is None:
+            raise ValueError("ResizeCache belum punya frame (panggil setFrame)")
+        return source
+
+    def _nearestLarger(self, size):
+        # level cache terkecil yang lebar DAN tingginya >= target, default frame sumber.
+        # Level hasil upscale tidak dipakai: isinya interpolasi, bukan detail asli.
+        srcH, srcW = self._source.shape[:2]
+        best, bestArea = self._source, None
+        for w, h in self._valid:
+            if w > srcW or h > srcH:
+                continue
+            if w >= size[0] and h >= size[1] and (bestArea is None or w * h < bestArea):
+                best, bestArea = self._buffers[(w, h)], w * h
+        return best
+
+    def resize(self, size):
+        """
+        size   : (w, h) seperti cv2.resize
+        return : array read-only ukuran size
+        """
+        size = (int(size[0]), int(size[1]))
+        if size[0] <= 0 or size[1] <= 0:
+            raise ValueError("Ukuran resize harus positif: %s" % (size,))
+        with self._lock:
+            if self._source is None:
+                raise ValueError("ResizeCache belum punya frame (panggil setFrame)")
+            h, w = self._source.shape[:2]
+            if size == (w, h):
+                self.hits += 1
+                return _readOnly(self._source)
+            if size in self._valid:
+                self.hits += 1
+                return _readOnly(self._buffers[size])
+
+            # miss dihitung per permintaan caller; level setengah internal di _compute tidak
+            self.misses += 1
+            t0 = time.perf_counter()
+            buf = self._compute(size)
+            self.seconds += time.perf_counter() - t0
+            return _readOnly(buf)
+
+    def _compute(self, size, internal=False):
+        # internal = level setengah yang dihitung untuk permintaan lain (tidak masuk counter)
+        h, w = self._source.shape[:2]
+        if size[0] <= w and size[1] <= h:
+            src = self._nearestLarger(size)
+            # masih >= 2x target: turunkan dulu 1 level pyramid (setengah ukuran, ikut di-cache).
+            # INTER_AREA kelipatan bulat jauh lebih murah daripada skala pecahan besar.
+            half = (src.shape[1] // 2, src.shape[0] // 2)
+            if half[0] >= size[0] and half[1] >= size[1] and half != size:
+                src = self._compute(half, internal=True)
+            interpolation = cv2.INTER_AREA
+            if src is not self._source and not internal:
+                self.fromCache += 1
+                self.pixelsSaved += w * h - src.shape[0] * src.shape[1]
+        else:
+            src, interpolation = self._source, cv2.INTER_LINEAR
+
+        buf = self._buffers.get(size)
+        if buf is None or buf.shape[2:] != self._source.shape[2:] or buf.dtype != self._source.dtype:
+            buf = self._buffers[size] = np.empty((size[1], size[0]) + self._source.shape[2:],
+                                                 self._source.dtype)
+        cv2.resize(src, size, buf, interpolation=interpolation)
+        self._valid.add(size)
+        return buf
+
+    def scaled(self, fx, fy=None):
+        # resize relatif (fx, fy) terhadap frame sumber
+        h, w = self._requireSource().shape[:2]
+        fy = fx if fy is None else fy
+        return self.resize((max(1, int(round(w * fx))), max(1, int(round(h * fy)))))
+
+    def level(self, n):
+        # level pyramid ke-n: setengah ukuran per level (seperti cv2.pyrDown, tapi INTER_AREA)
+        h, w = self._requireSource().shape[:2]
+        return self.resize((max(1, w >> n), max(1, h >> n)))
+
+    def crop(self, rect, size=None, clamp=True):
+        """
+        rect   : (x, y, w, h) di gambar ukuran size (None = frame sumber)
+        clamp  : True = potong ke batas gambar, False = rect di luar batas -> ValueError
+        return : view read-only (tanpa copy)
+        """
+        img = self._requireSource() if size is None else self.resize(size)
+        coords = clampRect(*rect, shape=img.shape)
+        if coords is None:
+            raise ValueError("Crop %s di luar gambar %dx%d" % (tuple(rect), img.shape[1], img.shape[0]))
+        x1, y1, x2, y2 = coords
+        if not clamp and (x2 - x1, y2 - y1) != (int(rect[2]), int(rect[3])):
+            raise ValueError("Crop %s melewati batas gambar %dx%d" % (tuple(rect), img.shape[1], img.shape[0]))
+        with self._lock:
+            self.crops += 1
+        return _readOnly(img[y1:y2, x1:x2])
+
+    def centerCrop(self, cropSize, size=None, clamp=True):
+        # crop (w, h) di tengah gambar ukuran size (None = frame sumber)
+        shape = self._requireSource().shape if size is None else (size[1], size[0])
+        return self.crop(centerRect(cropSize, shape), size, clamp)
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "frames": self.frames,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / float(requests) if requests else 0.0,
+            "fromCache": self.fromCache,
+            "pixelsSaved": self.pixelsSaved,
+            "resizeMs": 1000.0 * self.seconds,
+            "crops": self.crops,
+            "cachedSizes": sorted(self._valid, reverse=True),
+        }
+
+
+# ============================================================
+# BENCHMARK: beberapa consumer, ukuran yang sama / mirip
+# ============================================================
+# Urutan permintaan per frame: preview 800x800, thumbnail 300x300 (2 consumer),
+# detektor 0.5x, thumbnail kecil 150x150, + crop tengah 250x250 dari sumber & 800x800.
+CONSUMERS = (("resize", (800, 800)), ("resize", (300, 300)), ("resize", (300, 300)),
+             ("scaled", 0.5), ("resize", (150, 150)),
+             ("crop", None), ("crop", (800, 800)))
+
+
+def _naive(img, requests):
+    # tiap consumer resize sendiri dari frame penuh, crop di-copy seperti benchmark lama
+    out = []
+    h, w = img.shape[:2]
+    for kind, arg in requests:
+        if kind == "resize":
+            out.append(cv2.resize(img, arg, interpolation=cv2.INTER_AREA if arg[0] <= w else cv2.INTER_LINEAR))
+        elif kind == "scaled":
+            out.append(cv2.resize(img, None, fx=arg, fy=arg, interpolation=cv2.INTER_AREA))
+        else:
+            src = img if arg is None else cv2.resize(img, arg, interpolation=cv2.INTER_AREA)
+            x, y, cw, ch = centerRect((250, 250), src.shape)
+            x1, y1, x2, y2 = clampRect(x, y, cw, ch, src.shape)
+            out.append(src[y1:y2, x1:x2].copy())
+    return out
+
+
+def _cached(cache, img, requests):
+    cache.setFrame(img)
+    out = []
+    for kind, arg in requests:
+        if kind == "resize":
+            out.append(cache.resize(arg))
+        elif kind == "scaled":
+            out.append(cache.scaled(arg))
+        else:
+            out.append(cache.centerCrop((250, 250), arg))
+    return out
+
+
+def benchmarkResizeCache(img, requests=CONSUMERS, repeat=50):
+    """
+    return : waktu per frame naive vs cache, + selisih akurasi resize bertingkat
+             (mean |beda| dibanding resize langsung dari sumber)
+    """
+    cache = ResizeCache()
+    naiveOut, cachedOut = _naive(img, requests), _cached(cache, img, requests)
+    diffs = [float(cv2.absdiff(a, b).mean()) for a, b in zip(naiveOut, cachedOut)]
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        _naive(img, requests)
+    naiveMs = 1000.0 * (time.perf_counter() - t0) / repeat
+
+    cache = ResizeCache()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        _cached(cache, img, requests)
+    cachedMs = 1000.0 * (time.perf_counter() - t0) / repeat
+
+    return {"naiveMs": naiveMs, "cachedMs": cachedMs, "speedup": naiveMs / cachedMs if cachedMs else 0.0,
+            "maxMeanAbsDiff": max(diffs), **cache.stats()}
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # python pyramid.py [gambar]  -> juga dicoba di versi 1080p / 4K dari gambar itu
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "resources", "lambo.png")
+    img = cv2.imread(path)
+    if img is None:
+        raise SystemExit("Gambar tidak ditemukan: " + path)
+
+    for label, frame in (("asli", img), ("1080p", cv2.resize(img, (1920, 1080))),
+                         ("4k", cv2.resize(img, (3840, 2160)))):
+        r = benchmarkResizeCache(frame)
+        print("%-6s %4dx%-4d naive %7.2f ms  cache %7.2f ms  (%.1fx)  hit %.0f%%  dari level cache %d/frame  "
+              "selisih max %.2f" % (label, frame.shape[1], frame.shape[0], r["naiveMs"], r["cachedMs"],
+                                    r["speedup"], 100.0 * r["hitRate"], r["fromCache"] // r["frames"],
+                                    r["maxMeanAbsDiff"]))
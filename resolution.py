@@ -0,0 +1,244 @@
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# ADAPTIVE RESOLUTION: RESOLUSI PROSES MENGIKUTI TARGET FPS
+# ============================================================
+# chapter1 mengunci webcam di 640x480 (cam.set(3, 640) / cam.set(4, 480)) dan
+# chapter7 selalu resize ke 600x400, apa pun kemampuan mesinnya.
+#
+# ResolutionController:
+# - resolusi proses dipilih dari "tangga" skala (pyramid): 1, 0.75, 0.5, 0.375, 0.25
+# - latency end-to-end (resize + detektor) diukur tiap frame, dirata-rata per window
+# - terlalu lambat dari budget (1 / targetFps)  -> turun 1 level (gambar lebih kecil)
+# - cukup cepat, DAN perkiraan biaya level di atasnya (latency x rasio pixel) masih
+#   di bawah upMargin x budget -> naik 1 level
+# - setelah pindah level ada cooldown supaya tidak bolak-balik (hysteresis)
+#
+# Deteksi dihitung di gambar kecil, lalu dikembalikan ke koordinat frame ASLI:
+#   controller = ResolutionController(targetFps=20)
+#   small, scale = controller.prepare(frame)
+#   faces = detectFaces(small, cascade, minSize=controller.scaledSize((30, 30)))
+#   controller.done()
+#   faces = controller.toOriginal(faces)            # (x, y, w, h) di frame asli
+#
+# Atau sekaligus: result = controller.process(frame, fn, mapper=controller.toOriginal)
+
+DEFAULT_LEVELS = (1.0, 0.75, 0.5, 0.375, 0.25)
+
+
+def scaleRects(rects, sx, sy):
+    """
+    rects  : list / array (x, y, w, h) di gambar kecil
+    sx, sy : faktor pengali ke gambar asli (lebar asli / lebar kecil, dst.)
+    return : list tuple int (x, y, w, h)
+    """
+    return [(int(round(x * sx)), int(round(y * sy)), int(round(w * sx)), int(round(h * sy)))
+            for (x, y, w, h) in rects]
+
+
+def scaleContourTable(table, sx, sy):
+    """
+    Tabel shapes.CONTOUR_DTYPE (hasil analyzeContours) ke koordinat asli.
+    return : copy tabel; bbox, centroid, area, dan perimeter ikut diskalakan
+    """
+    out = table.copy()
+    for field, factor in (("x", sx), ("w", sx), ("cx", sx), ("y", sy), ("h", sy), ("cy", sy)):
+        if np.issubdtype(out.dtype[field], np.integer):
+            out[field] = np.round(out[field] * factor)
+        else:
+            out[field] = out[field] * factor
+    out["area"] = out["area"] * (sx * sy)
+    out["perimeter"] = out["perimeter"] * np.sqrt(sx * sy)
+    return out
+
+
+class ResolutionController:
+    """
+    targetFps   : fps yang ingin dicapai (budget = 1 / targetFps detik per frame)
+    levels      : skala resolusi proses, dari terbesar ke terkecil
+    window      : jumlah frame yang dirata-rata sebelum memutuskan naik / turun
+    upMargin    : naik level hanya kalau perkiraan latency level atas < upMargin x budget
+    cooldown    : jumlah frame tanpa keputusan setelah pindah level
+    startLevel  : index level awal (default 0 = resolusi penuh)
+    """
+
+    def __init__(self, targetFps=30.0, levels=DEFAULT_LEVELS, window=10, upMargin=0.8, cooldown=10,
+                 startLevel=0):
+        levels = sorted(set(float(s) for s in levels), reverse=True)
+        if not levels or levels[-1] <= 0 or levels[0] > 1.0:
+            raise ValueError("levels harus di rentang (0, 1]")
+        self.levels = levels
+        self.targetFps = targetFps
+        self.window = window
+        self.upMargin = upMargin
+        self.cooldown = cooldown
+
+        self.level = min(startLevel, len(levels) - 1)
+        self._samples = []
+        self._cooldownLeft = 0
+        self._t0 = None
+        self._factors = (1.0, 1.0)
+        self._buffers = {}          # (level, shape) -> buffer hasil resize
+
+        self.frames = 0
+        self.levelChanges = 0
+        self.framesPerLevel = [0] * len(levels)
+        self.lastLatency = 0.0
+
+    @property
+    def scale(self):
+        return self.levels[self.level]
+
+    @property
+    def budget(self):
+        return 1.0 / self.targetFps
+
+    def scaledSize(self, size):
+        # ukuran (w, h) di frame asli -> ukuran di gambar proses (misal minSize wajah)
+        return tuple(max(1, int(round(v * self.scale))) for v in size)
+
+    def scaledArea(self, area):
+        # luas di frame asli -> luas di gambar proses (misal minArea kontur)
+        return area * self.scale * self.scale
+
+    # ---------------------------
+    # Per frame
+    # ---------------------------
+    def prepare(self, frame):
+        """
+        Mulai 1 frame: resize ke level sekarang (INTER_AREA, buffer dipakai ulang).
+        return : (gambar proses, skala)
+        """
+        self._t0 = time.perf_counter()
+        scale = self.scale
+        h, w = frame.shape[:2]
+        if scale == 1.0:
+            self._factors = (1.0, 1.0)
+            return frame, scale
+
+        size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        key = (self.level, frame.shape)
+        buf = self._buffers.get(key)
+        if buf is None:
+            if len(self._buffers) > 2 * len(self.levels):
+                self._buffers.clear()
+            buf = self._buffers[key] = np.empty((size[1], size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, size, buf, interpolation=cv2.INTER_AREA)
+        # faktor balik dari ukuran sebenarnya (pembulatan pixel), bukan 1 / scale
+        self._factors = (w / float(size[0]), h / float(size[1]))
+        return buf, scale
+
+    def done(self, latency=None):
+        """
+        Akhiri frame: catat latency (default: sejak prepare()) lalu sesuaikan level.
+        return : latency frame ini (detik)
+        """
+        if latency is None:
+            latency = time.perf_counter() - self._t0
+        self.lastLatency = latency
+        self.frames += 1
+        self.framesPerLevel[self.level] += 1
+        self._samples.append(latency)
+
+        if self._cooldownLeft > 0:
+            self._cooldownLeft -= 1
+        elif len(self._samples) >= self.window:
+            self._decide(sum(self._samples) / len(self._samples))
+        if len(self._samples) >= self.window:
+            self._samples = []
+        return latency
+
+    def _decide(self, mean):
+        budget = self.budget
+        if mean > budget and self.level < len(self.levels) - 1:
+            self._move(self.level + 1)
+        elif self.level > 0:
+            # biaya kira-kira sebanding jumlah pixel
+            up = self.levels[self.level - 1]
+            predicted = mean * (up / self.scale) ** 2
+            if predicted < budget * self.upMargin:
+                self._move(self.level - 1)
+
+    def _move(self, level):
+        self.level = level
+        self.levelChanges += 1
+        self._cooldownLeft = self.cooldown
+        self._samples = []
+
+    def toOriginal(self, rects):
+        # (x, y, w, h) dari gambar proses frame TERAKHIR ke koordinat frame asli
+        return scaleRects(rects, *self._factors)
+
+    def tableToOriginal(self, table):
+        # tabel kontur (shapes.analyzeContours) ke koordinat frame asli
+        return scaleContourTable(table, *self._factors)
+
+    def process(self, frame, fn, mapper=None):
+        """
+        prepare -> fn(gambar proses, skala) -> done -> mapper(hasil) (opsional).
+        """
+        small, scale = self.prepare(frame)
+        result = fn(small, scale)
+        if mapper is not None:
+            result = mapper(result)
+        self.done()
+        return result
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "scale": self.scale,
+            "level": self.level,
+            "levelChanges": self.levelChanges,
+            "framesPerLevel": dict(zip(self.levels, self.framesPerLevel)),
+            "lastLatencyMs": 1000.0 * self.lastLatency,
+            "targetFps": self.targetFps,
+        }
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    import faces
+
+    # python resolution.py [targetFps] [video]
+    # tanpa video: gambar minji.jpg diperbesar 2x dan digeser (pan) sebagai "kamera"
+    targetFps = float(sys.argv[1]) if len(sys.argv) > 1 else 15.0
+    cascade = faces.loadCascade()
+
+    if len(sys.argv) > 2:
+        cap = cv2.VideoCapture(sys.argv[2])
+        readFrame = cap.read
+    else:
+        base = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "minji.jpg"))
+        base = cv2.resize(base, None, fx=2, fy=2)
+        counter = [0]
+
+        def readFrame():
+            counter[0] += 1
+            if counter[0] > 150:
+                return False, None
+            return True, np.roll(base, 3 * counter[0], axis=1)
+
+    controller = ResolutionController(targetFps)
+    minFace = (60, 60)
+    t0 = time.perf_counter()
+    n = 0
+    while True:
+        success, frame = readFrame()
+        if not success:
+            break
+        found = controller.process(
+            frame, lambda small, scale: faces.detectFaces(small, cascade, minSize=controller.scaledSize(minFace)),
+            mapper=controller.toOriginal)
+        n += 1
+        if n % 15 == 0:
+            print("frame %4d  skala %.3f  latency %6.1f ms  wajah %s" % (
+                n, controller.scale, 1000.0 * controller.lastLatency, found[:2]))
+    elapsed = time.perf_counter() - t0
+    print("rata-rata %.1f fps (target %.1f)" % (n / elapsed, targetFps))
+    print(controller.stats())
@@ -0,0 +1,431 @@
+import time
+
+import cv2
+import numpy as np
+
+# ============================================================
+# SHAPE DETECTION (dari chapter 8)
+# ============================================================
+# Pipeline:
+# edge map -> findContours -> filter area -> approxPolyDP -> klasifikasi
+#
+# Bedanya dengan getContours() di chapter 8:
+# - tidak print dan tidak menggambar, hasilnya dikembalikan sebagai list
+# - menggambar dipisah ke drawShapes()
+
+# Kontur lebih kecil dari ini dianggap noise (sama seperti chapter 8)
+MIN_AREA = 500
+
+
+def classifyShape(objCor, w, h):
+    """
+    objCor : jumlah sudut hasil approxPolyDP
+    w, h   : ukuran bounding box (untuk membedakan Square vs Rectangle)
+    return : "Tri", "Square", "Rectangle", "Circle" atau "None"
+    """
+    if objCor == 3:
+        return "Tri"
+    if objCor == 4:
+        aspRatio = w / float(h)
+        if 0.95 < aspRatio < 1.05:
+            return "Square"
+        return "Rectangle"
+    if objCor > 4:
+        return "Circle"
+    return "None"
+
+
+def detectShapes(imgEdge, minArea=MIN_AREA):
+    """
+    imgEdge : gambar biner/edge (hasil Canny atau threshold)
+    minArea : batas bawah luas kontur
+    return  : list of dict {type, area, corners, bbox=(x, y, w, h), centroid=(cx, cy)}
+    """
+    return analyzeContours(imgEdge, minArea).toList()
+
+
+def drawShapes(img, shapes):
+    # Gambar bounding box hijau + label di tengah kotak (gaya chapter 8)
+    for shape in shapes:
+        x, y, w, h = shape["bbox"]
+        cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(img, shape["type"], (x + (w // 2) - 10, y + (h // 2) - 10),
+                    cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 0, 0), 2)
+    return img
+
+
+# ============================================================
+# ANALISIS KONTUR BERBASIS ARRAY (TANPA PRINT / GAMBAR DI DALAM LOOP)
+# ============================================================
+# getContours() chapter 8 mencetak area & jumlah sudut setiap kontur dan langsung
+# menggambar ke imgContour di dalam loop. Di scene dengan ribuan kontur,
+# print + drawContours per kontur itulah yang paling lama.
+#
+# analyzeContours():
+# - filter luas DULU (contourArea murah), arcLength/approxPolyDP hanya untuk yang lolos
+# - hasil disimpan di 1 numpy structured array (bukan list of dict):
+#   area, perimeter, bbox (x, y, w, h), jumlah sudut, label bentuk, centroid
+# - klasifikasi bentuk dilakukan vektorisasi di akhir (np.select)
+# - menggambar dipisah: drawContourAnalysis() (drawContours & polylines sekali panggil)
+
+SHAPE_NAMES = ("None", "Tri", "Square", "Rectangle", "Circle")
+
+CONTOUR_DTYPE = np.dtype([
+    ("index", np.int32),        # posisi di list contours hasil findContours
+    ("area", np.float32),
+    ("perimeter", np.float32),
+    ("x", np.int32), ("y", np.int32), ("w", np.int32), ("h", np.int32),
+    ("vertices", np.int16),     # jumlah sudut hasil approxPolyDP
+    ("label", np.uint8),        # index ke SHAPE_NAMES
+    ("cx", np.float32), ("cy", np.float32),
+])
+
+
+def classifyShapes(vertices, w, h):
+    # Versi array dari classifyShape(): return index SHAPE_NAMES
+    aspRatio = w / np.maximum(h, 1).astype(np.float32)
+    square = (aspRatio > 0.95) & (aspRatio < 1.05)
+    return np.select([vertices == 3, (vertices == 4) & square, vertices == 4, vertices > 4],
+                     [1, 2, 3, 4], 0).astype(np.uint8)
+
+
+class ContourAnalysis:
+    """
+    contours : semua kontur hasil findContours (termasuk yang tidak lolos filter)
+    table    : structured array CONTOUR_DTYPE, 1 baris per kontur yang lolos filter
+    """
+
+    def __init__(self, contours, table):
+        self.contours = contours
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def labels(self):
+        return [SHAPE_NAMES[i] for i in self.table["label"]]
+
+    def kept(self):
+        # kontur asli yang lolos filter (untuk digambar / diproses lagi)
+        return [self.contours[i] for i in self.table["index"]]
+
+    def toList(self):
+        # format sama dengan detectShapes() (list of dict, mudah di-JSON-kan)
+        return [{
+            "type": SHAPE_NAMES[row["label"]],
+            "area": float(row["area"]),
+            "corners": int(row["vertices"]),
+            "bbox": (int(row["x"]), int(row["y"]), int(row["w"]), int(row["h"])),
+            "centroid": (float(row["cx"]), float(row["cy"])),
+        } for row in self.table]
+
+
+def measureContours(imgEdge, minArea=MIN_AREA):
+    """
+    Tahap murah: findContours + filter luas + bbox & centroid (tanpa approxPolyDP).
+    Kolom perimeter / vertices / label masih 0 sampai classifyRows() dipanggil.
+    return : ContourAnalysis
+    """
+    contours, _ = cv2.findContours(imgEdge, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+
+    # 1) filter luas dulu
+    areas = np.fromiter((cv2.contourArea(cnt) for cnt in contours), np.float64, len(contours))
+    keep = np.flatnonzero(areas > minArea)
+
+    table = np.zeros(len(keep), CONTOUR_DTYPE)
+    table["index"] = keep
+    table["area"] = areas[keep]
+
+    # 2) bbox & centroid hanya untuk yang lolos
+    for row, i in enumerate(keep):
+        cnt = contours[i]
+        m = cv2.moments(cnt)
+        table[row]["x"], table[row]["y"], table[row]["w"], table[row]["h"] = cv2.boundingRect(cnt)
+        if m["m00"] != 0:
+            table[row]["cx"] = m["m10"] / m["m00"]
+            table[row]["cy"] = m["m01"] / m["m00"]
+    return ContourAnalysis(contours, table)
+
+
+def classifyRows(analysis, rows=None, epsilon=0.02):
+    """
+    Tahap mahal: arcLength + approxPolyDP + klasifikasi, hanya untuk baris terpilih.
+    rows   : index baris di analysis.table (None = semua)
+    """
+    table = analysis.table
+    rows = np.arange(len(table)) if rows is None else np.asarray(rows, np.intp)
+    for row in rows:
+        cnt = analysis.contours[table[row]["index"]]
+        peri = cv2.arcLength(cnt, True)
+        approx = cv2.approxPolyDP(cnt, epsilon * peri, True)
+        table[row]["perimeter"] = peri
+        table[row]["vertices"] = len(approx)
+        table[row]["x"], table[row]["y"], table[row]["w"], table[row]["h"] = cv2.boundingRect(approx)
+
+    # 3) klasifikasi sekaligus untuk semua baris terpilih
+    if len(rows):
+        table["label"][rows] = classifyShapes(table["vertices"][rows], table["w"][rows], table["h"][rows])
+    return analysis
+
+
+def analyzeContours(imgEdge, minArea=MIN_AREA, epsilon=0.02):
+    """
+    imgEdge : gambar biner/edge (hasil Canny atau threshold)
+    minArea : kontur dengan luas <= ini dibuang sebelum dianalisis
+    epsilon : ketelitian approxPolyDP relatif terhadap perimeter
+    return  : ContourAnalysis
+    """
+    return classifyRows(measureContours(imgEdge, minArea), epsilon=epsilon)
+
+
+def drawContourAnalysis(img, analysis, drawAll=False, drawLabels=True):
+    """
+    Gambar hasil analyzeContours() (gaya chapter 8) dalam beberapa panggilan batch:
+    - drawAll    : semua kontur (biru), termasuk yang tidak lolos filter
+    - kontur yang lolos filter (merah) -> 1x drawContours
+    - bounding box (hijau)             -> 1x polylines
+    - label bentuk                     -> putText per objek (opsional)
+    """
+    if drawAll:
+        cv2.drawContours(img, analysis.contours, -1, (255, 0, 0), 3)
+
+    table = analysis.table
+    if not len(table):
+        return img
+    cv2.drawContours(img, analysis.kept(), -1, (0, 0, 255), 3)
+
+    x, y, w, h = table["x"], table["y"], table["w"], table["h"]
+    boxes = np.stack([np.stack([x, y], 1), np.stack([x + w, y], 1),
+                      np.stack([x + w, y + h], 1), np.stack([x, y + h], 1)], 1).astype(np.int32)
+    cv2.polylines(img, list(boxes), True, (0, 255, 0), 2)
+
+    if drawLabels:
+        for row in table:
+            cv2.putText(img, SHAPE_NAMES[row["label"]],
+                        (int(row["x"] + row["w"] // 2 - 10), int(row["y"] + row["h"] // 2 - 10)),
+                        cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 0, 0), 2)
+    return img
+
+
+# ============================================================
+# TRACKING BENTUK ANTAR FRAME (ID STABIL)
+# ============================================================
+# Di video, objek yang sama muncul lagi di frame berikutnya. Daripada
+# mengklasifikasi ulang (approxPolyDP) dan melaporkan ulang semua objek setiap frame:
+#
+# - tiap frame: measureContours() saja (murah: luas, bbox, centroid)
+# - asosiasi ke track lama lewat GRID SPASIAL di atas centroid
+#   (sel ukuran maxDistance -> cukup cek 3x3 sel tetangga, bukan semua pasangan),
+#   pasangan kandidat diurutkan jarak lalu dipasangkan greedy: O(n log n)
+# - objek yang cocok & tidak berubah banyak -> label, vertices, perimeter dibawa dari
+#   track lama; bbox approxPolyDP = bbox kontur sekarang + selisih (approx - kontur)
+#   yang disimpan track, jadi baris hasil reuse sama formatnya dengan analyzeContours()
+# - hanya objek BARU atau yang luas/bentuk bbox-nya berubah signifikan yang
+#   di-classifyRows() ulang
+# - newIds / lostIds di update terakhir = objek yang baru muncul / hilang
+
+
+class ShapeTracker:
+    """
+    maxDistance : jarak centroid maksimal (pixel) untuk dianggap objek yang sama
+    areaChange  : perubahan luas relatif yang memicu klasifikasi ulang (0.2 = 20%)
+    maxMissed   : berapa frame track boleh tidak terlihat sebelum dihapus
+    minArea     : sama seperti analyzeContours()
+    """
+
+    def __init__(self, maxDistance=30.0, areaChange=0.2, maxMissed=5, minArea=MIN_AREA, epsilon=0.02):
+        self.maxDistance = float(maxDistance)
+        self.areaChange = areaChange
+        self.maxMissed = maxMissed
+        self.minArea = minArea
+        self.epsilon = epsilon
+
+        # track disimpan sebagai dict id ->
+        # [cx, cy, area, aspect, label, vertices, perimeter, bboxDelta, missed]
+        # bboxDelta = (dx, dy, dw, dh) bbox approxPolyDP dikurangi bbox kontur mentah
+        self.tracks = {}
+        self._nextId = 1
+        self.newIds = []
+        self.lostIds = []
+
+        # Counter
+        self.frames = 0
+        self.classified = 0
+        self.reused = 0
+
+    def _grid(self):
+        cell = self.maxDistance
+        grid = {}
+        for trackId, t in self.tracks.items():
+            grid.setdefault((int(t[0] // cell), int(t[1] // cell)), []).append(trackId)
+        return grid
+
+    def _associate(self, table):
+        # return list (row, trackId) hasil pencocokan greedy berdasarkan jarak
+        if not self.tracks or not len(table):
+            return []
+        cell = self.maxDistance
+        grid = self._grid()
+        pairs = []
+        for row in range(len(table)):
+            cx, cy = float(table[row]["cx"]), float(table[row]["cy"])
+            gx, gy = int(cx // cell), int(cy // cell)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for trackId in grid.get((gx + dx, gy + dy), ()):
+                        t = self.tracks[trackId]
+                        d = ((t[0] - cx) ** 2 + (t[1] - cy) ** 2) ** 0.5
+                        if d <= self.maxDistance:
+                            pairs.append((d, row, trackId))
+        pairs.sort()
+
+        usedRows, usedTracks, matches = set(), set(), []
+        for _, row, trackId in pairs:
+            if row not in usedRows and trackId not in usedTracks:
+                usedRows.add(row)
+                usedTracks.add(trackId)
+                matches.append((row, trackId))
+        return matches
+
+    def update(self, imgEdge):
+        """
+        imgEdge : edge map frame sekarang
+        return  : (ContourAnalysis, ids) -- ids[i] = ID track untuk analysis.table[i]
+        """
+        analysis = measureContours(imgEdge, self.minArea)
+        table = analysis.table
+        ids = np.zeros(len(table), np.int32)
+        aspect = table["w"] / np.maximum(table["h"], 1).astype(np.float32)
+        # bbox kontur mentah (classifyRows menimpanya dengan bbox approxPolyDP)
+        rawBox = np.stack([table["x"], table["y"], table["w"], table["h"]], 1)
+
+        matches = self._associate(table)
+        matchedRows = set()
+        toClassify = []
+        for row, trackId in matches:
+            t = self.tracks[trackId]
+            matchedRows.add(row)
+            ids[row] = trackId
+            area = float(table[row]["area"])
+            changed = (abs(area - t[2]) > self.areaChange * max(t[2], 1.0)
+                       or abs(aspect[row] - t[3]) > self.areaChange * max(t[3], 1e-3))
+            if changed:
+                toClassify.append(row)
+            else:
+                table[row]["label"] = t[4]
+                table[row]["vertices"] = t[5]
+                table[row]["perimeter"] = t[6]
+                table[row]["x"], table[row]["y"], table[row]["w"], table[row]["h"] = rawBox[row] + t[7]
+                self.reused += 1
+
+        self.newIds = []
+        for row in range(len(table)):
+            if row not in matchedRows:
+                ids[row] = self._nextId
+                self.newIds.append(self._nextId)
+                self._nextId += 1
+                toClassify.append(row)
+
+        classifyRows(analysis, toClassify, self.epsilon)
+        self.classified += len(toClassify)
+
+        # simpan state track terbaru
+        seen = set()
+        for row in range(len(table)):
+            trackId = int(ids[row])
+            seen.add(trackId)
+            box = np.array([table[row]["x"], table[row]["y"], table[row]["w"], table[row]["h"]])
+            self.tracks[trackId] = [float(table[row]["cx"]), float(table[row]["cy"]), float(table[row]["area"]),
+                                    float(aspect[row]), int(table[row]["label"]), int(table[row]["vertices"]),
+                                    float(table[row]["perimeter"]), box - rawBox[row], 0]
+
+        self.lostIds = []
+        for trackId in list(self.tracks):
+            if trackId not in seen:
+                self.tracks[trackId][8] += 1
+                if self.tracks[trackId][8] > self.maxMissed:
+                    del self.tracks[trackId]
+                    self.lostIds.append(trackId)
+
+        self.frames += 1
+        return analysis, ids
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "tracks": len(self.tracks),
+            "classified": self.classified,
+            "reused": self.reused,
+        }
+
+
+def syntheticShapes(width=1920, height=1080, count=2000, seed=0):
+    # Scene buatan: banyak segitiga / kotak / lingkaran acak (untuk benchmark)
+    rng = np.random.default_rng(seed)
+    img = np.full((height, width, 3), 255, np.uint8)
+    for _ in range(count):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        r = int(rng.integers(4, 30))
+        color = tuple(int(c) for c in rng.integers(0, 200, 3))
+        kind = rng.integers(0, 3)
+        if kind == 0:
+            cv2.circle(img, (x, y), r, color, cv2.FILLED)
+        elif kind == 1:
+            cv2.rectangle(img, (x - r, y - r), (x + r, y + int(r * rng.uniform(0.5, 1.5))), color, cv2.FILLED)
+        else:
+            pts = np.int32([[x, y - r], [x - r, y + r], [x + r, y + r]])
+            cv2.fillPoly(img, [pts], color)
+    return img
+
+
+def benchmarkContours(imgEdge, minArea=MIN_AREA, repeat=5):
+    """
+    Bandingkan analyzeContours() vs loop gaya chapter 8 (per kontur: area, gambar,
+    arcLength, approxPolyDP, boundingRect, putText; print dimatikan).
+    return : dict kontur per detik untuk kedua cara
+    """
+    def legacy(canvas):
+        contours, _ = cv2.findContours(imgEdge, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+        for cnt in contours:
+            area = cv2.contourArea(cnt)
+            cv2.drawContours(canvas, cnt, -1, (255, 0, 0), 3)
+            if area > minArea:
+                cv2.drawContours(canvas, cnt, -1, (0, 0, 255), 3)
+                peri = cv2.arcLength(cnt, True)
+                approx = cv2.approxPolyDP(cnt, 0.02 * peri, True)
+                x, y, w, h = cv2.boundingRect(approx)
+                objectType = classifyShape(len(approx), w, h)
+                cv2.rectangle(canvas, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                cv2.putText(canvas, objectType, (x + (w // 2) - 10, y + (h // 2) - 10),
+                            cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 0, 0), 2)
+        return len(contours)
+
+    canvas = cv2.cvtColor(imgEdge, cv2.COLOR_GRAY2BGR)
+
+    def timeIt(fn):
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            n = fn()
+        return n, (time.perf_counter() - t0) / repeat
+
+    total, legacySec = timeIt(lambda: legacy(canvas))
+    _, analyzeSec = timeIt(lambda: len(analyzeContours(imgEdge, minArea).contours))
+    _, drawSec = timeIt(lambda: drawContourAnalysis(canvas, analyzeContours(imgEdge, minArea)) is not None)
+    kept = len(analyzeContours(imgEdge, minArea))
+    return {
+        "contours": total,
+        "kept": kept,
+        "legacyContoursPerSec": total / legacySec,
+        "analyzeContoursPerSec": total / analyzeSec,
+        "analyzeAndDrawContoursPerSec": total / drawSec,
+    }
+
+
+if __name__ == "__main__":
+    import preprocess
+
+    # python shapes.py -> benchmark kontur per detik di scene buatan 1080p
+    for count in (500, 2000, 5000):
+        imgEdge = preprocess.edgeMap(syntheticShapes(count=count))
+        print(count, "objek:", benchmarkContours(imgEdge, minArea=100))
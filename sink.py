@@ -0,0 +1,478 @@
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+from metrics import RollingHistogram
+
+# ============================================================
+# OUTPUT SINK: REKAM / STREAM FRAME DI BACKGROUND (PENGGANTI cv2.imshow)
+# ============================================================
+# Semua output debug di chapter memakai cv2.imshow: butuh display, dan jalan di
+# thread yang sama dengan proses. Di server / robot tanpa layar, kita ingin
+# hasil (misal mosaic stackImages) direkam ke file atau ditonton dari browser.
+#
+# VideoSink  : cv2.VideoWriter di background thread + antrian terbatas (ring slot)
+# MJPEGServer: HTTP server lokal, http://host:port/ -> stream MJPEG
+#              (/stream.mjpg, /snapshot.jpg). Encode JPEG di thread sendiri,
+#              hanya frame TERBARU yang di-encode, client lambat cukup melewatkan frame.
+#
+# Aturan yang sama untuk keduanya:
+# - publish(frame) di hot path hanya meng-copy frame ke slot yang sudah dialokasikan
+#   (frame Mosaic / Pipeline dipakai ulang, jadi wajib di-copy), TIDAK pernah menunggu
+# - antrian penuh / encoder sibuk -> frame dibuang (framesDropped), publish() = False
+#
+#   sink = openSink("debug.avi", fps=30)          # atau openSink("mjpeg:8080")
+#   while True:
+#       ...
+#       imgStack = stackImages(0.6, ([img, imgGray], [imgCanny, imgContour]))
+#       sink.publish(imgStack)                    # ganti cv2.imshow(...)
+#   sink.close()
+
+
+class VideoSink:
+    """
+    path      : file output (.avi / .mp4)
+    fps       : fps file output
+    fourcc    : kode codec 4 huruf ("MJPG" aman untuk .avi, "mp4v" untuk .mp4)
+    queueSize : jumlah slot antrian (frame yang boleh menunggu encoder)
+    """
+
+    def __init__(self, path, fps=30.0, fourcc="MJPG", queueSize=8):
+        if queueSize < 1:
+            raise ValueError("queueSize minimal 1")
+        self.path = path
+        self.fps = fps
+        self.fourcc = fourcc
+        self.queueSize = queueSize
+
+        self._slots = []                # dialokasikan saat frame pertama
+        self._free = deque()
+        self._ready = deque()
+        self._cond = threading.Condition()
+        self._running = True
+        self._writer = None
+        self._shape = None
+
+        self.framesPublished = 0
+        self.framesWritten = 0
+        self.framesDropped = 0
+        self.copyMs = RollingHistogram()     # biaya di hot path (publish)
+        self.writeMs = RollingHistogram()    # encode + tulis, di thread writer
+
+        self._thread = threading.Thread(target=self._writeLoop, name="VideoSink", daemon=True)
+        self._thread.start()
+
+    def _open(self, frame):
+        # dipanggil dengan self._cond terkunci. Writer divalidasi dulu; state sink baru diisi
+        # kalau berhasil. Kalau gagal, sink langsung ditutup (publish berikutnya -> ValueError)
+        height, width = frame.shape[:2]
+        writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps,
+                                 (width, height), frame.ndim == 3)
+        if not writer.isOpened():
+            writer.release()
+            self._running = False
+            self._cond.notify_all()
+            raise IOError("VideoWriter tidak bisa dibuka: %s (fourcc %s)" % (self.path, self.fourcc))
+
+        self._writer = writer
+        self._slots = [np.empty_like(frame) for _ in range(self.queueSize)]
+        self._free.extend(range(self.queueSize))
+        self._shape = frame.shape
+
+    def publish(self, frame):
+        """
+        Antrikan 1 frame (di-copy). return : False kalau frame dibuang (antrian penuh)
+        """
+        t0 = time.perf_counter()
+        with self._cond:
+            if not self._running:
+                raise ValueError("VideoSink sudah ditutup")
+            if self._shape is None:
+                self._open(frame)
+            elif frame.shape != self._shape:
+                raise ValueError("Ukuran frame berubah: %s -> %s" % (self._shape, frame.shape))
+            self.framesPublished += 1
+            if not self._free:
+                self.framesDropped += 1
+                return False
+            idx = self._free.popleft()
+
+        # copy di luar lock: slot ini belum terlihat oleh thread writer
+        np.copyto(self._slots[idx], frame)
+        with self._cond:
+            self._ready.append(idx)
+            self._cond.notify()
+        self.copyMs.add(1000.0 * (time.perf_counter() - t0))
+        return True
+
+    def _writeLoop(self):
+        while True:
+            with self._cond:
+                while not self._ready and self._running:
+                    self._cond.wait()
+                if not self._ready:
+                    break           # ditutup dan antrian sudah kosong
+                idx = self._ready.popleft()
+
+            t0 = time.perf_counter()
+            self._writer.write(self._slots[idx])
+            self.writeMs.add(1000.0 * (time.perf_counter() - t0))
+
+            with self._cond:
+                self._free.append(idx)
+                self.framesWritten += 1
+
+    def close(self):
+        # sisa antrian tetap ditulis dulu, baru file ditutup
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join()
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        return {
+            "framesPublished": self.framesPublished,
+            "framesWritten": self.framesWritten,
+            "framesDropped": self.framesDropped,
+            "queued": len(self._ready),
+            "copyMs": self.copyMs.summary()["p50Ms"],
+            "writeMs": self.writeMs.summary()["p50Ms"],
+        }
+
+
+_INDEX_HTML = b"""<!doctype html>
+<html><head><title>OpenCV debug stream</title></head>
+<body style="margin:0;background:#111"><img src="/stream.mjpg" style="max-width:100%"></body></html>
+"""
+
+
+class MJPEGServer:
+    """
+    host, port : alamat server (port 0 = pilih port bebas, lihat .url)
+    quality    : kualitas JPEG (0..100)
+    maxFps     : batas fps stream (None = sesuai publish); frame lebih cepat dari ini dibuang
+
+    Tanpa client yang terhubung, publish() langsung return (tanpa copy / encode).
+    """
+
+    BOUNDARY = "frame"
+
+    def __init__(self, host="127.0.0.1", port=8080, quality=80, maxFps=None):
+        self.quality = quality
+        self.minInterval = 1.0 / maxFps if maxFps else 0.0
+
+        # double buffer: publish() menulis _pending, encoder membaca _encoding
+        self._pending = None
+        self._encoding = None
+        self._hasPending = False
+        self._lastPublish = 0.0
+
+        self._cond = threading.Condition()   # frame baru untuk encoder
+        self._jpegCond = threading.Condition()  # JPEG baru untuk client
+        self._jpeg = None
+        self._seq = 0
+        self._running = True
+        self.clients = 0
+
+        self.framesPublished = 0
+        self.framesEncoded = 0
+        self.framesDropped = 0       # ditimpa frame lebih baru sebelum sempat di-encode
+        self.framesIdle = 0          # tidak ada client
+        self.framesSkipped = 0       # JPEG yang dilewati client lambat (total semua client)
+        self.bytesSent = 0
+        self.copyMs = RollingHistogram()
+        self.encodeMs = RollingHistogram()
+
+        self._server = ThreadingHTTPServer((host, port), self._handlerClass())
+        self._server.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="MJPEGServer-http", daemon=True),
+            threading.Thread(target=self._encodeLoop, name="MJPEGServer-encode", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return "http://%s:%d/" % (host, port)
+
+    # ---------------------------
+    # Hot path
+    # ---------------------------
+    def publish(self, frame):
+        """
+        return : False kalau frame tidak dikirim (tidak ada client, terlalu cepat, atau
+                 menimpa frame yang belum sempat di-encode -> yang lama dihitung dropped)
+        """
+        self.framesPublished += 1
+        if not self.clients:
+            self.framesIdle += 1
+            return False
+        now = time.perf_counter()
+        if self.minInterval and now - self._lastPublish < self.minInterval:
+            self.framesDropped += 1
+            return False
+        self._lastPublish = now
+
+        with self._cond:
+            if self._pending is None or self._pending.shape != frame.shape or self._pending.dtype != frame.dtype:
+                self._pending = np.empty_like(frame)
+            if self._hasPending:
+                self.framesDropped += 1
+            # copy di dalam lock singkat: encoder hanya menukar buffer, tidak menunggu encode
+            np.copyto(self._pending, frame)
+            self._hasPending = True
+            self._cond.notify()
+        self.copyMs.add(1000.0 * (time.perf_counter() - now))
+        return True
+
+    # ---------------------------
+    # Thread encoder
+    # ---------------------------
+    def _encodeLoop(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, int(self.quality)]
+        while True:
+            with self._cond:
+                while not self._hasPending and self._running:
+                    self._cond.wait()
+                if not self._running:
+                    break
+                self._pending, self._encoding = self._encoding, self._pending
+                self._hasPending = False
+
+            t0 = time.perf_counter()
+            success, encoded = cv2.imencode(".jpg", self._encoding, params)
+            self.encodeMs.add(1000.0 * (time.perf_counter() - t0))
+            if not success:
+                continue
+            with self._jpegCond:
+                self._jpeg = encoded.tobytes()
+                self._seq += 1
+                self.framesEncoded += 1
+                self._jpegCond.notify_all()
+
+    def latestJpeg(self, afterSeq=0, timeout=1.0):
+        """
+        Tunggu JPEG dengan nomor > afterSeq. return : (seq, bytes) atau (afterSeq, None)
+        """
+        with self._jpegCond:
+            self._jpegCond.wait_for(lambda: self._seq > afterSeq or not self._running, timeout)
+            if self._seq > afterSeq and self._jpeg is not None:
+                return self._seq, self._jpeg
+            return afterSeq, None
+
+    # ---------------------------
+    # HTTP
+    # ---------------------------
+    def _handlerClass(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass        # jangan spam stdout per request
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/":
+                    self._send(200, "text/html", _INDEX_HTML)
+                elif path == "/snapshot.jpg":
+                    # belum ada JPEG: client ini dihitung sebentar supaya publish() mulai mengirim
+                    server._clientJoined()
+                    try:
+                        _, jpeg = server.latestJpeg(0, timeout=2.0)
+                    finally:
+                        server._clientLeft()
+                    if jpeg is None:
+                        self._send(503, "text/plain", b"belum ada frame")
+                    else:
+                        self._send(200, "image/jpeg", jpeg)
+                elif path == "/stream.mjpg":
+                    self._stream()
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _send(self, code, contentType, body):
+                self.send_response(code)
+                self.send_header("Content-Type", contentType)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=" + server.BOUNDARY)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                server._clientJoined()
+                seq = 0
+                try:
+                    while server._running:
+                        newSeq, jpeg = server.latestJpeg(seq)
+                        if jpeg is None:
+                            continue
+                        # client ini lebih lambat dari encoder: langsung lompat ke frame terbaru
+                        skipped = newSeq - seq - 1 if seq and newSeq > seq + 1 else 0
+                        seq = newSeq
+                        header = ("--%s\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+                                  % (server.BOUNDARY, len(jpeg))).encode("ascii")
+                        self.wfile.write(header + jpeg + b"\r\n")
+                        server._clientSent(skipped, len(jpeg))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    server._clientLeft()
+
+        return Handler
+
+    def _clientJoined(self):
+        with self._jpegCond:
+            self.clients += 1
+
+    def _clientLeft(self):
+        with self._jpegCond:
+            self.clients -= 1
+
+    def _clientSent(self, skipped, nbytes):
+        # dipanggil dari banyak thread handler sekaligus: counter dijaga lock yang sama
+        with self._jpegCond:
+            self.framesSkipped += skipped
+            self.bytesSent += nbytes
+
+    def close(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        with self._jpegCond:
+            self._jpegCond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        return {
+            "url": self.url,
+            "clients": self.clients,
+            "framesPublished": self.framesPublished,
+            "framesEncoded": self.framesEncoded,
+            "framesDropped": self.framesDropped,
+            "framesIdle": self.framesIdle,
+            "framesSkipped": self.framesSkipped,
+            "bytesSent": self.bytesSent,
+            "copyMs": self.copyMs.summary()["p50Ms"],
+            "encodeMs": self.encodeMs.summary()["p50Ms"],
+        }
+
+
+def openSink(target, fps=30.0, **kwargs):
+    """
+    target : "mjpeg:PORT" atau "mjpeg:HOST:PORT" -> MJPEGServer, selain itu path file -> VideoSink
+    """
+    if target.startswith("mjpeg:"):
+        parts = target.split(":")[1:]
+        host = parts[0] if len(parts) > 1 else "127.0.0.1"
+        return MJPEGServer(host, int(parts[-1] or 8080), **kwargs)
+    return VideoSink(target, fps, **kwargs)
+
+
+# ============================================================
+# DEMO / BENCHMARK: mosaic chapter 8 ke sink, biaya di hot path
+# ============================================================
+def benchmarkSink(frames, target, fps=30.0):
+    """
+    Bandingkan biaya per frame di loop utama:
+    - inline : VideoWriter.write / imencode di loop (seperti imshow, menahan proses)
+    - sink   : publish() saja, frame dikirim dengan tempo fps (seperti kamera)
+    """
+    frames = list(frames)
+    height, width = frames[0].shape[:2]
+
+    t0 = time.perf_counter()
+    if target.startswith("mjpeg:"):
+        for frame in frames:
+            cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    else:
+        writer = cv2.VideoWriter(target, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height))
+        for frame in frames:
+            writer.write(frame)
+        writer.release()
+    inlineMs = 1000.0 * (time.perf_counter() - t0) / len(frames)
+
+    sink = openSink(target, fps)
+    publishSec = 0.0
+    for frame in frames:
+        t0 = time.perf_counter()
+        sink.publish(frame)
+        publishSec += time.perf_counter() - t0
+        time.sleep(max(0.0, 1.0 / fps - (time.perf_counter() - t0)))
+    sink.close()
+    return {"inlineMs": inlineMs, "publishMs": 1000.0 * publishSec / len(frames), **sink.stats()}
+
+
+def _mosaicFrames(count=120):
+    import os
+
+    import preprocess
+    import shapes
+    from stack import Mosaic
+
+    img = cv2.imread(os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "shapes.png"))
+    img = cv2.resize(img, (1280, 720))
+    pipe = preprocess.chapter8Pipeline()
+    mosaic = Mosaic(0.5)
+    for i in range(count):
+        frame = np.roll(img, 4 * i, axis=1)
+        imgCanny = pipe.run(frame)
+        imgContour = shapes.drawContourAnalysis(frame.copy(), shapes.analyzeContours(imgCanny))
+        # Mosaic memakai ulang kanvasnya: inilah kenapa sink wajib meng-copy frame
+        yield mosaic.compose([[frame, imgCanny], [imgContour, frame]]).copy()
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    # python sink.py                -> benchmark VideoSink (file sementara)
+    # python sink.py mjpeg:8080 30  -> stream mosaic chapter 8 selama 30 detik, buka URL di browser
+    if len(sys.argv) > 1 and sys.argv[1].startswith("mjpeg:"):
+        duration = float(sys.argv[2]) if len(sys.argv) > 2 else 30.0
+        frames = list(_mosaicFrames())
+        with openSink(sys.argv[1], maxFps=30) as server:
+            print("stream di", server.url, "selama %.0f s" % duration)
+            t0 = time.perf_counter()
+            i = 0
+            while time.perf_counter() - t0 < duration:
+                server.publish(frames[i % len(frames)])
+                i += 1
+                time.sleep(1.0 / 30)
+            print(server.stats())
+    else:
+        frames = list(_mosaicFrames())
+        path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(tempfile.gettempdir(), "sink_demo.avi")
+        r = benchmarkSink(frames, path)
+        print("VideoSink %s: inline %.2f ms/frame, publish %.2f ms/frame, ditulis %d, dibuang %d"
+              % (path, r["inlineMs"], r["publishMs"], r["framesWritten"], r["framesDropped"]))
+        r = benchmarkSink(frames, "mjpeg:0")
+        print("MJPEG (tanpa client): imencode inline %.2f ms/frame, publish %.3f ms/frame"
+              % (r["inlineMs"], r["publishMs"]))
@@ -0,0 +1,136 @@
+import cv2
+import numpy as np
+
+# ============================================================
+# STACK IMAGES / MOSAIC (pengganti stackImages chapter 6, 7, 8)
+# ============================================================
+# Versi lama:
+# - resize tiap gambar -> array baru
+# - gray -> BGR        -> array baru
+# - np.hstack per baris, lalu np.vstack -> setiap pixel di-copy minimal 2x lagi
+#
+# Versi ini:
+# - kanvas akhir dialokasikan SEKALI untuk 1 layout (jumlah baris/kolom, ukuran tile)
+# - tiap gambar di-resize / di-convert LANGSUNG ke potongan (slice) kanvas lewat dst=
+# - baris tidak harus sama panjang (ragged): sel kosong dibiarkan hitam
+# - channel boleh campur: gray (h,w) atau (h,w,1), BGR (h,w,3), BGRA (h,w,4)
+#
+# Ukuran tile = ukuran gambar pertama (kiri atas) x scale, semua gambar
+# disamakan ke ukuran itu (sama seperti patokan di chapter 6).
+
+
+def _gridOf(imgArray):
+    # Normalisasi input jadi list of rows (1D list -> 1 baris)
+    rows = list(imgArray)
+    if rows and isinstance(rows[0], (list, tuple)):
+        return [list(row) for row in rows]
+    return [rows]
+
+
+def _asImage(img):
+    # (h,w,1) diperlakukan sama seperti grayscale (h,w)
+    if img.ndim == 3 and img.shape[2] == 1:
+        return img[:, :, 0]
+    return img
+
+
+class Mosaic:
+    """
+    scale : skala tile terhadap gambar pertama (misal 0.5 = 50%)
+
+    Pakai 1 objek Mosaic di loop live (trackbar / video): kanvas dan buffer
+    sementara dialokasikan di frame pertama, frame berikutnya tinggal ditulis ulang.
+    Hasil compose() adalah kanvas milik Mosaic, valid sampai compose() berikutnya.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._layout = None
+        self._canvas = None
+        self._scratch = {}      # buffer sementara untuk tile gray / BGRA: (h, w, ch) -> array
+        self._refSize = None    # (h, w) gambar pertama
+
+    def _prepare(self, grid):
+        height, width = _asImage(grid[0][0]).shape[:2]
+        tileW = max(1, int(round(width * self.scale)))
+        tileH = max(1, int(round(height * self.scale)))
+        layout = (tileW, tileH, tuple(len(row) for row in grid))
+        self._refSize = (height, width)
+
+        if layout != self._layout:
+            cols = max(len(row) for row in grid)
+            self._canvas = np.zeros((tileH * len(grid), tileW * cols, 3), np.uint8)
+            self._scratch = {}
+            self._layout = layout
+        return tileW, tileH
+
+    def _scratchFor(self, tileH, tileW, channels):
+        key = (tileH, tileW, channels)
+        buf = self._scratch.get(key)
+        if buf is None:
+            shape = (tileH, tileW) if channels == 1 else (tileH, tileW, channels)
+            buf = self._scratch[key] = np.empty(shape, np.uint8)
+        return buf
+
+    def _resize(self, img, dst, tileW, tileH):
+        if img.shape[:2] == self._refSize:
+            # ukuran sama dengan patokan: cukup di-scale (hasil identik dengan versi lama)
+            return cv2.resize(img, (0, 0), dst, self.scale, self.scale)
+        return cv2.resize(img, (tileW, tileH), dst)
+
+    def _writeTile(self, img, dst, tileW, tileH):
+        img = _asImage(img)
+        sameSize = img.shape[:2] == (tileH, tileW)
+        channels = 1 if img.ndim == 2 else img.shape[2]
+
+        if channels == 3:
+            if sameSize:
+                dst[...] = img
+            else:
+                self._resize(img, dst, tileW, tileH)
+            return
+
+        # Gray / BGRA: resize dulu ke buffer sementara (kalau perlu), lalu convert ke slice
+        if not sameSize:
+            img = self._resize(img, self._scratchFor(tileH, tileW, channels), tileW, tileH)
+        code = cv2.COLOR_GRAY2BGR if channels == 1 else cv2.COLOR_BGRA2BGR
+        cv2.cvtColor(img, code, dst)
+
+    def compose(self, imgArray):
+        """
+        imgArray : 1D [img1, img2, ...] atau 2D [[img1, img2], [img3]] (baris boleh beda panjang)
+        return   : kanvas BGR uint8 berisi semua gambar
+        """
+        grid = _gridOf(imgArray)
+        tileW, tileH = self._prepare(grid)
+        canvas = self._canvas
+
+        for r, row in enumerate(grid):
+            y = r * tileH
+            for c, img in enumerate(row):
+                x = c * tileW
+                self._writeTile(img, canvas[y:y + tileH, x:x + tileW], tileW, tileH)
+        return canvas
+
+    def tileRect(self, row, col):
+        # (x, y, w, h) posisi tile di kanvas, berguna untuk menggambar label/overlay
+        tileW, tileH, _ = self._layout
+        return col * tileW, row * tileH, tileW, tileH
+
+
+def stackImages(scale, imgArray, mosaic=None):
+    """
+    scale    : skala ukuran gambar (misal 0.5 = 50% dari ukuran patokan)
+    imgArray : bisa 2 bentuk:
+               - 1D: [img1, img2, img3]            -> hasil 1 baris
+               - 2D: [[img1, img2], [img3, img4]]  -> hasil grid
+    mosaic   : (opsional) objek Mosaic untuk dipakai ulang di loop live
+    return   : 1 gambar besar hasil gabungan
+
+    Tanpa mosaic, kanvas baru dibuat setiap panggilan (aman untuk disimpan).
+    Beda dengan versi lama: imgArray tidak diubah (tidak di-resize di tempat).
+    """
+    if mosaic is None:
+        return Mosaic(scale).compose(imgArray)
+    mosaic.scale = scale
+    return mosaic.compose(imgArray)
@@ -0,0 +1,360 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import preprocess
+
+# ============================================================
+# PERSPECTIVE WARP (dari chapter 5)
+# ============================================================
+# Urutan titik SELALU: Top-Left, Top-Right, Bottom-Left, Bottom-Right
+# (sama seperti pts1/pts2 di chapter 5)
+
+# Ukuran output kartu bawaan chapter 5 (portrait)
+CARD_WIDTH, CARD_HEIGHT = 250, 350
+
+# Titik sudut kartu di Resources/cards.jpg (diukur manual di chapter 5)
+CARD_POINTS = np.float32([
+    [111, 219],  # Top-Left
+    [287, 188],  # Top-Right
+    [154, 482],  # Bottom-Left
+    [352, 440],  # Bottom-Right
+])
+
+
+def destinationPoints(width, height):
+    # Kanvas output: TL, TR, BL, BR
+    return np.float32([
+        [0, 0],
+        [width, 0],
+        [0, height],
+        [width, height],
+    ])
+
+
+def warpQuad(img, pts1, width=CARD_WIDTH, height=CARD_HEIGHT):
+    """
+    img    : gambar sumber
+    pts1   : 4 titik sudut objek [TL, TR, BL, BR], format [x, y]
+    width  : lebar hasil warp
+    height : tinggi hasil warp
+    return : gambar hasil "scan" berukuran (height, width)
+    """
+    pts1 = np.float32(pts1).reshape(4, 2)
+    matrix = cv2.getPerspectiveTransform(pts1, destinationPoints(width, height))
+    return cv2.warpPerspective(img, matrix, (width, height))
+
+
+# ============================================================
+# BATCH WARP: BANYAK QUAD PER FRAME
+# ============================================================
+# Scanner dokumen/kartu bisa menemukan puluhan quad di 1 frame.
+# BatchWarper:
+# - menerima list quad (masing-masing 4 titik TL, TR, BL, BR) + ukuran target
+# - matriks homography di-cache per slot (urutan quad). Kalau quad tidak bergeser
+#   (selisih <= moveTolerance pixel), matriks lama dipakai lagi
+# - kalau quad diam beberapa frame (remapAfter), dibuat peta remap sekali
+#   (map1/map2 seperti hasil initUndistortRectifyMap) -> frame berikutnya cukup
+#   cv2.remap, tanpa menghitung ulang koordinat per pixel
+#   (hasil remap bisa beda beberapa level intensitas dari warpPerspective
+#   karena pembulatan peta fixed-point)
+# - tiap warp jalan di thread pool (OpenCV melepas GIL selama warp/remap)
+# - buffer output per slot dialokasikan sekali dan dipakai ulang
+#
+# Catatan: crop yang dikembalikan adalah buffer milik slot, valid sampai warp() berikutnya.
+
+
+def perspectiveMaps(matrix, width, height):
+    """
+    Peta remap untuk warpPerspective(img, matrix, (width, height)).
+    return : (map1, map2) fixed-point (CV_16SC2) untuk cv2.remap
+    """
+    inverse = np.linalg.inv(matrix)
+    xs, ys = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    grid = np.dstack([xs, ys]).reshape(-1, 1, 2)
+    src = cv2.perspectiveTransform(grid, inverse).reshape(height, width, 2)
+    return cv2.convertMaps(src, None, cv2.CV_16SC2)
+
+
+class _QuadSlot:
+    def __init__(self):
+        self.pts = None
+        self.size = None
+        self.matrix = None
+        self.maps = None
+        self.staticFrames = 0
+        self.out = None
+
+
+class BatchWarper:
+    """
+    workers       : jumlah thread (1 = jalan berurutan tanpa pool)
+    moveTolerance : pergeseran titik (pixel) yang masih dianggap "tidak bergerak"
+    remapAfter    : setelah quad diam sekian frame, pakai peta remap yang di-cache
+                    (None = tidak pernah pakai remap)
+    """
+
+    def __init__(self, workers=4, moveTolerance=0.5, remapAfter=2):
+        self.workers = workers
+        self.moveTolerance = moveTolerance
+        self.remapAfter = remapAfter
+        self._slots = []
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+
+        # Counter
+        self.homographyComputed = 0
+        self.homographyReused = 0
+        self.remapped = 0
+
+    def _prepareSlot(self, slot, pts, size, shape):
+        moved = (slot.pts is None or slot.size != size
+                 or np.abs(slot.pts - pts).max() > self.moveTolerance)
+        if moved:
+            slot.pts = pts
+            slot.size = size
+            slot.matrix = cv2.getPerspectiveTransform(pts, destinationPoints(*size))
+            slot.maps = None
+            slot.staticFrames = 0
+            self.homographyComputed += 1
+        else:
+            slot.staticFrames += 1
+            self.homographyReused += 1
+            if slot.maps is None and self.remapAfter is not None and slot.staticFrames >= self.remapAfter:
+                slot.maps = perspectiveMaps(slot.matrix, *size)
+
+        outShape = (size[1], size[0]) + shape[2:]
+        if slot.out is None or slot.out.shape != outShape:
+            slot.out = np.empty(outShape, np.uint8)
+
+    def _warpSlot(self, img, slot):
+        if slot.maps is not None:
+            return cv2.remap(img, slot.maps[0], slot.maps[1], cv2.INTER_LINEAR, slot.out)
+        return cv2.warpPerspective(img, slot.matrix, slot.size, slot.out)
+
+    def warp(self, img, quads, sizes=(CARD_WIDTH, CARD_HEIGHT)):
+        """
+        img    : frame sumber
+        quads  : list quad, tiap quad 4 titik [TL, TR, BL, BR]
+        sizes  : 1 ukuran (w, h) untuk semua quad, atau list ukuran per quad
+        return : list hasil warp (urutan sama dengan quads)
+        """
+        if len(sizes) == 2 and np.isscalar(sizes[0]):
+            sizes = [tuple(sizes)] * len(quads)
+        if len(sizes) != len(quads):
+            raise ValueError("Jumlah sizes harus sama dengan jumlah quads")
+
+        while len(self._slots) < len(quads):
+            self._slots.append(_QuadSlot())
+        del self._slots[len(quads):]
+
+        for slot, quad, size in zip(self._slots, quads, sizes):
+            self._prepareSlot(slot, np.float32(quad).reshape(4, 2), tuple(int(v) for v in size), img.shape)
+            if slot.maps is not None:
+                self.remapped += 1
+
+        if self._pool is None or len(quads) < 2:
+            return [self._warpSlot(img, slot) for slot in self._slots]
+        return list(self._pool.map(lambda slot: self._warpSlot(img, slot), self._slots))
+
+    def stats(self):
+        return {
+            "slots": len(self._slots),
+            "homographyComputed": self.homographyComputed,
+            "homographyReused": self.homographyReused,
+            "remapped": self.remapped,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============================================================
+# DETEKSI QUAD OTOMATIS (PENGGANTI pts1 MANUAL CHAPTER 5)
+# ============================================================
+# Di chapter 5 titik sudut kartu diukur manual ("seharusnya" TL, TR, ...).
+# QuadFinder mencarinya otomatis memakai alat dari chapter 8:
+#
+# 1) frame diperkecil (processWidth) -> edge map: Gray -> Blur -> Canny -> dilate
+#    (Pipeline dengan buffer dipakai ulang, cukup cepat untuk video)
+# 2) findContours -> filter luas -> convexHull -> approxPolyDP
+#    -> yang punya tepat 4 sudut dianggap kandidat kartu/dokumen
+# 3) titik diurutkan konsisten: TL, TR, BL, BR (sama dengan pts1 chapter 5)
+# 4) titik dikembalikan ke skala asli lalu diperhalus dengan cornerSubPix
+#    di gambar full resolution
+#
+# Hasil bisa langsung diberikan ke warpQuad() / BatchWarper.warp().
+
+
+def orderCorners(pts):
+    """
+    pts    : 4 titik (x, y) urutan bebas
+    return : float32 (4, 2) urutan TL, TR, BL, BR
+    """
+    pts = np.float32(pts).reshape(4, 2)
+    # Urut sudut terhadap centroid (y ke bawah -> searah jarum jam: TL, TR, BR, BL).
+    # Heuristik x + y / y - x saja gagal di quad miring ~45 derajat (2 sudut bisa
+    # terpilih sebagai titik yang sama), urutan keliling selalu 4 titik berbeda.
+    center = pts.mean(axis=0)
+    order = np.argsort(np.arctan2(pts[:, 1] - center[1], pts[:, 0] - center[0]), kind="stable")
+    # mulai dari TL = x + y paling kecil
+    start = int(np.argmin(pts[order].sum(axis=1)))
+    tl, tr, br, bl = np.roll(order, -start)
+    idx = [tl, tr, bl, br]
+    assert len(set(int(i) for i in idx)) == 4, "orderCorners: sudut kembar"
+    return pts[idx]
+
+
+def quadSize(quad):
+    # Perkiraan (width, height) hasil warp dari panjang sisi quad (TL, TR, BL, BR)
+    tl, tr, bl, br = np.float32(quad).reshape(4, 2)
+    width = max(np.linalg.norm(tr - tl), np.linalg.norm(br - bl))
+    height = max(np.linalg.norm(bl - tl), np.linalg.norm(br - tr))
+    return max(1, int(round(width))), max(1, int(round(height)))
+
+
+def _boxIoU(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+class QuadFinder:
+    """
+    processWidth    : lebar edge map (gambar diperkecil ke sini, None = ukuran asli)
+    canny           : threshold Canny di edge map kecil
+    minAreaFraction : luas quad minimal relatif terhadap gambar
+    maxAreaFraction : luas quad maksimal (buang bingkai seluruh gambar)
+    maxQuads        : jumlah quad terbesar yang dikembalikan
+    refine          : perhalus sudut dengan cornerSubPix di full resolution
+    """
+
+    def __init__(self, processWidth=320, canny=(50, 150), minAreaFraction=0.03, maxAreaFraction=0.9,
+                 maxQuads=4, epsilon=0.03, refine=True):
+        self.processWidth = processWidth
+        self.minAreaFraction = minAreaFraction
+        self.maxAreaFraction = maxAreaFraction
+        self.maxQuads = maxQuads
+        self.epsilon = epsilon
+        self.refine = refine
+        self.pipeline = preprocess.Pipeline([
+            preprocess.Gray(),
+            preprocess.GaussianBlur(preprocess.CH8_BLUR, preprocess.CH8_SIGMA),
+            preprocess.Canny(*canny),
+            preprocess.Dilate(3),
+        ])
+        self._small = None
+        self._gray = None
+
+    def _edgeMap(self, img):
+        h, w = img.shape[:2]
+        scale = 1.0
+        small = img
+        if self.processWidth and w > self.processWidth:
+            scale = self.processWidth / float(w)
+            size = (self.processWidth, max(1, int(round(h * scale))))
+            small = self._small = cv2.resize(img, size, self._small, interpolation=cv2.INTER_AREA)
+        return self.pipeline.run(small), scale
+
+    def _refine(self, img, quads, scale):
+        if img.ndim == 3:
+            self._gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, self._gray)
+            gray = self._gray
+        else:
+            gray = img
+        # jendela pencarian sebanding dengan 1 pixel edge map kecil
+        win = int(min(11, max(3, round(1.0 / scale))))
+        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 0.05)
+        h, w = gray.shape
+        for quad in quads:
+            inside = np.all((quad[:, 0] > win) & (quad[:, 0] < w - win - 1) &
+                            (quad[:, 1] > win) & (quad[:, 1] < h - win - 1))
+            if inside:
+                cv2.cornerSubPix(gray, quad.reshape(-1, 1, 2), (win, win), (-1, -1), criteria)
+        return quads
+
+    def find(self, img):
+        """
+        img    : frame BGR / grayscale
+        return : list float32 (4, 2) urutan TL, TR, BL, BR di koordinat asli,
+                 terurut dari quad terbesar
+        """
+        edges, scale = self._edgeMap(img)
+        total = float(edges.shape[0] * edges.shape[1])
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        candidates = []
+        for cnt in contours:
+            # filter luas dulu, baru hitung perimeter / approxPolyDP
+            area = cv2.contourArea(cnt)
+            if not self.minAreaFraction * total <= area <= self.maxAreaFraction * total:
+                continue
+            hull = cv2.convexHull(cnt)
+            peri = cv2.arcLength(hull, True)
+            approx = cv2.approxPolyDP(hull, self.epsilon * peri, True)
+            if len(approx) == 4:
+                candidates.append((cv2.contourArea(approx), cv2.boundingRect(approx), approx))
+
+        # buang kandidat kembar (kontur dalam/luar dari tepi yang sama)
+        candidates.sort(key=lambda c: -c[0])
+        kept = []
+        for area, rect, approx in candidates:
+            if all(_boxIoU(rect, k[1]) < 0.8 for k in kept):
+                kept.append((area, rect, approx))
+            if len(kept) >= self.maxQuads:
+                break
+
+        quads = [orderCorners(approx.reshape(4, 2) / scale) for _, _, approx in kept]
+        if self.refine and quads:
+            quads = self._refine(img, quads, scale)
+        return quads
+
+    def scan(self, img, size=None, warper=None):
+        """
+        Cari quad lalu langsung warp.
+        size   : (w, h) output; None = diperkirakan dari panjang sisi quad
+        warper : (opsional) BatchWarper untuk video (cache homography + thread pool)
+        return : (quads, list hasil warp)
+        """
+        quads = self.find(img)
+        sizes = [size or quadSize(q) for q in quads]
+        if warper is not None:
+            return quads, warper.warp(img, quads, sizes)
+        return quads, [warpQuad(img, q, w, h) for q, (w, h) in zip(quads, sizes)]
+
+
+def selfTest():
+    """
+    Cek orderCorners untuk input urutan acak, termasuk belah ketupat (quad miring 45 derajat)
+    yang dulu menghasilkan TL == TR. return : jumlah kasus; AssertionError kalau gagal
+    """
+    cases = [
+        # (input, TL, TR, BL, BR yang diharapkan)
+        (CARD_POINTS[[3, 0, 2, 1]], CARD_POINTS),
+        ([(0, 0), (100, 0), (0, 50), (100, 50)], [(0, 0), (100, 0), (0, 50), (100, 50)]),
+        ([(50, 0), (100, 50), (50, 100), (0, 50)], [(50, 0), (100, 50), (0, 50), (50, 100)]),
+        ([(0, 50), (50, 100), (100, 50), (50, 0)], [(50, 0), (100, 50), (0, 50), (50, 100)]),
+    ]
+    rng = np.random.default_rng(0)
+    for pts, expected in cases:
+        pts = np.float32(pts)
+        for _ in range(8):
+            got = orderCorners(pts[rng.permutation(4)])
+            assert np.array_equal(got, np.float32(expected)), (pts.tolist(), got.tolist())
+    return len(cases)
+
+
+if __name__ == "__main__":
+    # python warp.py -> self-check urutan sudut
+    print("orderCorners: %d kasus OK" % selfTest())